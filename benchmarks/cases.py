@@ -0,0 +1,198 @@
+"""
+Набор бенчмарков: траектория, кинематика, стратегии, аниматор, загрузчик.
+
+N — число точек траектории (10 … 10^7), M — число акторов (1 … 10^5).
+"""
+
+import json
+import os
+import tempfile
+from typing import List
+
+import numpy as np
+
+from benchmarks.harness import Case
+from motion import scenarios
+
+POINT_SIZES = [10 ** k for k in range(1, 8)]
+ACTOR_SIZES = [10 ** k for k in range(0, 6)]
+
+SEED = 12345
+
+
+def random_walk(n: int, seed: int = SEED) -> np.ndarray:
+    """Воспроизводимая случайная траектория из n точек"""
+    return scenarios.random_walk(n, np.random.default_rng(seed))
+
+
+def _trajectory_cases() -> List[Case]:
+    from motion import trajectory as tr
+
+    def cum(n):
+        points = random_walk(n)
+        return lambda: tr.cumulative_lengths(points)
+
+    def poly(n):
+        points = random_walk(n)
+        return lambda: tr.polyline_length(points)
+
+    def by_index(n):
+        points = random_walk(n)
+        t = 0.37 * (n - 1)
+        return lambda: tr.interpolate_position(points, t)
+
+    def by_length(n):
+        points = random_walk(n)
+        s = 0.37 * tr.polyline_length(points)
+        return lambda: tr.interpolate_position_by_length(points, s)
+
+    def orientation(n):
+        points = random_walk(n)
+        return lambda: tr.interpolate_orientation(points)
+
+    def orientation_by_length(n):
+        points = random_walk(n)
+        cum_len = tr.cumulative_lengths(points)
+        directions = tr.interpolate_orientation(points)
+        s = 0.37 * cum_len[-1]
+        return lambda: tr.interpolate_orientation_by_length(cum_len, directions, s)
+
+    return [
+        Case("trajectory.cumulative_lengths", POINT_SIZES, cum),
+        Case("trajectory.polyline_length", POINT_SIZES, poly),
+        Case("trajectory.interpolate_position", POINT_SIZES, by_index),
+        Case("trajectory.interpolate_position_by_length", POINT_SIZES, by_length),
+        Case("trajectory.interpolate_orientation", POINT_SIZES, orientation),
+        Case("trajectory.interpolate_orientation_by_length", POINT_SIZES,
+             orientation_by_length),
+    ]
+
+
+def _kinematics_cases() -> List[Case]:
+    def frenet(n):
+        from motion.kinematics import frenet_frame
+        points = random_walk(n)
+        return lambda: frenet_frame(points)
+
+    def curv(n):
+        from motion.kinematics import curvature
+        points = random_walk(n)
+        return lambda: curvature(points)
+
+    def batch(n):
+        from motion.path_analysis import analyze_packed
+        # n точек, разрезанных на пути по 100 точек
+        points = random_walk(n)
+        offsets = np.append(np.arange(0, n - 1, 100), n)
+        return lambda: analyze_packed(points, offsets)
+
+    def inverse(n):
+        from motion.kinematics import accel_decel_time
+        # n станций у 100 акторов с разными параметрами
+        length = np.linspace(1.0, 100.0, 100)[:, None]
+        s = np.linspace(0.0, 1.0, n) * length
+        return lambda: accel_decel_time(length, s, v_max=2.0, a=0.5)
+
+    return [
+        Case("kinematics.frenet_frame", POINT_SIZES, frenet),
+        Case("kinematics.curvature", POINT_SIZES, curv),
+        Case("analysis.analyze_packed", POINT_SIZES, batch),
+        Case("kinematics.accel_decel_time", POINT_SIZES[:5], inverse),
+    ]
+
+
+def _strategy_cases() -> List[Case]:
+    from motion.interpolation_strategies import StrategyRegistry
+    from motion.trajectory import cumulative_lengths, interpolate_orientation
+
+    cases = []
+
+    for name in list(StrategyRegistry._position_strategies):
+        def setup(n, name=name):
+            points = random_walk(n)
+            strategy = StrategyRegistry.get_position_strategy(name)
+            cache = {}
+            strategy(points, 0.37, cache=cache)  # предвычисления — вне замера
+            return lambda: strategy(points, 0.37, cache=cache)
+
+        cases.append(Case(f"strategy.position.{name}", POINT_SIZES, setup))
+
+    for name in list(StrategyRegistry._orientation_strategies):
+        def setup(n, name=name):
+            points = random_walk(n)
+            strategy = StrategyRegistry.get_orientation_strategy(name)
+            kwargs = {
+                "directions_seg": interpolate_orientation(points),
+                "cum_len": cumulative_lengths(points),
+            }
+            kwargs["total_len"] = float(kwargs["cum_len"][-1])
+            kwargs["cache"] = {}
+            strategy(points, 0.37, **kwargs)
+            return lambda: strategy(points, 0.37, **kwargs)
+
+        cases.append(Case(f"strategy.orientation.{name}", POINT_SIZES, setup))
+
+    return cases
+
+
+def _animator_cases() -> List[Case]:
+    from motion.animation_math import TrajectoryAnimator
+
+    def get_state(interpolation_type, orientation_type):
+        def setup(n):
+            animator = TrajectoryAnimator(random_walk(n))
+            return lambda: animator.get_state(0.37, interpolation_type, orientation_type)
+        return setup
+
+    def scene(m):
+        # M акторов на одной короткой траектории: стоимость кадра
+        animator = TrajectoryAnimator(random_walk(100))
+        return lambda: [animator.get_state(0.37, "length", "length") for _ in range(m)]
+
+    return [
+        Case("animator.get_state[index,index]", POINT_SIZES, get_state("index", "index")),
+        Case("animator.get_state[length,length]", POINT_SIZES, get_state("length", "length")),
+        Case("animator.frame[length,length]", ACTOR_SIZES, scene, param="M"),
+    ]
+
+
+def _actor_rows(m: int) -> List[dict]:
+    return scenarios.generate_actors(m, np.random.default_rng(SEED))
+
+
+def _loader_cases(tmp_dir: str) -> List[Case]:
+    global_params = {"sphere_radius": 0.1, "arrow_scale": 0.3}
+
+    def json_setup(m):
+        from motion.actor_loader import ActorLoader
+        path = os.path.join(tmp_dir, f"actors_{m}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"actors": _actor_rows(m)}, f)
+        return lambda: ActorLoader.load_from_json(path, global_params)
+
+    def csv_setup(m):
+        from motion.actor_loader import ActorLoader
+        path = os.path.join(tmp_dir, f"actors_{m}.tsv")
+        rows = _actor_rows(m)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\t".join(rows[0].keys()) + "\n")
+            for row in rows:
+                f.write("\t".join(row.values()) + "\n")
+        return lambda: ActorLoader.load_from_csv(path, global_params)
+
+    return [
+        Case("actor_loader.load_from_json", ACTOR_SIZES, json_setup, param="M"),
+        Case("actor_loader.load_from_csv", ACTOR_SIZES, csv_setup, param="M"),
+    ]
+
+
+def all_cases(tmp_dir: str = None) -> List[Case]:
+    """Все бенчмарки набора"""
+    tmp_dir = tmp_dir or tempfile.mkdtemp(prefix="amime_bench_")
+    return (
+        _trajectory_cases()
+        + _kinematics_cases()
+        + _strategy_cases()
+        + _animator_cases()
+        + _loader_cases(tmp_dir)
+    )
@@ -0,0 +1,148 @@
+"""
+Инфраструктура бенчмарков: замеры, оценка асимптотики, базовые линии.
+"""
+
+import json
+import platform
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+@dataclass
+class Case:
+    """
+    Один бенчмарк.
+
+    setup(n) готовит входные данные размера n и возвращает функцию без
+    аргументов, время работы которой и замеряется.
+    """
+    name: str
+    sizes: List[int]
+    setup: Callable[[int], Callable[[], object]]
+    param: str = "N"
+
+
+@dataclass
+class CaseResult:
+    """Результаты одного бенчмарка по размерам"""
+    name: str
+    param: str
+    timings: Dict[int, float] = field(default_factory=dict)
+    skipped: str = None
+
+    @property
+    def exponent(self) -> float:
+        """Показатель степени k в t ~ n^k (по размерам >= 1000)"""
+        sizes = [n for n in sorted(self.timings) if n >= 1000]
+        if len(sizes) < 2:
+            sizes = sorted(self.timings)
+        if len(sizes) < 2:
+            return float("nan")
+        x = np.log([float(n) for n in sizes])
+        y = np.log([max(self.timings[n], 1e-9) for n in sizes])
+        return float(np.polyfit(x, y, 1)[0])
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.2,
+            repeat: int = 3, max_calls: int = 100_000) -> float:
+    """
+    Лучшее из repeat среднее время одного вызова fn (сек).
+    Число вызовов в серии подбирается так, чтобы серия длилась >= min_time.
+    """
+    start = time.perf_counter()
+    fn()
+    single = time.perf_counter() - start
+
+    calls = int(min(max_calls, max(1, min_time / max(single, 1e-9))))
+    if single >= min_time:
+        repeat = 1
+
+    best = single
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def run_case(case: Case, max_size: int, min_time: float = 0.2) -> CaseResult:
+    """Прогнать бенчмарк по всем размерам, не превышающим max_size"""
+    result = CaseResult(case.name, case.param)
+    for n in case.sizes:
+        if n > max_size:
+            break
+        try:
+            fn = case.setup(n)
+        except ImportError as e:
+            result.skipped = f"missing dependency: {e.name}"
+            break
+        result.timings[n] = measure(fn, min_time=min_time)
+    return result
+
+
+# ============================================================
+# БАЗОВЫЕ ЛИНИИ (JSON)
+# ============================================================
+
+def environment() -> Dict[str, str]:
+    """Описание окружения, сохраняемое вместе с базовой линией"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def save_baseline(path: str, results: List[CaseResult]):
+    """Сохранить результаты как базовую линию"""
+    data = {
+        "environment": environment(),
+        "results": {
+            r.name: {str(n): t for n, t in r.timings.items()}
+            for r in results if r.timings
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[int, float]]:
+    """Загрузить базовую линию: {case: {n: seconds}}"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        name: {int(n): t for n, t in timings.items()}
+        for name, timings in data["results"].items()
+    }
+
+
+def find_regressions(results: List[CaseResult],
+                     baseline: Dict[str, Dict[int, float]],
+                     threshold: float = 0.25) -> List[tuple]:
+    """
+    Сравнить с базовой линией.
+
+    Returns:
+        список (case, n, old, new) для замедлений больше threshold (доля)
+    """
+    regressions = []
+    for r in results:
+        old_timings = baseline.get(r.name, {})
+        for n, new in r.timings.items():
+            old = old_timings.get(n)
+            if old is not None and new > old * (1.0 + threshold):
+                regressions.append((r.name, n, old, new))
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    """Человекочитаемое время"""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
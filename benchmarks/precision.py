@@ -0,0 +1,59 @@
+"""
+Время и память накопления длин дуги в режимах float32 и float64.
+
+Для каждого сценария считаются накопленные длины в обоих режимах
+и относительная ошибка полной длины. Проверка границ ошибки
+находится в tests/test_precision.py.
+
+    python -m benchmarks.precision --points 1000000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from motion import scenarios
+from motion.trajectory import cumulative_lengths
+
+KINDS = ["helix", "random_walk", "sharp_corners", "long_polyline", "duplicates"]
+
+
+def measure(points64: np.ndarray) -> dict:
+    """Сравнить float32 и float64 на одной траектории"""
+    points32 = points64.astype(np.float32)
+
+    start = time.perf_counter()
+    cum64 = cumulative_lengths(points64)
+    t64 = time.perf_counter() - start
+    start = time.perf_counter()
+    cum32 = cumulative_lengths(points32)
+    t32 = time.perf_counter() - start
+
+    return {
+        "cum_rel_err": float(abs(cum32[-1] - cum64[-1]) / max(cum64[-1], 1e-300)),
+        "time64": t64,
+        "time32": t32,
+        "bytes64": points64.nbytes,
+        "bytes32": points32.nbytes,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="float32 vs float64 arc-length timing")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for kind in KINDS:
+        points = scenarios.generate_scenario(kind, args.points, 1, args.seed).trajectory
+        r = measure(points.astype(np.float64))
+        print(f"{kind:15s} cum_rel={r['cum_rel_err']:.2e}  "
+              f"cum_lengths {r['time64'] * 1e3:.1f} ms -> {r['time32'] * 1e3:.1f} ms, "
+              f"{r['bytes64'] >> 10} KiB -> {r['bytes32'] >> 10} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
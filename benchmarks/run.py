@@ -0,0 +1,84 @@
+"""
+Запуск набора бенчмарков.
+
+    python -m benchmarks.run --max-n 100000 --save baseline.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.25
+
+Код возврата 1, если найдены регрессии относительно базовой линии.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import sys
+import tempfile
+
+from benchmarks.cases import all_cases
+from benchmarks.harness import (
+    run_case,
+    save_baseline,
+    load_baseline,
+    find_regressions,
+    format_time,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Amime benchmark suite")
+    parser.add_argument("--max-n", type=float, default=1e6,
+                        help="максимальное число точек траектории (до 1e7)")
+    parser.add_argument("--max-actors", type=float, default=1e4,
+                        help="максимальное число акторов (до 1e5)")
+    parser.add_argument("--filter", default="*",
+                        help="glob по именам бенчмарков, например 'trajectory.*'")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="минимальная длительность серии замеров (сек)")
+    parser.add_argument("--save", metavar="PATH", help="сохранить базовую линию в JSON")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с базовой линией")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="допустимое замедление (доля), по умолчанию 0.25")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="amime_bench_") as tmp_dir:
+        for case in all_cases(tmp_dir):
+            if not fnmatch.fnmatch(case.name, args.filter):
+                continue
+
+            max_size = args.max_actors if case.param == "M" else args.max_n
+            # загрузчик печатает найденные колонки — не засоряем отчёт
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_case(case, int(max_size), args.min_time)
+            results.append(result)
+
+            if result.skipped:
+                print(f"{case.name:55s} skipped ({result.skipped})")
+                continue
+
+            timings = ", ".join(f"{case.param}={n}: {format_time(t)}"
+                                for n, t in result.timings.items())
+            print(f"{case.name:55s} ~{case.param}^{result.exponent:.2f}  {timings}")
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        regressions = find_regressions(results, load_baseline(args.compare), args.threshold)
+        for name, n, old, new in regressions:
+            print(f"REGRESSION {name} n={n}: {format_time(old)} -> {format_time(new)} "
+                  f"(x{new / old:.2f})")
+        if regressions:
+            return 1
+        print("No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
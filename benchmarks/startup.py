@@ -0,0 +1,80 @@
+"""
+Контроль времени импорта вычислительных модулей.
+
+Каждый модуль импортируется в отдельном чистом процессе. Проверяется, что
+тяжёлые зависимости (SciPy, PyVista, VTK) не загружаются, и что время
+импорта не превышает бюджет.
+
+    python -m benchmarks.startup --budget 0.5
+
+Код возврата 1 при нарушении.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Модули, которые должны импортироваться с одним NumPy
+COMPUTE_MODULES = [
+    "motion.trajectory",
+    "motion.kinematics",
+    "motion.interpolation_strategies",
+    "motion.animation_math",
+    "motion.speed",
+    "motion.camera_rig",
+    "motion.quaternions",
+    "motion.actor_loader",
+    "motion.scenarios",
+    "motion.trajectory_io",
+    "motion.streaming",
+]
+
+HEAVY_MODULES = ["scipy", "pyvista", "vtk", "vtkmodules", "matplotlib"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"time": elapsed, "heavy": heavy}}))
+"""
+
+
+def probe(module: str) -> dict:
+    """Импортировать модуль в новом процессе: время и загруженные тяжёлые модули"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # numpy уже в кэше ОС после первого запуска; меряем именно наш импорт
+    code = "import numpy\n" + _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time guard for compute modules")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="максимальное время импорта модуля (сек)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in COMPUTE_MODULES:
+        result = probe(module)
+        status = "ok"
+        if result["heavy"]:
+            status = f"FAIL: loads {', '.join(result['heavy'])}"
+            failed = True
+        elif result["time"] > args.budget:
+            status = f"FAIL: over budget {args.budget:.3f} s"
+            failed = True
+        print(f"{module:40s} {result['time'] * 1e3:8.1f} ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
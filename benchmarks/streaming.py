@@ -0,0 +1,144 @@
+"""
+Пропускная способность и задержка потоковой передачи состояний (localhost).
+
+Сервер публикует кадры M акторов, движущихся по окружностям. Быстрые
+клиенты принимают всё, медленный клиент обрабатывает кадр дольше периода
+публикации и должен пропускать кадры, не тормозя сервер и остальных.
+
+    python -m benchmarks.streaming --actors 10000 --frames 600 --fps 120
+    python -m benchmarks.streaming --unix /tmp/amime.sock
+
+Код возврата 1, если ошибка декодирования превышает половину шага
+квантования или медленный клиент не пропускал кадры (отстаёт, копя очередь).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from motion.streaming import StateStreamClient, StateStreamServer
+
+
+def scene(m: int, frame: int, fps: float):
+    """Позиции и направления M акторов на кадре frame"""
+    phase = np.linspace(0.0, 2 * np.pi, m, endpoint=False)
+    radius = 10.0 + np.arange(m) % 50
+    # движется каждый десятый актор: остальные стоят (разреженная дельта)
+    moving = np.arange(m) % 10 == 0
+    angle = phase + np.where(moving, 0.5 * frame / fps, 0.0)
+    position = np.stack([radius * np.cos(angle), radius * np.sin(angle),
+                         np.sin(angle * 3)], axis=1)
+    direction = np.stack([-np.sin(angle), np.cos(angle), np.zeros(m)], axis=1)
+    return position, direction
+
+
+async def receive(client: StateStreamClient, stats: dict, frames: int, delay: float,
+                  expected: dict, quantum: float):
+    latencies, errors, last = [], [], None
+    async for frame in client.frames():
+        latencies.append(time.time() - frame.timestamp)
+        reference = expected.get(frame.frame)
+        if reference is not None:
+            errors.append(np.abs(frame.position - reference).max())
+        last = frame.frame
+        if delay:
+            await asyncio.sleep(delay)
+        if last >= frames:
+            break
+
+    stats.update(
+        received=len(latencies),
+        latency=np.array(latencies),
+        max_error=max(errors) if errors else 0.0,
+    )
+
+
+async def run(args) -> int:
+    server = StateStreamServer(path=args.unix, quantum=args.quantum, window=args.window)
+    await server.start()
+
+    names = [f"actor_{i}" for i in range(args.actors)]
+    stats = [{} for _ in range(args.clients + 1)]
+    expected = {}
+    clients = []
+    for i in range(args.clients + 1):
+        client = StateStreamClient(port=server.port, path=args.unix)
+        await client.connect()
+        clients.append(client)
+    # медленный клиент — последний
+    delays = [0.0] * args.clients + [args.slow_factor / args.fps]
+    tasks = [asyncio.create_task(receive(c, s, args.frames, d, expected, args.quantum))
+             for c, s, d in zip(clients, stats, delays)]
+    await asyncio.sleep(0.05)
+
+    period = 1.0 / args.fps
+    start = time.perf_counter()
+    publish_time = 0.0
+    for frame in range(1, args.frames + 1):
+        position, direction = scene(args.actors, frame, args.fps)
+        expected[frame] = position
+        t0 = time.perf_counter()
+        server.publish(names, position, direction, frame=frame)
+        publish_time += time.perf_counter() - t0
+        await asyncio.sleep(max(0.0, start + frame * period - time.perf_counter()))
+        expected.pop(frame - 4 * args.fps, None)
+
+    await asyncio.wait(tasks, timeout=5.0)
+    elapsed = time.perf_counter() - start
+    subscribers = list(server.subscribers)
+    for client in clients:
+        await client.close()
+    await server.stop()
+
+    failed = False
+    print(f"actors={args.actors} frames={args.frames} fps={args.fps} "
+          f"transport={'unix' if args.unix else 'tcp'}")
+    print(f"publish: {publish_time / args.frames * 1e3:.3f} ms/frame")
+    for i, (s, sub) in enumerate(zip(stats, subscribers)):
+        kind = "slow" if i == args.clients else "fast"
+        latency = s.get("latency", np.zeros(1))
+        print(f"client {i} ({kind}): received {s.get('received', 0):5d} "
+              f"dropped {sub.frames_dropped:5d}  "
+              f"{sub.bytes_sent / elapsed / 1e6:8.2f} MB/s  "
+              f"{sub.bytes_sent / max(sub.frames_sent, 1):10.0f} B/frame  "
+              f"latency p50 {np.percentile(latency, 50) * 1e3:6.2f} ms "
+              f"p99 {np.percentile(latency, 99) * 1e3:6.2f} ms  "
+              f"max error {s.get('max_error', 0.0):.2e}")
+        if s.get("max_error", 0.0) > args.quantum / 2 + 1e-9:
+            failed = True
+        if kind == "slow" and not sub.frames_dropped:
+            failed = True
+
+    raw = args.actors * 7 * 8
+    print(f"raw float64 frame: {raw} B")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="State streaming throughput/latency")
+    parser.add_argument("--actors", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=int, default=120, help="частота публикации")
+    parser.add_argument("--clients", type=int, default=2, help="число быстрых клиентов")
+    parser.add_argument("--slow-factor", type=float, default=4.0,
+                        help="во сколько раз медленный клиент медленнее публикации")
+    parser.add_argument("--quantum", type=float, default=1e-3)
+    parser.add_argument("--window", type=int, default=2,
+                        help="неподтверждённых кадров в пути на клиента")
+    parser.add_argument("--unix", metavar="PATH", nargs="?",
+                        const=os.path.join(tempfile.gettempdir(), "amime_stream.sock"),
+                        help="Unix-сокет вместо TCP")
+    args = parser.parse_args(argv)
+
+    if args.unix and os.path.exists(args.unix):
+        os.unlink(args.unix)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
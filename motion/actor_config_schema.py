@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any
 
 
@@ -10,6 +10,9 @@ class ActorConfigRow:
     interpolation_type: str
     orientation_type: str
     extra: Dict[str, Any] = None  # Для будущих параметров
+    # Разобранные значения extra (кэш; не входит в конфигурацию)
+    parsed: Dict[str, Any] = field(default_factory=dict, init=False,
+                                   repr=False, compare=False)
 
     def __post_init__(self):
         if self.extra is None:
@@ -1,8 +1,10 @@
 import csv
 import json
-from typing import List, Dict
+import os
+from typing import List, Dict, Optional
 from motion.actor_config_schema import ActorConfigRow
 from motion.actor_configuration import ActorConfigurationBuilder
+from motion.lanes import lane_offsets
 
 
 class ActorLoader:
@@ -11,30 +13,41 @@ class ActorLoader:
     # Определяем обязательные поля
     REQUIRED_FIELDS = {'actor', 'color', 'interpolation_type', 'orientation_type'}
 
+    @staticmethod
+    def load(filepath: str, global_params: Dict) -> tuple:
+        """Загрузить конфигурацию, выбрав формат по расширению файла"""
+        suffix = os.path.splitext(filepath)[1].lower()
+        if suffix == ".json":
+            return ActorLoader.load_from_json(filepath, global_params)
+        if suffix in (".tsv", ".csv", ".txt"):
+            return ActorLoader.load_from_csv(filepath, global_params)
+        raise ValueError(f"Unknown actor config format: {suffix}")
+
     @staticmethod
     def load_from_json(filepath: str, global_params: Dict) -> tuple:
         """Загрузить из JSON"""
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        rows = []
-        for item in data['actors']:
-            # Проверяем обязательные поля
-            ActorLoader._validate_item(item)
-
-            # Извлекаем обязательные поля
-            row = ActorConfigRow(
-                actor_type=item['actor'],
-                color=item['color'],
-                interpolation_type=item['interpolation_type'],
-                orientation_type=item['orientation_type'],
-                extra={k: v for k, v in item.items()
-                       if k not in ActorLoader.REQUIRED_FIELDS}
-            )
-            rows.append(row)
-
+        rows = [ActorLoader.row_from_item(item) for item in data['actors']]
         return ActorLoader._build_config(rows, global_params)
 
+    @staticmethod
+    def row_from_item(item: Dict) -> ActorConfigRow:
+        """Разобрать один элемент JSON-конфигурации"""
+        # Проверяем обязательные поля
+        ActorLoader._validate_item(item)
+
+        # Извлекаем обязательные поля
+        return ActorConfigRow(
+            actor_type=item['actor'],
+            color=item['color'],
+            interpolation_type=item['interpolation_type'],
+            orientation_type=item['orientation_type'],
+            extra={k: v for k, v in item.items()
+                   if k not in ActorLoader.REQUIRED_FIELDS}
+        )
+
     @staticmethod
     def load_from_csv(filepath: str, global_params: Dict) -> tuple:
         """Загрузить из CSV (табуляция)"""
@@ -53,39 +66,46 @@ class ActorLoader:
                 print(f"Найденные колонки: {reader.fieldnames}")
 
             for row in reader:
-                try:
-                    # Получаем обязательные поля
-                    actor_type = ActorLoader._get_value(row, ['actor', 'actor_type', 'type'])
-                    color = ActorLoader._get_value(row, ['color', 'Color'])
-                    interp_type = ActorLoader._get_value(row, ['interpolation_type', 'interpolation', 'method'])
-                    orient_type = ActorLoader._get_value(row, ['orientation_type', 'orientation'])
-
-                    if not all([actor_type, color, interp_type, orient_type]):
-                        print(f"Пропускаем строку (неполные данные): {row}")
-                        continue
-
-                    # Остальные параметры идут в extra
-                    extra = {k: v for k, v in row.items()
-                             if k not in ['actor', 'actor_type', 'type', 'color', 'Color',
-                                          'interpolation_type', 'interpolation', 'method',
-                                          'orientation_type', 'orientation']}
-
-                    rows.append(ActorConfigRow(
-                        actor_type=actor_type.strip(),
-                        color=color.strip(),
-                        interpolation_type=interp_type.strip(),
-                        orientation_type=orient_type.strip(),
-                        extra=extra
-                    ))
-                except Exception as e:
-                    print(f"Ошибка при чтении строки: {e}")
-                    continue
+                parsed = ActorLoader.row_from_csv(row)
+                if parsed is not None:
+                    rows.append(parsed)
 
         if not rows:
             raise ValueError(f"Не найдены валидные строки в файле {filepath}")
 
         return rows
 
+    @staticmethod
+    def row_from_csv(row: Dict) -> Optional[ActorConfigRow]:
+        """Разобрать одну строку CSV (None — строка пропущена)"""
+        try:
+            # Получаем обязательные поля
+            actor_type = ActorLoader._get_value(row, ['actor', 'actor_type', 'type'])
+            color = ActorLoader._get_value(row, ['color', 'Color'])
+            interp_type = ActorLoader._get_value(row, ['interpolation_type', 'interpolation', 'method'])
+            orient_type = ActorLoader._get_value(row, ['orientation_type', 'orientation'])
+
+            if not all([actor_type, color, interp_type, orient_type]):
+                print(f"Пропускаем строку (неполные данные): {row}")
+                return None
+
+            # Остальные параметры идут в extra
+            extra = {k: v for k, v in row.items()
+                     if k not in ['actor', 'actor_type', 'type', 'color', 'Color',
+                                  'interpolation_type', 'interpolation', 'method',
+                                  'orientation_type', 'orientation']}
+
+            return ActorConfigRow(
+                actor_type=actor_type.strip(),
+                color=color.strip(),
+                interpolation_type=interp_type.strip(),
+                orientation_type=orient_type.strip(),
+                extra=extra
+            )
+        except Exception as e:
+            print(f"Ошибка при чтении строки: {e}")
+            return None
+
     @staticmethod
     def _get_value(row: dict, possible_keys: List[str]) -> str:
         """Получить значение из словаря по одному из возможных ключей"""
@@ -108,16 +128,33 @@ class ActorLoader:
         animation_config = {}
 
         for idx, row in enumerate(rows):
-            actor_name = f"{row.actor_type}_{row.color}_{idx}"
-
-            if row.actor_type.lower() == "sphere":
-                actor_config.add_sphere(actor_name, color=row.color)
-            elif row.actor_type.lower() == "arrow":
-                actor_config.add_arrow(actor_name, color=row.color)
-            else:
-                raise ValueError(f"Unknown actor type: {row.actor_type}")
+            actor_name = ActorLoader.actor_name(row, idx)
+            if actor_name in animation_config:
+                raise ValueError(f"Duplicate actor name: {actor_name}")
+            # смещения полосы разбираются один раз здесь, а не в кадре
+            lane_offsets(row)
+            ActorLoader.add_row(actor_config, actor_name, row)
 
             # Сохраняем всю конфигурацию актора
             animation_config[actor_name] = row
 
-        return actor_config, animation_config
\ No newline at end of file
+        return actor_config, animation_config
+
+    @staticmethod
+    def actor_name(row: ActorConfigRow, idx: int) -> str:
+        """Имя актора: явное поле "name" или тип, цвет и номер строки"""
+        name = row.extra.get("name")
+        if name not in (None, ""):
+            return str(name)
+        return f"{row.actor_type}_{row.color}_{idx}"
+
+    @staticmethod
+    def add_row(actor_config: ActorConfigurationBuilder, actor_name: str,
+                row: ActorConfigRow) -> None:
+        """Добавить визуалы актора по строке конфигурации"""
+        if row.actor_type.lower() == "sphere":
+            actor_config.add_sphere(actor_name, color=row.color)
+        elif row.actor_type.lower() == "arrow":
+            actor_config.add_arrow(actor_name, color=row.color)
+        else:
+            raise ValueError(f"Unknown actor type: {row.actor_type}")
\ No newline at end of file
@@ -1,6 +1,8 @@
 import time
 from motion.visualization import TrajectoryVisualizer
 from motion.constants import STEPS, FRAME_DELAY
+from motion.double_buffer import DoubleBuffer
+from motion.upsampling import LiveUpsampler
 
 
 class AnimationLoop:
@@ -9,27 +11,118 @@ class AnimationLoop:
     def __init__(self, visualizer: TrajectoryVisualizer,
                  current_t: dict,
                  steps: int = STEPS,
-                 frame_delay: float = FRAME_DELAY):
+                 frame_delay: float = FRAME_DELAY,
+                 camera_rig=None,
+                 double_buffered: bool = False,
+                 reloader=None,
+                 upsample: int = 1):
         """
         Args:
             visualizer: визуализатор сцены
             current_t: словарь с текущим временем {"value": 0.0}
             steps: количество шагов в одной итерации
             frame_delay: задержка между кадрами (сек)
+            camera_rig: CameraRig с заранее рассчитанными треками камер
+            double_buffered: считать следующий кадр в рабочем потоке,
+                пока рисуется текущий
+            reloader: SceneReloader — горячая перезагрузка конфигурации
+            upsample: кадров показа на одну выборку симуляции; состояния
+                между выборками интерполируются (lerp + SLERP).
+                Несовместим с double_buffered
         """
+        if double_buffered and int(upsample) > 1:
+            raise ValueError("double_buffered and upsample > 1 cannot be combined")
         self.visualizer = visualizer
         self.current_t = current_t
         self.steps = steps
         self.frame_delay = frame_delay
+        self.camera_rig = camera_rig
+        self.double_buffered = double_buffered
+        self.reloader = reloader
+        self.upsample = max(1, int(upsample))
 
     def run(self):
         """Запустить цикл анимации"""
+        if self.double_buffered:
+            self._run_double_buffered()
+            return
+        if self.upsample > 1:
+            self._run_upsampled()
+            return
+
         try:
             while True:
                 for i in range(self.steps):
+                    if self.reloader is not None:
+                        self.reloader.poll()
                     self.current_t["value"] = i / (self.steps - 1)
                     self.visualizer.update_all_actors()
+                    if self.camera_rig is not None:
+                        self.camera_rig.apply(self.visualizer.plotter, self.current_t["value"])
                     self.visualizer.update()
                     time.sleep(self.frame_delay)
         except KeyboardInterrupt:
-            print("Animation stopped")
\ No newline at end of file
+            print("Animation stopped")
+
+    def _frame_t(self, i: int) -> float:
+        return (i % self.steps) / (self.steps - 1)
+
+    def _compute(self, t: float):
+        self.current_t["value"] = t
+        return self.visualizer.compute_states()
+
+    def _run_double_buffered(self):
+        """Кадр k рисуется из переднего буфера, кадр k+1 считается в заднем"""
+        buffers = DoubleBuffer(self._compute)
+        buffers.prefetch(self._frame_t(0))
+        i = 0
+        try:
+            while True:
+                front = buffers.swap()
+                # сцена меняется, только пока рабочий поток простаивает
+                if self.reloader is not None:
+                    self.reloader.poll()
+                i += 1
+                buffers.prefetch(self._frame_t(i))
+
+                self.visualizer.apply_arrays(front.names, front.position, front.yaw,
+                                             front.direction)
+                if self.camera_rig is not None:
+                    self.camera_rig.apply(self.visualizer.plotter, front.t)
+                self.visualizer.update()
+                time.sleep(self.frame_delay)
+        except KeyboardInterrupt:
+            print("Animation stopped")
+        finally:
+            buffers.close()
+
+    def _run_upsampled(self):
+        """Состояния считаются раз в upsample кадров, между ними — интерполяция"""
+        # выборки симуляции внутри цикла; последний кадр цикла — всегда выборка
+        keys = sorted(set(range(0, self.steps, self.upsample)) | {self.steps - 1})
+        sampler = LiveUpsampler()
+
+        try:
+            while True:
+                # на границе цикла — скачок к началу без интерполяции
+                self._sample(sampler, keys[0])
+                for a, b in zip(keys[:-1], keys[1:]):
+                    if self.reloader is not None:
+                        self.reloader.poll()
+                    self._sample(sampler, b)
+                    for i in range(a, b):
+                        self._show_interpolated(sampler, (i - a) / (b - a), i)
+                self._show_interpolated(sampler, 1.0, keys[-1])
+        except KeyboardInterrupt:
+            print("Animation stopped")
+
+    def _sample(self, sampler: LiveUpsampler, frame: int):
+        sampler.push(self._compute(self._frame_t(frame)), list(self.visualizer.actors))
+
+    def _show_interpolated(self, sampler: LiveUpsampler, alpha: float, frame: int):
+        names, position, direction, yaw = sampler.sample(alpha)
+        self.visualizer.apply_arrays(names, position, yaw, direction)
+        if self.camera_rig is not None:
+            self.camera_rig.apply(self.visualizer.plotter, self._frame_t(frame))
+        self.visualizer.update()
+        time.sleep(self.frame_delay)
@@ -2,15 +2,41 @@ import numpy as np
 from motion.trajectory import (
     cumulative_lengths,
     polyline_length,
+    index_to_length,
+    length_to_index,
+    interpolate_positions_by_length,
+    interpolate_orientations_by_length,
 )
 from motion.interpolation_strategies import StrategyRegistry
+from motion.precision import as_positions, get_dtype
+from motion.lanes import LaneFrames
 
 
 class TrajectoryAnimator:
     """Вычисление состояния объекта в момент времени анимации"""
 
-    def __init__(self, trajectory):
+    def __init__(self, trajectory, cache=None):
+        """
+        Args:
+            trajectory: массив 3D точек
+            cache: DerivedCache — брать производные таблицы с диска
+        """
+        # Точки хранятся в рабочем типе (см. motion.precision)
+        trajectory = as_positions(trajectory)
         self.trajectory = trajectory
+
+        # Предвычисления стратегий (коэффициенты сплайнов и т.п.)
+        self.strategy_cache = {}
+
+        if cache is not None:
+            tables = cache.trajectory_tables(trajectory)
+            self.cum_len = tables["cum_len"]
+            self.directions_seg = tables["directions"]
+            self.total_len = float(tables["total_len"][0])
+            # коэффициенты сплайнов тоже читаются с диска
+            self.strategy_cache = cache.strategy_tables(trajectory)
+            return
+
         self.cum_len = cumulative_lengths(trajectory)
         self.total_len = polyline_length(trajectory)
 
@@ -18,19 +44,48 @@ class TrajectoryAnimator:
         from motion.trajectory import interpolate_orientation
         self.directions_seg = interpolate_orientation(trajectory)
 
-    def get_state(self, t: float, interpolation_type: str, orientation_type: str) -> dict:
+    @property
+    def lanes(self) -> LaneFrames:
+        """Предвычисления полос этой траектории (строятся при первом обращении)"""
+        if "lanes" not in self.strategy_cache:
+            self.strategy_cache["lanes"] = LaneFrames(self.trajectory, cum_len=self.cum_len,
+                                                      directions=self.directions_seg)
+        return self.strategy_cache["lanes"]
+
+    def lane_positions(self, t, interpolation_type: str, lateral: float,
+                       vertical: float = 0.0, base_positions=None) -> np.ndarray:
+        """
+        Позиции на полосе со смещением (lateral, vertical).
+
+        "index" и "length" считаются по самой полосе (длина дуги полосы
+        с поправкой на смещение); остальные стратегии — базовая позиция
+        плюс смещение полосы в той же точке по индексу.
+        """
+        lanes = self.lanes
+        if interpolation_type == "length":
+            return lanes.positions(t, lateral, vertical, by_length=True)
+        if interpolation_type == "index":
+            return lanes.positions(t, lateral, vertical, by_length=False)
+        t_idx = np.asarray(t, dtype=float) * (len(self.trajectory) - 1)
+        return base_positions + lanes.offsets_by_index(t_idx, lateral, vertical)
+
+    def get_state(self, t: float, interpolation_type: str, orientation_type: str,
+                  lateral: float = 0.0, vertical: float = 0.0) -> dict:
         """
         Args:
             t: параметр времени [0, 1]
             interpolation_type: название стратегии позиции
             orientation_type: название стратегии ориентации
+            lateral, vertical: смещение полосы (см. motion.lanes)
         """
         # Получаем стратегии из реестра
         pos_strategy = StrategyRegistry.get_position_strategy(interpolation_type)
         orient_strategy = StrategyRegistry.get_orientation_strategy(orientation_type)
 
         # Вычисляем позицию
-        pos = pos_strategy(self.trajectory, t)
+        pos = pos_strategy(self.trajectory, t, cache=self.strategy_cache)
+        if lateral or vertical:
+            pos = self.lane_positions(t, interpolation_type, lateral, vertical, pos)
 
         # Вычисляем направление
         # Передаём дополнительные параметры, которые могут понадобиться стратегии
@@ -39,7 +94,8 @@ class TrajectoryAnimator:
             t,
             directions_seg=self.directions_seg,
             cum_len=self.cum_len,
-            total_len=self.total_len
+            total_len=self.total_len,
+            cache=self.strategy_cache
         )
         direction = direction / np.linalg.norm(direction)
 
@@ -51,6 +107,90 @@ class TrajectoryAnimator:
             "direction": direction
         }
 
+    def get_states(self, t_values, interpolation_type: str, orientation_type: str,
+                   lateral: float = 0.0, vertical: float = 0.0) -> dict:
+        """
+        Состояния для массива моментов времени (запекание трека).
+
+        Args:
+            t_values: array-like, shape (K,), параметры времени [0, 1]
+            lateral, vertical: смещение полосы (см. motion.lanes)
+
+        Returns:
+            dict с массивами position (K, 3), direction (K, 3), yaw (K,), s (K,)
+        """
+        t_values = np.asarray(t_values, dtype=float)
+        pos_strategy = StrategyRegistry.get_position_strategy(interpolation_type)
+        orient_strategy = StrategyRegistry.get_orientation_strategy(orientation_type)
+        pos_vectorized = getattr(pos_strategy, "vectorized", False)
+        orient_vectorized = getattr(orient_strategy, "vectorized", False)
+
+        # невекторные стратегии вызываются по моментам, векторные — одним вызовом
+        if pos_vectorized:
+            position = pos_strategy(self.trajectory, t_values, cache=self.strategy_cache)
+        else:
+            position = [pos_strategy(self.trajectory, t, cache=self.strategy_cache)
+                        for t in t_values]
+
+        orient_kwargs = dict(directions_seg=self.directions_seg, cum_len=self.cum_len,
+                             total_len=self.total_len, cache=self.strategy_cache)
+        if orient_vectorized:
+            direction = orient_strategy(self.trajectory, t_values, **orient_kwargs).reshape(-1, 3)
+            direction = direction / np.linalg.norm(direction, axis=1, keepdims=True)
+        else:
+            # нормировка по одному вектору — как в get_state (совпадение до бита)
+            direction = [d / np.linalg.norm(d) for d in
+                         (orient_strategy(self.trajectory, t, **orient_kwargs)
+                          for t in t_values)]
+            direction = np.asarray(direction, dtype=float).reshape(-1, 3)
+        yaw = np.degrees(np.arctan2(direction[:, 1], direction[:, 0]))
+
+        if lateral or vertical:
+            # полоса — один пакетный вызов на все моменты
+            position = self.lane_positions(t_values, interpolation_type, lateral, vertical,
+                                           np.asarray(position, dtype=float))
+
+        return {
+            "position": np.asarray(position, dtype=get_dtype()),
+            "direction": np.asarray(direction, dtype=get_dtype()).reshape(-1, 3),
+            "yaw": np.asarray(yaw, dtype=get_dtype()),
+            "s": self.arc_length(t_values, interpolation_type),
+        }
+
+    def states_at_lengths(self, s) -> dict:
+        """
+        Состояния в точках с длиной дуги s (векторно), как у стратегий "length".
+
+        Returns:
+            dict с массивами s, position (..., 3), direction (..., 3), yaw
+        """
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.total_len)
+        direction = interpolate_orientations_by_length(self.cum_len, self.directions_seg, s)
+        return {
+            "s": s,
+            "position": interpolate_positions_by_length(self.trajectory, s, self.cum_len),
+            "direction": direction,
+            "yaw": np.degrees(np.arctan2(direction[..., 1], direction[..., 0])),
+        }
+
+    def arc_length(self, t, interpolation_type: str):
+        """
+        Длина дуги s, пройденная к моменту t выбранной стратегией позиции.
+        """
+        if interpolation_type == "length":
+            return np.asarray(t, dtype=float) * self.total_len
+        return index_to_length(self.cum_len, np.asarray(t) * (len(self.trajectory) - 1))
+
+    def parameter_at_length(self, s, interpolation_type: str):
+        """
+        Момент t ∈ [0, 1], когда стратегия позиции проходит длину s
+        (обращение arc_length, векторно).
+        """
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.total_len)
+        if interpolation_type == "length":
+            return s / max(self.total_len, 1e-12)
+        return length_to_index(self.cum_len, s) / max(len(self.trajectory) - 1, 1)
+
     # Для обратной совместимости
     def get_state_by_parameter(self, t: float) -> dict:
         return self.get_state(t, "index", "index")
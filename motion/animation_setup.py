@@ -3,23 +3,29 @@ from motion.animation_math import TrajectoryAnimator
 from motion.visualization import TrajectoryVisualizer, ActorState
 from motion.mesh_factory import MeshFactory
 from motion.actor_loader import ActorLoader
+from motion.actor_config_schema import ActorConfigRow
 from motion.kinematics_visualization import KinematicsVisualizer
+from motion.timeline import Timeline
+from motion.lanes import lane_offsets
+from motion.headway import convoy_groups
 
 
 class AnimationSetup:
     """Инициализация и подготовка анимации"""
 
     def __init__(self, trajectory, global_config: Dict, config_file: str,
-                 use_kinematics: bool = False):
+                 use_kinematics: bool = False, off_screen: bool = False):
         self.trajectory = trajectory
         self.global_config = global_config
         self.config_file = config_file
         self.use_kinematics = use_kinematics
+        self.off_screen = off_screen
 
         self.animator = None
         self.visualizer = None
         self.kinematics_viz = None
         self.animation_config = None
+        self.timeline = None
 
     def setup(self) -> Tuple[TrajectoryVisualizer, TrajectoryAnimator, Dict]:
         """Полная инициализация"""
@@ -29,54 +35,78 @@ class AnimationSetup:
         self.visualizer = TrajectoryVisualizer(
             self.trajectory,
             self.global_config,
-            mesh_factory
+            mesh_factory,
+            off_screen=self.off_screen
         )
 
         if self.use_kinematics:
             self.kinematics_viz = KinematicsVisualizer(self.trajectory)
+            self.kinematics_viz.add_overlays(self.visualizer.plotter)
 
         self._load_actors_config()
         self._add_actors_to_scene()
+        self.refresh_timeline()
+        self._warn_convoys()
 
         return self.visualizer, self.animator, self.animation_config
 
     def _load_actors_config(self):
         """Загрузить конфигурацию акторов из файла"""
-        actor_config, self.animation_config = ActorLoader.load_from_json(
+        actor_config, self.animation_config = ActorLoader.load(
             self.config_file,
             self.global_config
         )
         self.actor_config = actor_config
 
-    def _add_actors_to_scene(self):
-        """Добавить акторов на сцену с провайдерами состояния"""
-
-        def make_provider(actor_row):
-            """Создать провайдер для актора с его конфигурацией"""
-
-            def provider():
-                # Получаем типы интерполяции из конфигурации
-                interp_type = actor_row.interpolation_type
-                orient_type = actor_row.orientation_type
-
-                # Используем гибкий метод get_state
-                state = self.animator.get_state(
-                    self._current_t["value"],
-                    interp_type,
-                    orient_type
-                )
+    def _warn_convoys(self):
+        """Колонны соблюдаются только при запекании (bake_scene и др.)"""
+        groups = convoy_groups(self.animation_config)
+        if groups:
+            print(f"Предупреждение: колонны {sorted(groups)} (поле convoy) не применяются "
+                  f"в живой анимации — дистанция соблюдается только в запечённых треках")
+
+    def refresh_timeline(self):
+        """Пересобрать таймлайн по текущей конфигурации акторов"""
+        self.timeline = Timeline.from_config(self.animation_config)
+        self.visualizer.set_timeline(self.timeline, self.get_current_t_dict())
+
+    def _make_provider(self, actor_name: str, actor_row):
+        """Создать провайдер для актора с его конфигурацией"""
+
+        def provider():
+            # Типы интерполяции читаются при каждом вызове —
+            # изменения строки конфигурации применяются на лету
+            interp_type = actor_row.interpolation_type
+            orient_type = actor_row.orientation_type
+
+            # Локальное время актора по таймлайну (или глобальное)
+            t = self.timeline.local_t(actor_name) if self.timeline is not None else None
+            if t is None:
+                t = self._current_t["value"]
+
+            # Используем гибкий метод get_state
+            lateral, vertical = lane_offsets(actor_row)
+            state = self.animator.get_state(
+                t,
+                interp_type,
+                orient_type,
+                lateral=lateral,
+                vertical=vertical
+            )
 
-                return ActorState(
-                    position=list(state["position"]),
-                    yaw=state["yaw"]
-                )
+            return ActorState(
+                position=list(state["position"]),
+                yaw=state["yaw"],
+                direction=state["direction"]
+            )
 
-            return provider
+        return provider
 
-        # Добавляем каждого актора
+    def _add_actors_to_scene(self):
+        """Добавить акторов на сцену с провайдерами состояния"""
         for actor_name, actor in self.actor_config.get_all_actors().items():
             actor_row = self.animation_config[actor_name]
-            provider = make_provider(actor_row)
+            provider = self._make_provider(actor_name, actor_row)
 
             self.visualizer.add_actor_with_provider(
                 actor_name,
@@ -84,6 +114,33 @@ class AnimationSetup:
                 provider
             )
 
+    def add_actor(self, actor_name: str, actor_row: ActorConfigRow, refresh: bool = True):
+        """
+        Добавить актора в уже работающую сцену.
+
+        Args:
+            refresh: пересобрать таймлайн сразу; False — серия правок,
+                refresh_timeline() вызывается один раз в конце
+        """
+        ActorLoader.add_row(self.actor_config, actor_name, actor_row)
+        self.animation_config[actor_name] = actor_row
+
+        self.visualizer.add_actor_with_provider(
+            actor_name,
+            self.actor_config.actors[actor_name].visuals,
+            self._make_provider(actor_name, actor_row)
+        )
+        if refresh:
+            self.refresh_timeline()
+
+    def remove_actor(self, actor_name: str, refresh: bool = True):
+        """Удалить актора из работающей сцены (refresh — как в add_actor)"""
+        self.visualizer.remove_actor(actor_name)
+        self.animation_config.pop(actor_name, None)
+        self.actor_config.actors.pop(actor_name, None)
+        if refresh:
+            self.refresh_timeline()
+
     def get_current_t_dict(self) -> Dict:
         """Получить словарь для хранения текущего времени"""
         if not hasattr(self, '_current_t'):
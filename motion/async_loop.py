@@ -0,0 +1,318 @@
+"""
+Асинхронный цикл анимации (asyncio) с ограниченной очередью кадров.
+
+Производитель заранее считает состояния следующих кадров (в отдельном
+потоке, чтобы не блокировать event loop) и кладёт их в очередь.
+Потребитель рисует кадры из очереди с целевой частотой. Всплески
+вычислений поглощаются очередью, а не останавливают отрисовку.
+
+Внешние команды (локальный сокет или файл-заглушка телеметрии) меняют
+параметры акторов между кадрами. Формат команды — одна JSON-строка:
+
+    {"actor": "arrow_cyan_0", "set": {"orientation_type": "tangent_velocity"}}
+
+Менять можно стратегии, цвет, расписание (start, duration, mode, profile)
+и числовые lateral, vertical, headway (SETTABLE_KEYS).
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Callable, Dict, List
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.constants import STEPS, FRAME_DELAY
+from motion.interpolation_strategies import StrategyRegistry
+from motion.lanes import parse_offset
+from motion.timeline import TIMING_KEYS, Timeline, Timing
+
+
+# ============================================================
+# КОМАНДЫ УПРАВЛЕНИЯ
+# ============================================================
+
+# Ключи, которые можно менять командой
+STRATEGY_KEYS = ("interpolation_type", "orientation_type")
+NUMERIC_KEYS = ("lateral", "vertical", "headway")
+SETTABLE_KEYS = STRATEGY_KEYS + ("color",) + TIMING_KEYS + NUMERIC_KEYS
+
+
+def apply_command(animation_config: Dict[str, ActorConfigRow], command: dict,
+                  set_color: Callable[[str, str], None] = None) -> set:
+    """
+    Применить команду к конфигурации актора. Строка меняется, только
+    если проверку прошла вся команда.
+
+    Args:
+        set_color: перекрасить визуалы актора (TrajectoryVisualizer.set_actor_color)
+
+    Returns:
+        изменённые ключи
+
+    Raises:
+        ValueError: неверная форма команды, неизвестный актор, ключ,
+            стратегия, число или расписание
+    """
+    if not isinstance(command, dict):
+        raise ValueError(f"Command must be a JSON object: {command!r}")
+    name = command.get("actor")
+    if not isinstance(name, str):
+        raise ValueError(f"Command actor must be a string: {name!r}")
+    row = animation_config.get(name)
+    if row is None:
+        raise ValueError(f"Unknown actor: {name}")
+    updates = command.get("set", {})
+    if not isinstance(updates, dict):
+        raise ValueError(f"Command set must be a JSON object: {updates!r}")
+
+    for key, value in updates.items():
+        if key not in SETTABLE_KEYS:
+            raise ValueError(f"Unknown command key: {key}. Available: {list(SETTABLE_KEYS)}")
+        if key == "interpolation_type":
+            StrategyRegistry.get_position_strategy(value)
+        elif key == "orientation_type":
+            StrategyRegistry.get_orientation_strategy(value)
+        elif key == "color" and not isinstance(value, str):
+            raise ValueError(f"Color must be a string: {value!r}")
+        elif key in ("lateral", "vertical"):
+            parse_offset(key, value)
+        elif key in NUMERIC_KEYS:
+            try:
+                float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number: {value!r}") from None
+
+    timing = {key: value for key, value in updates.items() if key in TIMING_KEYS}
+    if timing:
+        # проверить расписание до изменения строки
+        try:
+            Timing.from_row(replace(row, extra={**row.extra, **timing}))
+        except TypeError as e:
+            raise ValueError(f"Invalid timing: {e}") from None
+
+    if "color" in updates and set_color is not None:
+        # неизвестный цвет — ValueError до изменения строки
+        set_color(name, updates["color"])
+
+    for key, value in updates.items():
+        if key in STRATEGY_KEYS or key == "color":
+            setattr(row, key, value)
+        else:
+            row.extra[key] = value
+    return set(updates)
+
+
+class ControlServer:
+    """Приём команд по локальному TCP- или Unix-сокету (JSON-строки)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.commands: asyncio.Queue = None
+        self._server = None
+
+    async def start(self, commands: asyncio.Queue):
+        self.commands = commands
+        if self.path:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    await self.commands.put(json.loads(line))
+                except json.JSONDecodeError as e:
+                    writer.write(f"error: {e}\n".encode())
+        finally:
+            writer.close()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class FileControlSource:
+    """Чтение команд, дописываемых в файл (заглушка потока телеметрии)"""
+
+    def __init__(self, filepath: str, poll_interval: float = 0.05):
+        self.filepath = filepath
+        self.poll_interval = poll_interval
+        self._task = None
+
+    async def start(self, commands: asyncio.Queue):
+        self._task = asyncio.create_task(self._poll(commands))
+
+    async def _poll(self, commands: asyncio.Queue):
+        # смещение — в байтах файла (двоичный режим: CRLF не искажает счёт)
+        offset = 0
+        while True:
+            if os.path.exists(self.filepath):
+                with open(self.filepath, "rb") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # строка ещё дописывается
+                        offset += len(line)
+                        if not line.strip():
+                            continue
+                        try:
+                            await commands.put(json.loads(line))
+                        except ValueError as e:
+                            print(f"Команда отклонена: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+# ============================================================
+# ЦИКЛ АНИМАЦИИ
+# ============================================================
+
+class AsyncAnimationLoop:
+    """Цикл анимации: производитель состояний → очередь → отрисовка"""
+
+    def __init__(self, visualizer, current_t: dict,
+                 animation_config: Dict[str, ActorConfigRow] = None,
+                 steps: int = STEPS,
+                 frame_delay: float = FRAME_DELAY,
+                 queue_size: int = 8,
+                 controls: List = None,
+                 camera_rig=None,
+                 reloader=None,
+                 stream=None,
+                 setup=None):
+        """
+        Args:
+            visualizer: визуализатор сцены
+            current_t: словарь с текущим временем {"value": 0.0}
+            animation_config: конфигурация акторов (цель внешних команд)
+            steps: количество шагов в одной итерации
+            frame_delay: целевой интервал между кадрами (сек)
+            queue_size: сколько кадров производитель может считать наперёд
+            controls: источники команд (ControlServer, FileControlSource)
+            camera_rig: CameraRig с заранее рассчитанными треками камер
+            reloader: SceneReloader — горячая перезагрузка конфигурации
+            stream: StateStreamServer — рассылка состояний кадров клиентам
+            setup: AnimationSetup — пересборка таймлайна после команд расписания
+        """
+        self.visualizer = visualizer
+        self.current_t = current_t
+        self.animation_config = animation_config or {}
+        self.steps = steps
+        self.frame_delay = frame_delay
+        self.queue_size = queue_size
+        self.controls = controls or []
+        self.camera_rig = camera_rig
+        self.reloader = reloader
+        self.stream = stream
+        self.setup = setup
+
+        self.frames: asyncio.Queue = None
+        self.commands: asyncio.Queue = None
+        self.dropped_commands = 0
+        # один поток: состояния кадров считаются строго по порядку
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _compute(self, t: float) -> dict:
+        self.current_t["value"] = t
+        return self.visualizer.compute_states()
+
+    def _apply_pending_commands(self):
+        """Применить накопленные команды (между кадрами)"""
+        timing_changed = False
+        while not self.commands.empty():
+            command = self.commands.get_nowait()
+            try:
+                keys = apply_command(self.animation_config, command,
+                                     self.visualizer.set_actor_color)
+            except ValueError as e:
+                self.dropped_commands += 1
+                print(f"Команда отклонена: {e}")
+                continue
+
+            timing_changed |= bool(keys & set(TIMING_KEYS))
+            # стоящий актор не пересчитывается таймлайном — сбросить его время
+            timeline = self.visualizer.timeline
+            if timeline is not None:
+                timeline.invalidate(command["actor"])
+
+        if timing_changed:
+            self._refresh_timeline()
+
+    def _refresh_timeline(self):
+        """Пересобрать таймлайн по изменённым расписаниям"""
+        if self.setup is not None:
+            self.setup.refresh_timeline()
+        elif self.visualizer.timeline is not None:
+            self.visualizer.set_timeline(Timeline.from_config(self.animation_config),
+                                         self.visualizer.clock)
+
+    async def produce(self, frames: int = None):
+        """Считать состояния кадров наперёд и класть их в очередь"""
+        loop = asyncio.get_running_loop()
+        i = 0
+        while frames is None or i < frames:
+            self._apply_pending_commands()
+            if self.reloader is not None:
+                self.reloader.poll()
+            t = (i % self.steps) / (self.steps - 1)
+            states = await loop.run_in_executor(self._executor, self._compute, t)
+            await self.frames.put((t, states))
+            i += 1
+        await self.frames.put(None)
+
+    async def consume(self):
+        """Рисовать кадры из очереди с целевой частотой"""
+        next_frame = time.perf_counter()
+        while (item := await self.frames.get()) is not None:
+            t, states = item
+            self.visualizer.apply_states(states)
+            if self.stream is not None:
+                self.stream.publish_states(states, list(self.visualizer.actors))
+            if self.camera_rig is not None:
+                self.camera_rig.apply(self.visualizer.plotter, t)
+            self.visualizer.update()
+
+            next_frame += self.frame_delay
+            await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+            # отстали больше чем на кадр — не пытаемся догонять пачкой
+            next_frame = max(next_frame, time.perf_counter() - self.frame_delay)
+
+    async def run_async(self, frames: int = None):
+        """
+        Args:
+            frames: сколько кадров показать (None — бесконечно)
+        """
+        self.frames = asyncio.Queue(maxsize=self.queue_size)
+        self.commands = asyncio.Queue()
+
+        for control in self.controls:
+            await control.start(self.commands)
+        if self.stream is not None:
+            await self.stream.start()
+        try:
+            await asyncio.gather(self.produce(frames), self.consume())
+        finally:
+            for control in self.controls:
+                await control.stop()
+            if self.stream is not None:
+                await self.stream.stop()
+
+    def run(self, frames: int = None):
+        """Запустить цикл анимации (блокирующий вызов)"""
+        try:
+            asyncio.run(self.run_async(frames))
+        except KeyboardInterrupt:
+            print("Animation stopped")
+        finally:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,143 @@
+"""
+Запекание состояний акторов: все кадры анимации рассчитываются заранее
+и сохраняются в виде массивов (без окна и без цикла анимации).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from motion.animation_math import TrajectoryAnimator
+from motion.actor_config_schema import ActorConfigRow
+from motion.precision import state_array
+from motion.timeline import Timing
+from motion.lanes import lane_offsets
+from motion.headway import apply_convoys
+
+
+@dataclass
+class BakedTracks:
+    """Запечённые треки всех акторов"""
+    names: List[str]
+    t: np.ndarray          # (K,) параметры времени [0, 1]
+    position: np.ndarray   # (M, K, 3)
+    direction: np.ndarray  # (M, K, 3)
+    yaw: np.ndarray        # (M, K)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def states(self, name: str) -> dict:
+        """Треки одного актора в формате TrajectoryAnimator.get_states"""
+        i = self.names.index(name)
+        return {
+            "position": self.position[i],
+            "direction": self.direction[i],
+            "yaw": self.yaw[i],
+        }
+
+    def save(self, filepath: str):
+        """Сохранить в .npz"""
+        np.savez(filepath, names=np.array(self.names), t=self.t,
+                 position=self.position, direction=self.direction, yaw=self.yaw)
+
+    @staticmethod
+    def load(filepath: str) -> "BakedTracks":
+        """Загрузить из .npz"""
+        with np.load(filepath) as data:
+            return BakedTracks(
+                names=[str(name) for name in data["names"]],
+                t=data["t"],
+                position=data["position"],
+                direction=data["direction"],
+                yaw=data["yaw"],
+            )
+
+
+def frame_times(steps: int, start: int = 0, stop: int = None) -> np.ndarray:
+    """
+    Параметры времени кадров — так же, как в AnimationLoop.
+
+    Args:
+        start, stop: диапазон кадров (по умолчанию все); значения совпадают
+            с np.linspace(0, 1, steps)[start:stop] без построения всей сетки
+    """
+    stop = steps if stop is None else stop
+    if steps < 2:
+        return np.zeros(stop - start)
+    t = np.arange(start, stop) * (1.0 / (steps - 1))
+    if stop == steps and stop > start:
+        t[-1] = 1.0
+    return t
+
+
+def bake_scene(animator: TrajectoryAnimator,
+               animation_config: Dict[str, ActorConfigRow],
+               steps: int, cache=None) -> BakedTracks:
+    """
+    Запечь состояния всех акторов на steps кадрах.
+
+    Args:
+        animator: аниматор траектории
+        animation_config: {имя актора: ActorConfigRow} из ActorLoader
+        steps: число кадров
+        cache: DerivedCache — повторный запуск читает треки с диска
+    """
+    if cache is not None:
+        return cached_bake(cache, animator, animation_config, steps)
+
+    t = frame_times(steps)
+    names = list(animation_config)
+
+    position = state_array((len(names), steps, 3))
+    direction = state_array((len(names), steps, 3))
+    yaw = state_array((len(names), steps))
+
+    for i, name in enumerate(names):
+        row = animation_config[name]
+        # локальное время актора по его расписанию (start/duration/mode)
+        local_t = Timing.from_row(row).local_times(t)
+        lateral, vertical = lane_offsets(row)
+        states = animator.get_states(local_t, row.interpolation_type, row.orientation_type,
+                                     lateral=lateral, vertical=vertical)
+        position[i] = states["position"]
+        direction[i] = states["direction"]
+        yaw[i] = states["yaw"]
+
+    tracks = BakedTracks(names=names, t=t, position=position,
+                         direction=direction, yaw=yaw)
+    # колонны: минимальная дистанция между акторами на общем пути
+    apply_convoys(animator, tracks, animation_config)
+    return tracks
+
+
+def cached_bake(cache, animator: TrajectoryAnimator,
+                animation_config: Dict[str, ActorConfigRow],
+                steps: int) -> BakedTracks:
+    """bake_scene через дисковый кэш (ключ — траектория, конфиг, steps)"""
+    return cached_tracks(cache, animator.trajectory, animation_config, steps,
+                         lambda: bake_scene(animator, animation_config, steps))
+
+
+def cached_tracks(cache, trajectory: np.ndarray,
+                  animation_config: Dict[str, ActorConfigRow],
+                  steps: int, compute: Callable[[], BakedTracks]) -> BakedTracks:
+    """
+    Треки из дискового кэша или compute() с записью в кэш.
+
+    Ключ не зависит от способа запекания: bake_scene и bake_scene_parallel
+    дают одинаковый результат и делят записи.
+    """
+    key = cache.key(trajectory, animation_config, steps=steps)
+    fields = ("position", "direction", "yaw")
+    arrays = {name: cache.get(key, name) for name in fields}
+
+    if any(array is None for array in arrays.values()):
+        tracks = compute()
+        with cache.batch():
+            for name in fields:
+                cache.put(key, name, getattr(tracks, name))
+        return tracks
+
+    return BakedTracks(names=list(animation_config), t=frame_times(steps), **arrays)
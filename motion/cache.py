@@ -0,0 +1,308 @@
+"""
+Дисковый кэш производных данных траектории и запечённых треков.
+
+Ключ записи — хэш байтов траектории, конфигурации акторов и «отпечатка»
+кода (версия формата + исходники модулей расчёта и стратегий). Изменение
+любой из частей даёт новый ключ, поэтому устаревшие записи никогда не
+читаются; они удаляются при вытеснении.
+
+Массивы хранятся в .npy и открываются через mmap — перезапуск большой
+сцены не пересчитывает и даже не читает данные целиком.
+
+    cache = DerivedCache("~/.cache/amime", max_bytes=2 << 30)
+    key = cache.key(trajectory)
+    cum_len = cache.get_or_compute(key, "cum_len", lambda: cumulative_lengths(trajectory))
+
+Вытеснение сканирует весь каталог кэша, поэтому серия записей
+оборачивается в `with cache.batch():` — вытеснение один раз в конце.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+# Повышать при изменении формата записей
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 ГБ
+
+
+def _default_root() -> Path:
+    return Path(os.environ.get("AMIME_CACHE_DIR", Path.home() / ".cache" / "amime"))
+
+
+# Модули, от кода которых зависят производные данные и запечённые треки
+FINGERPRINT_MODULES = (
+    "motion.precision",
+    "motion.trajectory",
+    "motion.kinematics",
+    "motion.interpolation_strategies",
+    "motion.animation_math",
+    "motion.lanes",
+    "motion.timeline",
+    "motion.headway",
+    "motion.baking",
+    "motion.parallel_bake",
+)
+
+
+def _source(obj) -> str:
+    """Исходный текст объекта (байткод, если исходника нет)"""
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        code = getattr(obj, "__code__", None)
+        return repr(obj) if code is None else repr((code.co_code, code.co_consts))
+
+
+def code_fingerprint() -> str:
+    """
+    Отпечаток кода, от которого зависят производные данные: исходники
+    модулей FINGERPRINT_MODULES целиком и стратегии, зарегистрированные
+    из других модулей. Любая правка этого кода даёт новый ключ.
+    """
+    from motion.interpolation_strategies import StrategyRegistry
+
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for name in FINGERPRINT_MODULES:
+        h.update(name.encode())
+        h.update(_source(importlib.import_module(name)).encode())
+
+    strategies = {
+        **{f"position.{name}": func
+           for name, func in StrategyRegistry._position_strategies.items()},
+        **{f"orientation.{name}": func
+           for name, func in StrategyRegistry._orientation_strategies.items()},
+    }
+    for name in sorted(strategies):
+        func = strategies[name]
+        h.update(name.encode())
+        # стратегии из FINGERPRINT_MODULES уже учтены исходником модуля
+        if getattr(func, "__module__", None) not in FINGERPRINT_MODULES:
+            h.update(_source(func).encode())
+    return h.hexdigest()[:16]
+
+
+class DerivedCache:
+    """Контентно-адресуемый кэш массивов с вытеснением по размеру (LRU)"""
+
+    def __init__(self, root=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root).expanduser() if root else _default_root()
+        self.max_bytes = max_bytes
+        self.fingerprint = code_fingerprint()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._batch = 0
+
+    # --------------------------------------------------------
+    # Ключи
+    # --------------------------------------------------------
+
+    def key(self, trajectory: np.ndarray, config: Dict = None, **params) -> str:
+        """
+        Ключ записи.
+
+        Args:
+            trajectory: траектория (N, 3)
+            config: {имя актора: ActorConfigRow} — для запечённых треков
+            **params: прочие параметры (steps и т.п.)
+        """
+        trajectory = np.ascontiguousarray(trajectory)
+        h = hashlib.sha256(self.fingerprint.encode())
+        h.update(f"{trajectory.dtype.str}{trajectory.shape}".encode())
+        h.update(trajectory.tobytes())
+
+        if config:
+            rows = {name: row.to_dict() for name, row in config.items()}
+            h.update(json.dumps(rows, sort_keys=True, default=str).encode())
+        if params:
+            h.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    # --------------------------------------------------------
+    # Чтение / запись
+    # --------------------------------------------------------
+
+    def get(self, key: str, name: str):
+        """Массив из кэша (memory-mapped, только чтение) или None"""
+        path = self._entry(key) / f"{name}.npy"
+        try:
+            array = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # отметка использования для LRU
+        os.utime(self._entry(key))
+        return array
+
+    def put(self, key: str, name: str, array: np.ndarray):
+        """Атомарно записать массив и при необходимости вытеснить старое (вне batch)"""
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+
+        meta = entry / "meta.json"
+        if not meta.exists():
+            meta.write_text(json.dumps({"fingerprint": self.fingerprint,
+                                        "created": time.time()}))
+
+        fd, tmp = tempfile.mkstemp(dir=entry, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp, entry / f"{name}.npy")
+
+        if not self._batch:
+            self.evict()
+
+    @contextmanager
+    def batch(self):
+        """Серия записей: вытеснение один раз в конце, а не после каждого put"""
+        self._batch += 1
+        try:
+            yield self
+        finally:
+            self._batch -= 1
+            if not self._batch:
+                self.evict()
+
+    def get_or_compute(self, key: str, name: str, compute: Callable[[], np.ndarray]):
+        """Прочитать из кэша или вычислить и сохранить"""
+        array = self.get(key, name)
+        if array is None:
+            array = np.asarray(compute())
+            self.put(key, name, array)
+        return array
+
+    # --------------------------------------------------------
+    # Обслуживание
+    # --------------------------------------------------------
+
+    def _entries(self):
+        return [p for p in self.root.glob("??/*") if p.is_dir()]
+
+    @staticmethod
+    def _size(entry: Path) -> int:
+        return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+    def prune_stale(self) -> int:
+        """Удалить записи, созданные другой версией кода. Возвращает их число"""
+        removed = 0
+        for entry in self._entries():
+            try:
+                meta = json.loads((entry / "meta.json").read_text())
+            except (FileNotFoundError, ValueError):
+                meta = {}
+            if meta.get("fingerprint") != self.fingerprint:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def evict(self):
+        """Вытеснить давно не использованные записи сверх max_bytes"""
+        entries = [(e.stat().st_mtime, self._size(e), e) for e in self._entries()]
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def size(self) -> int:
+        """Суммарный размер кэша (байт)"""
+        return sum(self._size(e) for e in self._entries())
+
+    def clear(self):
+        """Удалить все записи"""
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    # --------------------------------------------------------
+    # Готовые наборы производных данных
+    # --------------------------------------------------------
+
+    def trajectory_tables(self, trajectory: np.ndarray) -> Dict[str, np.ndarray]:
+        """Накопленные длины, направления сегментов и полная длина пути"""
+        from motion.trajectory import cumulative_lengths, interpolate_orientation, polyline_length
+
+        key = self.key(trajectory)
+        with self.batch():
+            return {
+                "cum_len": self.get_or_compute(key, "cum_len",
+                                               lambda: cumulative_lengths(trajectory)),
+                "directions": self.get_or_compute(key, "directions",
+                                                  lambda: interpolate_orientation(trajectory)),
+                # та же сумма, что без кэша (не cum_len[-1]: порядок сложения другой);
+                # массив (1,) — mmap не открывает 0-мерные
+                "total_len": self.get_or_compute(key, "total_len",
+                                                 lambda: [polyline_length(trajectory)]),
+            }
+
+    def strategy_tables(self, trajectory: np.ndarray) -> "StrategyTables":
+        """strategy_cache аниматора с коэффициентами стратегий на диске"""
+        return StrategyTables(self, self.key(trajectory))
+
+
+def _spline_from_arrays(knots: np.ndarray, coeffs: np.ndarray):
+    from motion.kinematics import SplinePath
+    return SplinePath.from_coefficients(knots, coeffs)
+
+
+# Предвычисления стратегий, которые хранятся на диске:
+# имя в strategy_cache -> (имена массивов, в массивы, из массивов)
+PERSISTENT_STRATEGY_TABLES = {
+    "catmull_rom": (("catmull_rom",),
+                    lambda coeffs: (coeffs,),
+                    lambda coeffs: coeffs),
+    "spline": (("spline_knots", "spline_coeffs"),
+               lambda spline: (spline.knots, spline.coeffs),
+               _spline_from_arrays),
+}
+
+
+class StrategyTables(dict):
+    """
+    strategy_cache аниматора, связанный с DerivedCache.
+
+    Стратегии работают с ним как с обычным словарём. Записи из
+    PERSISTENT_STRATEGY_TABLES читаются с диска при первой проверке
+    `name in cache` и сохраняются на диск при записи. Остальные
+    (полосы и т.п.) живут только в памяти.
+    """
+
+    def __init__(self, cache: DerivedCache, key: str):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+
+    def _load(self, name: str):
+        names, _, from_arrays = PERSISTENT_STRATEGY_TABLES[name]
+        arrays = [self.cache.get(self.key, array) for array in names]
+        if any(array is None for array in arrays):
+            return None
+        return from_arrays(*arrays)
+
+    def __contains__(self, name) -> bool:
+        if not dict.__contains__(self, name) and name in PERSISTENT_STRATEGY_TABLES:
+            value = self._load(name)
+            if value is not None:
+                dict.__setitem__(self, name, value)
+        return dict.__contains__(self, name)
+
+    def __setitem__(self, name, value):
+        dict.__setitem__(self, name, value)
+        if name in PERSISTENT_STRATEGY_TABLES:
+            names, to_arrays, _ = PERSISTENT_STRATEGY_TABLES[name]
+            with self.cache.batch():
+                for array, data in zip(names, to_arrays(value)):
+                    self.cache.put(self.key, array, data)
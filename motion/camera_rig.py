@@ -0,0 +1,255 @@
+"""
+Камерный риг: заранее рассчитанные треки камеры (Follow, Ambush, FastOrbit).
+
+Трек камеры целиком вычисляется векторно по запечённым состояниям актора
+(позиции, направления, длина дуги s). В цикле анимации остаётся только
+выборка строки из таблицы и запись в plotter.camera.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from motion.trajectory import cumulative_lengths, interpolate_positions_by_length
+from motion.constants import FRAME_DELAY
+
+UP = np.array([0.0, 0.0, 1.0])
+
+
+# ============================================================
+# СГЛАЖИВАНИЕ
+# ============================================================
+
+def critically_damped_smooth(values: np.ndarray, dt: float, omega: float) -> np.ndarray:
+    """
+    Критически демпфированная пружина, тянущаяся к values[k].
+
+    Используется точное решение на шаге dt (цель постоянна внутри шага),
+    поэтому результат устойчив при любых dt и omega.
+
+    Args:
+        values: np.ndarray, shape (K, ...) — целевые значения по кадрам
+        dt: шаг по времени между кадрами (сек)
+        omega: собственная частота пружины (1/сек), 0 — без сглаживания
+
+    Returns:
+        np.ndarray той же формы — сглаженные значения
+    """
+    values = np.asarray(values, dtype=float)
+    if omega <= 0 or len(values) < 2:
+        return values.copy()
+
+    decay = np.exp(-omega * dt)
+    out = np.empty_like(values)
+    x = values[0].copy()
+    v = np.zeros_like(x)
+    out[0] = x
+
+    # Рекуррентность по кадрам, векторная по всем остальным осям
+    for k in range(1, len(values)):
+        y = x - values[k]
+        tmp = (v + omega * y) * dt
+        v = (v - omega * tmp) * decay
+        x = values[k] + (y + tmp) * decay
+        out[k] = x
+
+    return out
+
+
+def _horizontal(directions: np.ndarray) -> np.ndarray:
+    """Горизонтальная проекция направлений (для камеры без крена)"""
+    flat = directions.copy()
+    flat[:, 2] = 0.0
+    norms = np.linalg.norm(flat, axis=1, keepdims=True)
+    # вертикальное движение — оставляем ось X
+    flat[norms[:, 0] < 1e-9] = [1.0, 0.0, 0.0]
+    norms = np.where(norms < 1e-9, 1.0, norms)
+    return flat / norms
+
+
+# ============================================================
+# ТРЕК КАМЕРЫ
+# ============================================================
+
+@dataclass
+class CameraTrack:
+    """Покадровые позы камеры"""
+    position: np.ndarray     # (K, 3)
+    focal_point: np.ndarray  # (K, 3)
+    up: np.ndarray           # (K, 3)
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def frame_index(self, t: float) -> int:
+        """Индекс кадра для параметра времени t [0, 1]"""
+        return int(round(float(np.clip(t, 0.0, 1.0)) * (len(self) - 1)))
+
+    def pose(self, frame: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Поза камеры (position, focal_point, up) в кадре frame"""
+        return self.position[frame], self.focal_point[frame], self.up[frame]
+
+    def apply(self, camera, frame: int):
+        """Записать позу в камеру PyVista"""
+        camera.position = tuple(self.position[frame])
+        camera.focal_point = tuple(self.focal_point[frame])
+        camera.up = tuple(self.up[frame])
+
+
+def follow_track(positions: np.ndarray, directions: np.ndarray, s: np.ndarray,
+                 trajectory: np.ndarray, distance: float = 1.5,
+                 height: float = 0.7, look_ahead: float = 0.5,
+                 omega: float = 6.0, dt: float = FRAME_DELAY,
+                 cum_len: np.ndarray = None) -> CameraTrack:
+    """
+    Follow: камера позади и выше актора, смотрит вперёд по траектории.
+
+    Args:
+        positions: (K, 3) позиции актора
+        directions: (K, 3) направления движения
+        s: (K,) длина дуги актора по кадрам
+        trajectory: (N, 3) траектория
+        distance: отставание камеры от актора
+        height: высота камеры над актором
+        look_ahead: насколько вперёд по длине дуги смотрит камера
+        omega: жёсткость сглаживания (0 — без сглаживания)
+        dt: шаг между кадрами
+    """
+    if cum_len is None:
+        cum_len = cumulative_lengths(trajectory)
+
+    back = _horizontal(np.asarray(directions, dtype=float))
+    cam = positions - distance * back + height * UP
+    focal = interpolate_positions_by_length(trajectory, np.asarray(s) + look_ahead, cum_len)
+
+    return CameraTrack(
+        position=critically_damped_smooth(cam, dt, omega),
+        focal_point=critically_damped_smooth(focal, dt, omega),
+        up=np.broadcast_to(UP, cam.shape).copy(),
+    )
+
+
+def orbit_track(positions: np.ndarray, radius: float = 2.0, height: float = 1.0,
+                revolutions: float = 2.0, phase: float = 0.0,
+                omega: float = 0.0, dt: float = FRAME_DELAY) -> CameraTrack:
+    """
+    FastOrbit: камера облетает актора по окружности.
+
+    Args:
+        positions: (K, 3) позиции актора
+        radius: радиус облёта
+        height: высота над актором
+        revolutions: число оборотов за весь трек
+        phase: начальный угол (рад)
+    """
+    positions = np.asarray(positions, dtype=float)
+    angle = phase + 2 * np.pi * revolutions * np.linspace(0.0, 1.0, len(positions))
+
+    offset = np.stack([radius * np.cos(angle),
+                       radius * np.sin(angle),
+                       np.full_like(angle, height)], axis=1)
+
+    return CameraTrack(
+        position=critically_damped_smooth(positions + offset, dt, omega),
+        focal_point=critically_damped_smooth(positions, dt, omega),
+        up=np.broadcast_to(UP, positions.shape).copy(),
+    )
+
+
+def ambush_track(positions: np.ndarray, s: np.ndarray, trajectory: np.ndarray,
+                 spacing: float = 2.0, side: float = 1.0, height: float = 0.5,
+                 omega: float = 0.0, dt: float = FRAME_DELAY,
+                 cum_len: np.ndarray = None) -> CameraTrack:
+    """
+    Ambush: камера ждёт актора в точке впереди по пути и провожает его взглядом.
+    Когда актор проходит точку засады, камера переставляется в следующую.
+
+    Args:
+        positions: (K, 3) позиции актора
+        s: (K,) длина дуги актора по кадрам
+        trajectory: (N, 3) траектория
+        spacing: расстояние между точками засады по длине дуги
+        side: боковое смещение от пути
+        height: высота камеры
+    """
+    if cum_len is None:
+        cum_len = cumulative_lengths(trajectory)
+
+    s = np.asarray(s, dtype=float)
+    station = np.minimum((np.floor(s / spacing) + 1) * spacing, cum_len[-1])
+
+    # Боковое направление в точке засады — по локальной касательной пути
+    p0 = interpolate_positions_by_length(trajectory, station - 1e-3, cum_len)
+    p1 = interpolate_positions_by_length(trajectory, station, cum_len)
+    lateral = np.cross(UP, _horizontal(p1 - p0))
+
+    cam = p1 + side * lateral + height * UP
+
+    return CameraTrack(
+        position=critically_damped_smooth(cam, dt, omega),
+        focal_point=critically_damped_smooth(np.asarray(positions, dtype=float), dt, omega),
+        up=np.broadcast_to(UP, cam.shape).copy(),
+    )
+
+
+# ============================================================
+# РИГ: несколько камер (вьюпортов) одновременно
+# ============================================================
+
+@dataclass
+class Viewport:
+    """Трек камеры, привязанный к рендереру (subplot) плоттера"""
+    track: CameraTrack
+    renderer_index: int = 0
+
+
+@dataclass
+class CameraRig:
+    """Набор вьюпортов с заранее рассчитанными треками"""
+    viewports: List[Viewport] = field(default_factory=list)
+
+    _behaviors = {
+        "follow": follow_track,
+        "orbit": orbit_track,
+        "ambush": ambush_track,
+    }
+
+    def add_track(self, track: CameraTrack, renderer_index: int = 0) -> "CameraRig":
+        """Добавить готовый трек (для chaining)"""
+        self.viewports.append(Viewport(track, renderer_index))
+        return self
+
+    def add_behavior(self, behavior: str, states: dict, trajectory: np.ndarray,
+                     renderer_index: int = 0, **params) -> "CameraRig":
+        """
+        Рассчитать трек по запечённым состояниям актора и добавить его.
+
+        Args:
+            behavior: "follow", "orbit" или "ambush"
+            states: dict из TrajectoryAnimator.get_states
+            trajectory: траектория
+            **params: параметры поведения
+        """
+        if behavior not in self._behaviors:
+            raise ValueError(
+                f"Unknown camera behavior: {behavior}. "
+                f"Available: {list(self._behaviors.keys())}"
+            )
+
+        if behavior == "follow":
+            track = follow_track(states["position"], states["direction"],
+                                 states["s"], trajectory, **params)
+        elif behavior == "ambush":
+            track = ambush_track(states["position"], states["s"], trajectory, **params)
+        else:
+            track = orbit_track(states["position"], **params)
+
+        return self.add_track(track, renderer_index)
+
+    def apply(self, plotter, t: float):
+        """Выставить все камеры для параметра времени t [0, 1]"""
+        for viewport in self.viewports:
+            track = viewport.track
+            camera = plotter.renderers[viewport.renderer_index].camera
+            track.apply(camera, track.frame_index(t))
@@ -0,0 +1,247 @@
+"""
+Запекание по частям с ограниченной памятью.
+
+bake_scene держит в памяти все акторы × все кадры × 7 чисел. Для
+многочасовых сцен это невозможно. iter_bake выдаёт кадры кусками
+фиксированного размера. Размер куска выбирается по бюджету памяти и не
+зависит от длины сцены. Потребители (writers) получают куски по мере
+расчёта:
+
+    NpyTrackWriter  — каталог .npy через open_memmap (дописывание по кадрам)
+    NpzTrackWriter  — файл треков .npz (формат BakedTracks.save)
+    RenderWriter    — отрисовка кадров визуализатором (и скриншоты)
+    publish_chunks  — рассылка кадров клиентам StateStreamServer
+
+Результат совпадает с bake_scene: локальное время по таймлайну, смещения
+полос и колонны (порядок колонны переносится между кусками).
+"""
+
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.animation_math import TrajectoryAnimator
+from motion.baking import BakedTracks, frame_times
+from motion.headway import apply_convoys
+from motion.lanes import lane_offsets
+from motion.precision import get_dtype, state_array
+from motion.timeline import Timing
+
+# position(3), direction(3), yaw
+STATE_FIELDS = 7
+DEFAULT_CHUNK_BYTES = 64 << 20
+TRACK_FIELDS = ("position", "direction", "yaw")
+
+
+@dataclass
+class BakeChunk:
+    """Кусок запечённых кадров [start, start + len(tracks.t))"""
+    start: int
+    tracks: BakedTracks
+
+    @property
+    def stop(self) -> int:
+        return self.start + len(self.tracks.t)
+
+
+def frames_per_chunk(n_actors: int, max_bytes: int = DEFAULT_CHUNK_BYTES) -> int:
+    """Сколько кадров помещается в бюджет буфера состояний"""
+    frame_bytes = max(n_actors, 1) * STATE_FIELDS * np.dtype(get_dtype()).itemsize
+    return max(1, int(max_bytes) // frame_bytes)
+
+
+def iter_bake(animator: TrajectoryAnimator,
+              animation_config: Dict[str, ActorConfigRow],
+              steps: int,
+              max_bytes: int = DEFAULT_CHUNK_BYTES,
+              chunk_frames: int = None) -> Iterator[BakeChunk]:
+    """
+    Запекать сцену кусками кадров.
+
+    Args:
+        animator: аниматор траектории
+        animation_config: {имя актора: ActorConfigRow}
+        steps: число кадров всей сцены
+        max_bytes: бюджет буфера состояний одного куска (временные массивы
+            стратегий того же порядка — пик памяти в несколько раз больше,
+            но от числа кадров сцены не зависит)
+        chunk_frames: размер куска в кадрах (вместо max_bytes)
+
+    Yields:
+        BakeChunk; буферы каждого куска новые, их можно хранить
+    """
+    names = list(animation_config)
+    rows = [animation_config[name] for name in names]
+    timings = [Timing.from_row(row) for row in rows]
+    offsets = [lane_offsets(row) for row in rows]
+    chunk_frames = chunk_frames or frames_per_chunk(len(names), max_bytes)
+    solvers = {}
+
+    for start in range(0, steps, chunk_frames):
+        stop = min(start + chunk_frames, steps)
+        t = frame_times(steps, start, stop)
+
+        position = state_array((len(names), len(t), 3))
+        direction = state_array((len(names), len(t), 3))
+        yaw = state_array((len(names), len(t)))
+        for i, row in enumerate(rows):
+            lateral, vertical = offsets[i]
+            states = animator.get_states(timings[i].local_times(t), row.interpolation_type,
+                                         row.orientation_type,
+                                         lateral=lateral, vertical=vertical)
+            position[i] = states["position"]
+            direction[i] = states["direction"]
+            yaw[i] = states["yaw"]
+
+        tracks = BakedTracks(names=names, t=t, position=position,
+                             direction=direction, yaw=yaw)
+        apply_convoys(animator, tracks, animation_config, solvers)
+        yield BakeChunk(start, tracks)
+
+
+def write_chunks(chunks: Iterator[BakeChunk], *writers) -> int:
+    """
+    Передать куски всем writers и закрыть их.
+
+    Returns:
+        число записанных кадров
+    """
+    frames = 0
+    try:
+        for chunk in chunks:
+            for writer in writers:
+                writer.write(chunk)
+            frames = chunk.stop
+    finally:
+        for writer in writers:
+            writer.close()
+    return frames
+
+
+# ============================================================
+# ПОТРЕБИТЕЛИ
+# ============================================================
+
+class NpyTrackWriter:
+    """
+    Каталог .npy (names, t, position, direction, yaw) в раскладке
+    BakedTracks; массивы открыты через open_memmap и заполняются по кускам.
+    """
+
+    def __init__(self, directory, names: List[str], steps: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        np.save(self.directory / "names.npy", np.array(names))
+
+        m = len(names)
+        shapes = {"t": (steps,), "position": (m, steps, 3),
+                  "direction": (m, steps, 3), "yaw": (m, steps)}
+        self.arrays = {
+            field: np.lib.format.open_memmap(
+                self.directory / f"{field}.npy", mode="w+",
+                dtype=float if field == "t" else get_dtype(), shape=shape)
+            for field, shape in shapes.items()
+        }
+
+    def write(self, chunk: BakeChunk):
+        frames = slice(chunk.start, chunk.stop)
+        self.arrays["t"][frames] = chunk.tracks.t
+        for field in TRACK_FIELDS:
+            self.arrays[field][:, frames] = getattr(chunk.tracks, field)
+
+    def close(self):
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+
+
+def load_track_dir(directory, mmap_mode: str = "r") -> BakedTracks:
+    """Треки из каталога NpyTrackWriter (массивы отображаются с диска)"""
+    directory = Path(directory)
+    fields = {field: np.load(directory / f"{field}.npy", mmap_mode=mmap_mode)
+              for field in ("t",) + TRACK_FIELDS}
+    names = [str(name) for name in np.load(directory / "names.npy")]
+    return BakedTracks(names=names, **fields)
+
+
+class NpzTrackWriter:
+    """
+    Файл треков .npz (читается BakedTracks.load). Куски копятся во
+    временном каталоге .npy на диске; при закрытии архив пишется из
+    отображённых массивов буферами NumPy, без загрузки в память.
+    """
+
+    def __init__(self, filepath, names: List[str], steps: int, tmp_dir=None):
+        self.filepath = filepath
+        self._tmp = tempfile.TemporaryDirectory(prefix="amime_bake_", dir=tmp_dir)
+        self._npy = NpyTrackWriter(self._tmp.name, names, steps)
+
+    def write(self, chunk: BakeChunk):
+        self._npy.write(chunk)
+
+    def close(self):
+        self._npy.close()
+        try:
+            load_track_dir(self._tmp.name).save(self.filepath)
+        finally:
+            self._tmp.cleanup()
+
+
+class RenderWriter:
+    """Показ кадров кусков в TrajectoryVisualizer (и скриншоты в PNG)"""
+
+    def __init__(self, visualizer, out_dir=None, every: int = 1):
+        """
+        Args:
+            visualizer: визуализатор с акторами тех же имён
+            out_dir: каталог для frame_00000.png (None — только отрисовка)
+            every: показывать каждый n-й кадр
+        """
+        self.visualizer = visualizer
+        self.out_dir = out_dir
+        self.every = every
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, chunk: BakeChunk):
+        tracks = chunk.tracks
+        first = -chunk.start % self.every
+        for k in range(first, len(tracks.t), self.every):
+            self.visualizer.apply_arrays(tracks.names, tracks.position[:, k],
+                                         tracks.yaw[:, k], tracks.direction[:, k])
+            self.visualizer.plotter.render()
+            if self.out_dir is not None:
+                path = os.path.join(self.out_dir, f"frame_{chunk.start + k:05d}.png")
+                self.visualizer.plotter.screenshot(path)
+
+    def close(self):
+        pass
+
+
+async def publish_chunks(server, chunks: Iterator[BakeChunk], frame_delay: float = 0.0):
+    """
+    Рассылать кадры кусков через StateStreamServer.
+
+    Args:
+        frame_delay: интервал между кадрами (0 — так быстро, как считается;
+            медленные клиенты всё равно получают только свежие кадры)
+
+    Следующий кусок считается в потоке, пока рассылается текущий, поэтому
+    в памяти одновременно два куска.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = iter(chunks)
+    pending = loop.run_in_executor(None, next, chunks, None)
+    while (chunk := await pending) is not None:
+        pending = loop.run_in_executor(None, next, chunks, None)
+        tracks = chunk.tracks
+        for k in range(len(tracks.t)):
+            server.publish(tracks.names, tracks.position[:, k], tracks.direction[:, k],
+                           frame=chunk.start + k)
+            await asyncio.sleep(frame_delay)
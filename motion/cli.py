@@ -0,0 +1,246 @@
+"""
+Консольная точка входа `amime` для пакетной работы без окна.
+
+    amime bake   TRAJECTORY CONFIG --steps 150 --out tracks.npz
+    amime bake   TRAJECTORY CONFIG --steps 10000000 --max-memory 256
+    amime stats  TRAJECTORY [CONFIG] --steps 150
+    amime render TRAJECTORY CONFIG --out frames/ --steps 150
+    amime analyze PATHS_DIR_OR_NPZ --out report.csv --workers 0
+    amime bench  [-- аргументы benchmarks.run]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from motion.constants import ARROW_SCALE, SPHERE_RADIUS, STEPS
+
+GLOBAL_CONFIG = {
+    "sphere_radius": SPHERE_RADIUS,
+    "arrow_scale": ARROW_SCALE,
+}
+
+
+def _load_scene(args):
+    """Траектория + конфигурация акторов из аргументов"""
+    from motion.trajectory_io import load_trajectory
+    from motion.actor_loader import ActorLoader
+
+    trajectory = load_trajectory(args.trajectory)
+    # загрузчик печатает служебную информацию — не смешиваем её с выводом команды
+    with contextlib.redirect_stdout(sys.stderr):
+        _, animation_config = ActorLoader.load(args.config, GLOBAL_CONFIG)
+    return trajectory, animation_config
+
+
+# ============================================================
+# КОМАНДЫ
+# ============================================================
+
+def cmd_bake(args) -> int:
+    """Запечь треки всех акторов в .npz"""
+    if args.max_memory and (args.workers != 1 or args.cache_dir):
+        # запекание по частям идёт в одном процессе и мимо кэша
+        print("amime bake: --max-memory cannot be combined with --workers or --cache-dir",
+              file=sys.stderr)
+        return 2
+
+    trajectory, animation_config = _load_scene(args)
+
+    cache = None
+    if args.cache_dir:
+        from motion.cache import DerivedCache
+        cache = DerivedCache(args.cache_dir, max_bytes=int(args.cache_size * (1 << 20)))
+
+    if args.max_memory:
+        from motion.animation_math import TrajectoryAnimator
+        from motion.chunked_bake import NpzTrackWriter, iter_bake, write_chunks
+        chunks = iter_bake(TrajectoryAnimator(trajectory), animation_config, args.steps,
+                           max_bytes=int(args.max_memory * (1 << 20)))
+        write_chunks(chunks, NpzTrackWriter(args.out, list(animation_config), args.steps))
+        print(f"Baked {len(animation_config)} actors x {args.steps} frames -> {args.out}")
+        return 0
+
+    if args.workers == 1:
+        from motion.animation_math import TrajectoryAnimator
+        from motion.baking import bake_scene
+        tracks = bake_scene(TrajectoryAnimator(trajectory, cache=cache), animation_config,
+                            args.steps, cache=cache)
+    else:
+        from motion.parallel_bake import bake_scene_parallel
+        tracks = bake_scene_parallel(trajectory, animation_config, args.steps,
+                                     workers=args.workers, cache=cache)
+
+    tracks.save(args.out)
+    print(f"Baked {len(tracks)} actors x {args.steps} frames -> {args.out}")
+    return 0
+
+
+def trajectory_stats(trajectory: np.ndarray) -> dict:
+    """Кинематические характеристики траектории"""
+    from motion.kinematics import curvature
+    from motion.trajectory import polyline_length
+
+    seg = np.linalg.norm(np.diff(trajectory, axis=0), axis=1)
+    k = curvature(trajectory)
+    k_max = float(k.max()) if len(k) else 0.0
+
+    return {
+        "points": int(len(trajectory)),
+        "length": polyline_length(trajectory),
+        "segment_min": float(seg.min()),
+        "segment_mean": float(seg.mean()),
+        "segment_max": float(seg.max()),
+        "degenerate_segments": int(np.count_nonzero(seg == 0)),
+        "curvature_max": k_max,
+        "radius_min": 1.0 / k_max if k_max > 0 else float("inf"),
+    }
+
+
+def actor_stats(tracks) -> dict:
+    """Скорость и угловая скорость по запечённым трекам (на кадр)"""
+    speed = np.linalg.norm(np.diff(tracks.position, axis=1), axis=2)
+    yaw_rate = np.abs((np.diff(tracks.yaw, axis=1) + 180.0) % 360.0 - 180.0)
+    return {
+        name: {
+            "distance": float(speed[i].sum()),
+            "speed_max": float(speed[i].max()),
+            "yaw_rate_max_deg": float(yaw_rate[i].max()),
+        }
+        for i, name in enumerate(tracks.names)
+    }
+
+
+def cmd_stats(args) -> int:
+    """Кинематическая статистика траектории (и акторов, если задан конфиг)"""
+    from motion.trajectory_io import load_trajectory
+
+    trajectory = load_trajectory(args.trajectory)
+    report = {"trajectory": trajectory_stats(trajectory)}
+
+    if args.config:
+        from motion.animation_math import TrajectoryAnimator
+        from motion.baking import bake_scene
+
+        _, animation_config = _load_scene(args)
+        tracks = bake_scene(TrajectoryAnimator(trajectory), animation_config, args.steps)
+        report["actors"] = actor_stats(tracks)
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+def cmd_render(args) -> int:
+    """Отрисовать кадры без окна в PNG"""
+    from motion.animation_setup import AnimationSetup
+    from motion.trajectory_io import load_trajectory
+
+    trajectory = load_trajectory(args.trajectory)
+    setup = AnimationSetup(trajectory, GLOBAL_CONFIG, args.config, off_screen=True)
+    current_t = setup.get_current_t_dict()
+    with contextlib.redirect_stdout(sys.stderr):
+        visualizer, _, _ = setup.setup()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    frames = range(0, args.steps, args.every)
+    for i in frames:
+        current_t["value"] = i / max(args.steps - 1, 1)
+        visualizer.update_all_actors()
+        visualizer.plotter.render()
+        visualizer.plotter.screenshot(str(out_dir / f"frame_{i:05d}.png"))
+
+    visualizer.plotter.close()
+    print(f"Rendered {len(frames)} frames -> {out_dir}")
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    """Пакетный анализ каталога траекторий или упакованного .npz"""
+    from motion.path_analysis import analyze_source, save_report
+
+    names, columns = analyze_source(args.source, workers=args.workers,
+                                    percentiles=args.percentiles)
+    save_report(args.out, names, columns)
+    for name, error in zip(names, columns.get("error", ())):
+        if error:
+            print(f"{name}: {error}", file=sys.stderr)
+    print(f"Analyzed {len(names)} trajectories -> {args.out}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Запустить набор бенчмарков"""
+    from benchmarks.run import main as bench_main
+    rest = args.bench_args
+    if rest and rest[0] == "--":
+        rest = rest[1:]
+    return bench_main(rest)
+
+
+# ============================================================
+# ПАРСЕР
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="amime", description="Amime headless tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bake = sub.add_parser("bake", help="bake actor tracks to .npz")
+    bake.add_argument("trajectory", help="файл траектории (.npy/.npz/.csv/.tsv/.txt)")
+    bake.add_argument("config", help="конфигурация акторов (.json/.tsv)")
+    bake.add_argument("--steps", type=int, default=STEPS)
+    bake.add_argument("--out", default="tracks.npz")
+    bake.add_argument("--workers", type=int, default=1,
+                      help="число процессов (0 — по числу ядер)")
+    bake.add_argument("--cache-dir", help="каталог дискового кэша производных данных")
+    bake.add_argument("--cache-size", type=float, default=1024,
+                      help="максимальный размер кэша (МБ)")
+    bake.add_argument("--max-memory", type=float,
+                      help="запекать по частям: бюджет буфера кадров (МБ); "
+                           "без --workers и --cache-dir")
+    bake.set_defaults(func=cmd_bake)
+
+    stats = sub.add_parser("stats", help="kinematic statistics as JSON")
+    stats.add_argument("trajectory")
+    stats.add_argument("config", nargs="?")
+    stats.add_argument("--steps", type=int, default=STEPS)
+    stats.set_defaults(func=cmd_stats)
+
+    render = sub.add_parser("render", help="render frames off-screen to PNG")
+    render.add_argument("trajectory")
+    render.add_argument("config")
+    render.add_argument("--steps", type=int, default=STEPS)
+    render.add_argument("--every", type=int, default=1, help="сохранять каждый n-й кадр")
+    render.add_argument("--out", default="frames")
+    render.set_defaults(func=cmd_render)
+
+    analyze = sub.add_parser("analyze", help="batch kinematic report over many trajectories")
+    analyze.add_argument("source", help="каталог траекторий или упакованный .npz")
+    analyze.add_argument("--out", default="report.csv", help="таблица .csv или .npz")
+    analyze.add_argument("--workers", type=int, default=1,
+                         help="число процессов (0 — по числу ядер)")
+    analyze.add_argument("--percentiles", type=float, nargs="+", default=[50, 90, 99],
+                         help="перцентили кривизны")
+    analyze.set_defaults(func=cmd_analyze)
+
+    bench = sub.add_parser("bench", help="run the benchmark suite")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
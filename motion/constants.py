@@ -10,7 +10,7 @@ TRAJECTORY = np.array([
     [2, 1, 0],
     [3, 1, 0],
     [3, 3, 0],
-])
+], dtype=float)
 
 ARROW_SCALE = 0.3
 SPHERE_RADIUS = 0.12
@@ -0,0 +1,108 @@
+"""
+Двойная буферизация состояний акторов.
+
+Рабочий поток считает кадр k+1 в задний буфер, пока главный поток рисует
+кадр k из переднего. На границе кадров буферы меняются местами. Тяжёлые
+пакетные операции NumPy отпускают GIL, поэтому вычисления перекрываются
+с рендерингом VTK.
+"""
+
+import threading
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from motion.visualization import ActorState
+from motion.precision import get_dtype
+
+
+class StateBuffer:
+    """Состояния всех акторов одного кадра в виде массивов"""
+
+    def __init__(self, names: List[str] = None):
+        self.t = 0.0
+        self._allocate(list(names or []))
+
+    def _allocate(self, names: List[str]):
+        self.names = names
+        self.position = np.zeros((len(names), 3), dtype=get_dtype())
+        self.yaw = np.zeros(len(names), dtype=get_dtype())
+        self.direction = np.zeros((len(names), 3), dtype=get_dtype())
+        self.direction[:, 0] = 1.0
+
+    def fill(self, t: float, states: Dict[str, ActorState]):
+        """Записать состояния кадра (набор акторов может меняться)"""
+        if list(states) != self.names:
+            self._allocate(list(states))
+
+        self.t = t
+        for i, state in enumerate(states.values()):
+            self.position[i] = state.position
+            self.yaw[i] = state.yaw
+            if state.direction is not None:
+                self.direction[i] = state.direction
+            else:
+                yaw = np.radians(state.yaw)
+                self.direction[i] = (np.cos(yaw), np.sin(yaw), 0.0)
+
+
+class DoubleBuffer:
+    """Передний/задний буферы и рабочий поток, заполняющий задний"""
+
+    def __init__(self, compute: Callable[[float], Dict[str, ActorState]]):
+        """
+        Args:
+            compute: функция t -> {имя актора: ActorState}
+        """
+        self.compute = compute
+        self.buffers = [StateBuffer(), StateBuffer()]
+        self._front = 0
+
+        self._next_t = None
+        self._error = None
+        self._stop = False
+        self._request = threading.Event()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="state-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def front(self) -> StateBuffer:
+        return self.buffers[self._front]
+
+    @property
+    def back(self) -> StateBuffer:
+        return self.buffers[1 - self._front]
+
+    def prefetch(self, t: float):
+        """Начать расчёт кадра t в задний буфер"""
+        self._next_t = t
+        self._ready.clear()
+        self._request.set()
+
+    def swap(self) -> StateBuffer:
+        """Дождаться заднего буфера и сделать его передним"""
+        self._ready.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        self._front = 1 - self._front
+        return self.front
+
+    def _run(self):
+        while True:
+            self._request.wait()
+            self._request.clear()
+            if self._stop:
+                return
+            try:
+                self.back.fill(self._next_t, self.compute(self._next_t))
+            except Exception as e:
+                self._error = e
+            self._ready.set()
+
+    def close(self):
+        """Остановить рабочий поток"""
+        self._stop = True
+        self._request.set()
+        self._thread.join()
@@ -0,0 +1,171 @@
+"""
+Дистанция между акторами на общей траектории (очередь, как в потоке машин).
+
+Акторы упорядочены по длине дуги s (лидер — первый). Ведомый не может
+подойти к впереди идущему ближе чем на gap. Для упорядоченных желаемых
+положений s_0 >= s_1 >= ... допустимые положения:
+
+    adj_k = min(s_k, adj_{k-1} - gap) = min_{j<=k}(s_j + j·gap) - k·gap
+
+то есть один np.minimum.accumulate на кадр. Порядок хранится между
+кадрами. Без обгонов он не меняется, только ещё не тронувшиеся акторы
+(s = 0) встают в хвост в порядке старта. С обгонами он пересортировывается
+устойчивой сортировкой, которая на почти упорядоченном входе близка к O(M).
+Равные s упорядочиваются по rank (время старта по таймлайну).
+
+Назад очередь упирается в начало пути (s = 0).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.lanes import lane_offsets
+from motion.timeline import Timing
+
+
+class HeadwaySolver:
+    """Соблюдение минимальной дистанции для группы акторов"""
+
+    def __init__(self, gap: float, overtaking: bool = False):
+        """
+        Args:
+            gap: минимальная дистанция по длине дуги
+            overtaking: разрешить обгон (порядок по желаемым s каждый кадр);
+                без обгона ведомые встают в очередь за лидером
+        """
+        if gap < 0:
+            raise ValueError(f"Headway gap must be non-negative: {gap}")
+        self.gap = gap
+        self.overtaking = overtaking
+        self.order = None  # индексы акторов от лидера к замыкающему
+
+    def reset(self):
+        """Забыть порядок (например, состав группы изменился)"""
+        self.order = None
+
+    def solve(self, s: np.ndarray, rank: np.ndarray = None) -> np.ndarray:
+        """
+        Args:
+            s: (M,) желаемые положения акторов
+            rank: (M,) порядок среди равных s (меньше — впереди), например
+                время старта по таймлайну; по умолчанию — порядок акторов
+
+        Returns:
+            (M,) скорректированные положения (в исходном порядке акторов)
+        """
+        s = np.asarray(s, dtype=float)
+        rank = np.zeros(len(s)) if rank is None else np.asarray(rank, dtype=float)
+        if self.order is None or len(self.order) != len(s):
+            self.order = np.lexsort((rank, -s))
+        elif self.overtaking:
+            # почти упорядоченный вход: устойчивая сортировка
+            self.order = self.order[np.lexsort((rank[self.order], -s[self.order]))]
+        else:
+            # ещё не тронувшиеся (s = 0) встают в очередь в порядке rank
+            # за уже тронувшимися, порядок которых не меняется
+            waiting = s[self.order] <= 0
+            if waiting.any():
+                queued = self.order[waiting]
+                self.order = np.concatenate([self.order[~waiting],
+                                             queued[np.argsort(rank[queued], kind="stable")]])
+
+        k = np.arange(len(s)) * self.gap
+        adjusted = np.minimum.accumulate(s[self.order] + k) - k
+
+        out = np.empty_like(s)
+        out[self.order] = np.maximum(adjusted, 0.0)
+        return out
+
+    def solve_frames(self, s: np.ndarray, rank: np.ndarray = None) -> np.ndarray:
+        """
+        Args:
+            s: (M, K) желаемые положения на K кадрах
+            rank: (M,) порядок среди равных s (см. solve)
+
+        Returns:
+            (M, K) скорректированные положения (порядок переносится между кадрами)
+        """
+        s = np.asarray(s, dtype=float)
+        out = np.empty_like(s)
+        for k in range(s.shape[1]):
+            out[:, k] = self.solve(s[:, k], rank)
+        return out
+
+
+class Convoy:
+    """Колонна акторов на одной траектории: s → состояния массивами"""
+
+    def __init__(self, animator, names: List[str], gap: float, overtaking: bool = False):
+        """
+        Args:
+            animator: TrajectoryAnimator общей траектории
+            names: имена акторов колонны
+        """
+        self.animator = animator
+        self.names = list(names)
+        self.solver = HeadwaySolver(gap, overtaking)
+
+    def states(self, s_desired: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Состояния колонны для желаемых s (для TrajectoryVisualizer.apply_arrays).
+
+        Returns:
+            dict с массивами s (M,), position (M, 3), direction (M, 3), yaw (M,)
+        """
+        return self.animator.states_at_lengths(self.solver.solve(s_desired))
+
+
+# ============================================================
+# ЗАПЕКАНИЕ
+# ============================================================
+
+def convoy_groups(animation_config: Dict[str, ActorConfigRow]) -> Dict[str, List[str]]:
+    """Акторы с полем extra "convoy", сгруппированные по id колонны"""
+    groups: Dict[str, List[str]] = {}
+    for name, row in animation_config.items():
+        convoy = row.extra.get("convoy")
+        if convoy not in (None, ""):
+            groups.setdefault(str(convoy), []).append(name)
+    return groups
+
+
+def apply_convoys(animator, tracks, animation_config: Dict[str, ActorConfigRow],
+                  solvers: Dict[str, HeadwaySolver] = None):
+    """
+    Скорректировать запечённые треки колонн (на месте).
+
+    Дистанция колонны — поле extra "headway" (наибольшее среди её акторов).
+    Зажатые кадры пересчитываются стратегиями и полосой самого актора
+    в момент, когда его стратегия позиции проходит скорректированное s.
+
+    Args:
+        solvers: {id колонны: HeadwaySolver} — передаётся между кусками
+            кадров при запекании по частям, чтобы порядок колонны сохранялся
+    """
+    solvers = {} if solvers is None else solvers
+    for convoy, names in convoy_groups(animation_config).items():
+        rows = [animation_config[name] for name in names]
+        if convoy not in solvers:
+            gap = max(float(row.extra.get("headway") or 0.0) for row in rows)
+            solvers[convoy] = HeadwaySolver(gap)
+        index = np.array([tracks.names.index(name) for name in names])
+
+        timings = [Timing.from_row(row) for row in rows]
+        s = np.array([animator.arc_length(timing.local_times(tracks.t), row.interpolation_type)
+                      for timing, row in zip(timings, rows)])
+        # стоящие в начале пути выезжают в порядке старта по таймлайну
+        start = np.array([timing.start for timing in timings])
+        adjusted = solvers[convoy].solve_frames(s, start)
+
+        held = adjusted < s
+        for m in np.flatnonzero(held.any(axis=1)):
+            row, k = rows[m], held[m]
+            lateral, vertical = lane_offsets(row)
+            t = animator.parameter_at_length(adjusted[m, k], row.interpolation_type)
+            states = animator.get_states(t, row.interpolation_type, row.orientation_type,
+                                         lateral=lateral, vertical=vertical)
+            tracks.position[index[m], k] = states["position"]
+            tracks.direction[index[m], k] = states["direction"]
+            tracks.yaw[index[m], k] = states["yaw"]
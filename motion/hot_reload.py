@@ -0,0 +1,314 @@
+"""
+Горячая перезагрузка конфигурации акторов.
+
+Файл конфигурации (.json или .tsv) периодически проверяется по mtime/размеру.
+При изменении сравниваются сырые записи (элементы JSON / строки TSV), и
+заново разбираются только изменившиеся. К работающей сцене применяется
+минимальный набор изменений:
+
+    новая запись            → добавить актора
+    удалённая запись        → удалить актора
+    сменился тип актора     → пересоздать визуалы
+    сменился цвет           → перекрасить визуалы на месте
+    сменились стратегии/extra → обновить ActorConfigRow (провайдер читает её на лету)
+
+Записи с явным полем "name" сопоставляются с акторами по имени. Записи
+без имени — по совпадению сырой записи, а изменённые — по порядку среди
+оставшихся. Вставка, удаление или перестановка строк затрагивает только
+сами эти строки, а не всех акторов после них.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.actor_loader import ActorLoader
+from motion.interpolation_strategies import StrategyRegistry
+from motion.lanes import lane_offsets
+from motion.timeline import Timing
+
+
+@dataclass
+class SceneDiff:
+    """Изменения, применённые к сцене"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    replaced: List[str] = field(default_factory=list)
+    recolored: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    rejected: List[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return any([self.added, self.removed, self.replaced,
+                    self.recolored, self.updated, self.rejected])
+
+
+class ConfigWatcher:
+    """Отслеживание изменений файла по mtime и размеру"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._stamp = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def changed(self) -> bool:
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        return True
+
+
+# ============================================================
+# СЫРЫЕ ЗАПИСИ
+# ============================================================
+
+def read_records(filepath: str) -> Tuple[str, List[str]]:
+    """
+    Прочитать файл как (заголовок, список сырых записей) без разбора строк.
+    Для JSON запись — элемент "actors", сериализованный с сортировкой ключей.
+    """
+    suffix = os.path.splitext(filepath)[1].lower()
+    if suffix == ".json":
+        with open(filepath, "r", encoding="utf-8") as f:
+            items = json.load(f)["actors"]
+        return "", [json.dumps(item, sort_keys=True) for item in items]
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        lines = [line.rstrip("\r\n") for line in f]
+    if not lines:
+        return "", []
+    return lines[0], [line for line in lines[1:] if line.strip()]
+
+
+def _tsv_fields(line: str) -> List[str]:
+    """Поля строки TSV с кавычками csv — как у ActorLoader"""
+    return next(csv.reader([line], delimiter="\t"), [])
+
+
+def _record_dict(filepath: str, header: str, record: str) -> Dict:
+    if os.path.splitext(filepath)[1].lower() == ".json":
+        return json.loads(record)
+    fields = _tsv_fields(header)
+    values = _tsv_fields(record)
+    return dict(zip(fields, values + [""] * (len(fields) - len(values))))
+
+
+def parse_record(filepath: str, header: str, record: str) -> Optional[ActorConfigRow]:
+    """Разобрать одну сырую запись (None — запись невалидна)"""
+    if os.path.splitext(filepath)[1].lower() == ".json":
+        try:
+            return ActorLoader.row_from_item(json.loads(record))
+        except ValueError as e:
+            print(f"Пропускаем запись: {e}")
+            return None
+    return ActorLoader.row_from_csv(_record_dict(filepath, header, record))
+
+
+def record_key(filepath: str, header: str, record: str) -> Optional[str]:
+    """Явное имя актора записи (поле "name"); None — запись без имени"""
+    try:
+        name = _record_dict(filepath, header, record).get("name")
+    except (ValueError, AttributeError):
+        return None
+    return None if name in (None, "") else str(name)
+
+
+def match_records(old_records: List[str], old_keys: List[Optional[str]],
+                  new_records: List[str], new_keys: List[Optional[str]]) -> List[Optional[int]]:
+    """
+    Сопоставить новые записи со старыми.
+
+    Именованные — по имени. Безымянные — сначала по совпадению сырой
+    записи, оставшиеся изменённые — по порядку следования.
+
+    Returns:
+        для каждой новой записи индекс старой (None — новая запись)
+    """
+    match: List[Optional[int]] = [None] * len(new_records)
+    old_by_key = {key: i for i, key in enumerate(old_keys) if key is not None}
+    for j, key in enumerate(new_keys):
+        if key is not None:
+            # повтор имени в файле — новый актор
+            match[j] = old_by_key.pop(key, None)
+
+    # безымянные: сначала совпадающие записи (по порядку среди одинаковых),
+    # оставшиеся — по порядку следования
+    same: Dict[str, deque] = {}
+    for i, key in enumerate(old_keys):
+        if key is None:
+            same.setdefault(old_records[i], deque()).append(i)
+    rest_new = []
+    for j, key in enumerate(new_keys):
+        if key is not None:
+            continue
+        queue = same.get(new_records[j])
+        if queue:
+            match[j] = queue.popleft()
+        else:
+            rest_new.append(j)
+    rest_old = sorted(i for queue in same.values() for i in queue)
+    pairs = zip(rest_old, rest_new)
+    for i, j in pairs:
+        match[j] = i
+    return match
+
+
+def _valid_strategies(row: ActorConfigRow) -> bool:
+    try:
+        StrategyRegistry.get_position_strategy(row.interpolation_type)
+        StrategyRegistry.get_orientation_strategy(row.orientation_type)
+        Timing.from_row(row)
+        lane_offsets(row)
+    except ValueError as e:
+        print(f"Изменение отклонено: {e}")
+        return False
+    return True
+
+
+# ============================================================
+# ПЕРЕЗАГРУЗКА СЦЕНЫ
+# ============================================================
+
+class SceneReloader:
+    """Применяет изменения файла конфигурации к работающей AnimationSetup"""
+
+    def __init__(self, setup, poll_interval: float = 0.5):
+        """
+        Args:
+            setup: AnimationSetup после setup()
+            poll_interval: как часто проверять файл (сек)
+        """
+        self.setup = setup
+        self.filepath = setup.config_file
+        self.poll_interval = poll_interval
+        self.watcher = ConfigWatcher(self.filepath)
+        self._next_poll = 0.0
+
+        self._header, self._records = read_records(self.filepath)
+        self._keys = self._record_keys(self._header, self._records)
+        self._names = self._initial_names()
+
+    def _record_keys(self, header: str, records: List[str]) -> List[Optional[str]]:
+        return [record_key(self.filepath, header, record) for record in records]
+
+    def _initial_names(self) -> List[Optional[str]]:
+        """Имя актора для каждой записи — в той же нумерации, что и ActorLoader"""
+        names = []
+        valid = 0
+        for record in self._records:
+            row = parse_record(self.filepath, self._header, record)
+            if row is None:
+                names.append(None)
+                continue
+            name = ActorLoader.actor_name(row, valid)
+            names.append(name if name in self.setup.animation_config else None)
+            valid += 1
+        return names
+
+    def poll(self) -> Optional[SceneDiff]:
+        """Проверить файл и применить изменения (None — изменений нет)"""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return None
+        self._next_poll = now + self.poll_interval
+
+        if not self.watcher.changed():
+            return None
+        try:
+            header, records = read_records(self.filepath)
+        except (OSError, ValueError, KeyError) as e:
+            # файл может быть сохранён редактором не до конца
+            print(f"Не удалось прочитать {self.filepath}: {e}")
+            return None
+        return self.apply(header, records)
+
+    def apply(self, header: str, records: List[str]) -> SceneDiff:
+        """Применить новый набор записей"""
+        diff = SceneDiff()
+        header_changed = header != self._header
+        keys = self._record_keys(header, records)
+        match = match_records(self._records, self._keys, records, keys)
+
+        # Записи, которых больше нет в файле
+        kept = {i for i in match if i is not None}
+        for i, name in enumerate(self._names):
+            if i not in kept and name is not None:
+                self.setup.remove_actor(name, refresh=False)
+                diff.removed.append(name)
+
+        names: List[Optional[str]] = []
+        for j, (record, i) in enumerate(zip(records, match)):
+            name = None if i is None else self._names[i]
+            if not header_changed and i is not None and record == self._records[i]:
+                names.append(name)
+                continue
+
+            row = parse_record(self.filepath, header, record)
+            names.append(self._apply_row(j, name, row, diff))
+
+        self._header, self._records, self._keys, self._names = header, records, keys, names
+        if diff.added or diff.removed or diff.replaced or diff.updated:
+            # один пересчёт таймлайна на всю перезагрузку
+            # (extra могло поменять и расписание актора)
+            self.setup.refresh_timeline()
+        return diff
+
+    def _apply_row(self, index: int, name: Optional[str],
+                   row: Optional[ActorConfigRow], diff: SceneDiff) -> Optional[str]:
+        """Применить одну изменившуюся запись. Возвращает имя актора записи"""
+        if row is None:
+            if name is not None:
+                self.setup.remove_actor(name, refresh=False)
+                diff.removed.append(name)
+            return None
+
+        if not _valid_strategies(row):
+            diff.rejected.append(name or f"#{index}")
+            return name
+
+        if name is None:
+            name = self._unique_name(ActorLoader.actor_name(row, index))
+            self.setup.add_actor(name, row, refresh=False)
+            diff.added.append(name)
+            return name
+
+        current = self.setup.animation_config[name]
+
+        if current.actor_type != row.actor_type:
+            self.setup.remove_actor(name, refresh=False)
+            self.setup.add_actor(name, row, refresh=False)
+            diff.replaced.append(name)
+            return name
+
+        if current.color != row.color:
+            self.setup.visualizer.set_actor_color(name, row.color)
+            current.color = row.color
+            diff.recolored.append(name)
+
+        if (current.interpolation_type, current.orientation_type, current.extra) != \
+                (row.interpolation_type, row.orientation_type, row.extra):
+            current.interpolation_type = row.interpolation_type
+            current.orientation_type = row.orientation_type
+            current.extra = row.extra
+            diff.updated.append(name)
+
+        return name
+
+    def _unique_name(self, name: str) -> str:
+        candidate, k = name, 1
+        while candidate in self.setup.animation_config:
+            candidate = f"{name}_{k}"
+            k += 1
+        return candidate
@@ -11,20 +11,42 @@ from motion.trajectory import (
     interpolate_orientation_by_length,
     cumulative_lengths,
     polyline_length,
+    catmull_rom_coefficients,
+    evaluate_segments,
+    evaluate_segment_tangents,
 )
 
 from motion.kinematics import (
     tangent_velocity,
     normal_at_length,
-    normal_by_index
+    normal_by_index,
+    SplinePath,
 )
 
 
+def _catmull_rom(trajectory, cache=None):
+    """Коэффициенты Catmull-Rom (считаются один раз на аниматор)"""
+    if cache is None:
+        return catmull_rom_coefficients(trajectory)
+    if "catmull_rom" not in cache:
+        cache["catmull_rom"] = catmull_rom_coefficients(trajectory)
+    return cache["catmull_rom"]
+
+
+def _spline(trajectory, cache=None) -> SplinePath:
+    """Сплайн траектории (строится один раз на аниматор)"""
+    if cache is None:
+        return SplinePath(trajectory)
+    if "spline" not in cache:
+        cache["spline"] = SplinePath(trajectory)
+    return cache["spline"]
+
+
 class PositionStrategies:
     """Стратегии интерполяции позиции"""
 
     @staticmethod
-    def index(trajectory, t):
+    def index(trajectory, t, **kwargs):
         """Интерполяция по индексу"""
         return interpolate_position(
             trajectory,
@@ -32,12 +54,32 @@ class PositionStrategies:
         )
 
     @staticmethod
-    def length(trajectory, t):
+    def length(trajectory, t, **kwargs):
         """Интерполяция по длине дуги"""
         total_len = polyline_length(trajectory)
         s = t * total_len
         return interpolate_position_by_length(trajectory, s)
 
+    @staticmethod
+    def catmull_rom(trajectory, t, cache=None, **kwargs):
+        """
+        Центростремительный Catmull-Rom по индексу.
+        t может быть массивом — одна выборка коэффициентов + схема Горнера.
+        """
+        coeffs = _catmull_rom(trajectory, cache)
+        return evaluate_segments(coeffs, np.asarray(t) * (len(trajectory) - 1))
+
+    @staticmethod
+    def spline(trajectory, t, cache=None, **kwargs):
+        """Натуральный кубический сплайн по индексу (t может быть массивом)"""
+        position, _, _ = _spline(trajectory, cache).derivatives(t)
+        return position
+
+
+# Стратегии позиции, принимающие массив t за один вызов
+PositionStrategies.catmull_rom.vectorized = True
+PositionStrategies.spline.vectorized = True
+
 
 class OrientationStrategies:
     """Стратегии интерполяции ориентации"""
@@ -98,18 +140,53 @@ class OrientationStrategies:
 
         return direction / norm
 
+    @staticmethod
+    def catmull_rom(trajectory, t, cache=None, **kwargs):
+        """Касательная к кривой Catmull-Rom (аналитическая производная)"""
+        coeffs = _catmull_rom(trajectory, cache)
+        direction = evaluate_segment_tangents(coeffs, t * (len(trajectory) - 1))
+
+        norm = np.linalg.norm(direction)
+        if norm < 1e-10:
+            return np.array([1.0, 0.0, 0.0])
+
+        return direction / norm
+
+    @staticmethod
+    def spline_tangent(trajectory, t, cache=None, **kwargs):
+        """Касательная T сплайна (аналитическая, без шума ломаной)"""
+        return _spline(trajectory, cache).evaluate(t)["tangent"]
+
+    @staticmethod
+    def spline_normal(trajectory, t, cache=None, **kwargs):
+        """Главная нормаль N сплайна (на прямых участках — к вертикали)"""
+        return _spline(trajectory, cache).evaluate(t)["normal"]
+
+    @staticmethod
+    def spline_binormal(trajectory, t, cache=None, **kwargs):
+        """Бинормаль B = T × N сплайна"""
+        return _spline(trajectory, cache).evaluate(t)["binormal"]
+
     @staticmethod
     def my_custom_function(trajectory, t, **kwargs):  # ← Уже есть
         """Пример вашей новой функции"""
         pass
 
 
+# Стратегии ориентации, принимающие массив t за один вызов
+OrientationStrategies.spline_tangent.vectorized = True
+OrientationStrategies.spline_normal.vectorized = True
+OrientationStrategies.spline_binormal.vectorized = True
+
+
 class StrategyRegistry:
     """Реестр стратегий интерполяции"""
 
     _position_strategies = {
         'index': PositionStrategies.index,
         'length': PositionStrategies.length,
+        'catmull_rom': PositionStrategies.catmull_rom,
+        'spline': PositionStrategies.spline,
     }
 
     _orientation_strategies = {
@@ -118,6 +195,10 @@ class StrategyRegistry:
         'tangent_velocity': OrientationStrategies.tangent_velocity,
         'frenet_normal_length': OrientationStrategies.frenet_normal_length,
         'frenet_normal_index': OrientationStrategies.frenet_normal_index,
+        'catmull_rom': OrientationStrategies.catmull_rom,
+        'spline_tangent': OrientationStrategies.spline_tangent,
+        'spline_normal': OrientationStrategies.spline_normal,
+        'spline_binormal': OrientationStrategies.spline_binormal,
         'my_custom_function': OrientationStrategies.my_custom_function,
     }
 
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.interpolate import CubicSpline
 
 # импорт ТОЛЬКО того, что уже реализовано
 from motion.trajectory import (
@@ -59,7 +58,7 @@ def curvature(points: np.ndarray) -> np.ndarray:
     num = np.linalg.norm(np.cross(v1[:-1], v1[1:]), axis=1)
     den = np.linalg.norm(v1[:-1], axis=1)**3
 
-    k = np.zeros(len(points))
+    k = np.zeros(len(points), dtype=np.result_type(points.dtype, np.float32))
     k[1:-1] = num / np.where(den == 0, 1, den)
     return k
 
@@ -91,36 +90,79 @@ def constant_speed(total_length, t, T):
     """
     Равномерное движение.
     """
-    return min(total_length, total_length * t / T)
+    return np.minimum(total_length, total_length * np.asarray(t) / T)
 
 
-def accel_decel(total_length, t, T, v_max=1.0, a=1.0):
+def _accel_decel_phases(total_length, v_max, a):
     """
-    Разгон → равномерно → торможение.
+    Фазы трапециевидного профиля (векторно по акторам).
+
+    Returns:
+        (s_acc, t_acc, t_total): путь и время разгона, полное время;
+        короткий путь — треугольный профиль (s_acc = L/2, без крейсерской фазы)
     """
-    t_acc = v_max / a
-    s_acc = 0.5 * a * t_acc**2
+    total_length = np.asarray(total_length, dtype=float)
+    v_max = np.asarray(v_max, dtype=float)
+    a = np.asarray(a, dtype=float)
+
+    s_acc = np.minimum(0.5 * v_max ** 2 / a, 0.5 * total_length)
+    t_acc = np.sqrt(2 * s_acc / a)
+    t_total = 2 * t_acc + (total_length - 2 * s_acc) / v_max
+    return s_acc, t_acc, t_total
+
+
+def accel_decel(total_length, t, T=None, v_max=1.0, a=1.0):
+    """
+    Разгон → равномерно → торможение (векторно по t и параметрам).
+
+    T не используется: длительность определяется v_max и a
+    (оставлен для совместимости сигнатуры с другими профилями).
+    """
+    s_acc, t_acc, t_total = _accel_decel_phases(total_length, v_max, a)
+    t = np.clip(np.asarray(t, dtype=float), 0.0, t_total)
+
+    v_peak = a * t_acc
+    accel = 0.5 * a * t ** 2
+    cruise = s_acc + v_peak * (t - t_acc)
+    decel = total_length - 0.5 * a * (t_total - t) ** 2
+    return np.where(t < t_acc, accel, np.where(t <= t_total - t_acc, cruise, decel))
+
+
+# ============================================================
+# INVERSE PROFILES: length s → time t
+# ============================================================
+
+def constant_speed_time(total_length, s, T):
+    """Момент, когда равномерное движение проходит длину s"""
+    return np.clip(np.asarray(s, dtype=float) / total_length, 0.0, 1.0) * T
 
-    if 2 * s_acc > total_length:
-        # траектория слишком короткая — треугольный профиль
-        t_peak = np.sqrt(total_length / a)
-        if t < t_peak:
-            return 0.5 * a * t**2
-        else:
-            dt = t - t_peak
-            v_peak = a * t_peak
-            return total_length - 0.5 * a * dt**2
 
-    # разгон
-    if t < t_acc:
-        return 0.5 * a * t**2
+def s_curve_time(y, T):
+    """
+    Обращение s_curve: доля пути y ∈ [0, 1] → момент t.
+
+    Корень 3x² - 2x³ = y на [0, 1] в замкнутом виде (тригонометрическое
+    решение кубического уравнения): x = 1/2 - sin(arcsin(1 - 2y) / 3).
+    """
+    y = np.clip(np.asarray(y, dtype=float), 0.0, 1.0)
+    return (0.5 - np.sin(np.arcsin(1.0 - 2.0 * y) / 3.0)) * T
+
 
-    # равномерная скорость
-    s1 = s_acc
-    t1 = t - t_acc
-    s2 = min(v_max * t1, total_length - 2 * s_acc)
+def accel_decel_time(total_length, s, v_max=1.0, a=1.0):
+    """
+    Обращение accel_decel: момент прохождения длины s.
+
+    Параметры и s согласуются broadcasting'ом: например, (M, 1) параметров
+    акторов × (K,) станций дают (M, K) моментов за один вызов.
+    """
+    s_acc, t_acc, t_total = _accel_decel_phases(total_length, v_max, a)
+    total_length = np.asarray(total_length, dtype=float)
+    s = np.clip(np.asarray(s, dtype=float), 0.0, total_length)
 
-    return s1 + s2
+    accel = np.sqrt(2 * np.maximum(s, 0.0) / a)
+    cruise = t_acc + (s - s_acc) / np.asarray(v_max, dtype=float)
+    decel = t_total - np.sqrt(2 * np.maximum(total_length - s, 0.0) / a)
+    return np.where(s < s_acc, accel, np.where(s <= total_length - s_acc, cruise, decel))
 
 
 # ============================================================
@@ -193,6 +235,9 @@ def cubic_spline_trajectory(points: np.ndarray):
     """
     Возвращает три CubicSpline — по x, y, z.
     """
+    # SciPy импортируется только при первом построении сплайна
+    from scipy.interpolate import CubicSpline
+
     t = np.linspace(0, 1, len(points))
     return (
         CubicSpline(t, points[:, 0]),
@@ -209,6 +254,112 @@ def spline_position(splines, t):
     return np.array([sx(t), sy(t), sz(t)])
 
 
+class SplinePath:
+    """
+    Векторный кубический сплайн траектории с аналитическими производными.
+
+    SciPy строит коэффициенты один раз. Вычисление идёт без SciPy: один
+    поиск сегмента и схема Горнера сразу для позиции, первой и второй
+    производных. Из них получаются репер Френе и кривизна
+    для массива параметров за один вызов.
+    """
+
+    def __init__(self, points: np.ndarray, parameter: str = "index", bc_type: str = "natural"):
+        """
+        Args:
+            points: (N, 3) траектория
+            parameter: "index" — u равномерно по индексу точек,
+                "length" — по длине дуги (повторяющиеся точки отбрасываются);
+                u ∈ [0, 1]
+            bc_type: граничные условия CubicSpline
+        """
+        from scipy.interpolate import CubicSpline
+
+        points = np.asarray(points, dtype=float)
+        if parameter == "index":
+            u = np.linspace(0.0, 1.0, len(points))
+        elif parameter == "length":
+            cum_len = cumulative_lengths(points)
+            keep = np.concatenate([[True], np.diff(cum_len) > 0])
+            points, u = points[keep], cum_len[keep] / cum_len[-1]
+        else:
+            raise ValueError(
+                f"Unknown spline parameter: {parameter}. Available: ['index', 'length']"
+            )
+
+        spline = CubicSpline(u, points, axis=0, bc_type=bc_type)
+        self.parameter = parameter
+        self.knots = spline.x        # (N,)
+        self.coeffs = spline.c       # (4, N-1, 3), старшая степень первой
+
+    @classmethod
+    def from_coefficients(cls, knots: np.ndarray, coeffs: np.ndarray,
+                          parameter: str = "index") -> "SplinePath":
+        """Сплайн из готовых узлов и коэффициентов (например, из DerivedCache) без SciPy"""
+        spline = cls.__new__(cls)
+        spline.parameter = parameter
+        spline.knots = knots
+        spline.coeffs = coeffs
+        return spline
+
+    def derivatives(self, u):
+        """
+        Позиция и производные по u.
+
+        Returns:
+            (position, d1, d2) — массивы (..., 3) формы u
+        """
+        u = np.clip(np.asarray(u, dtype=float), self.knots[0], self.knots[-1])
+        i = np.clip(np.searchsorted(self.knots, u, side="right") - 1, 0, len(self.knots) - 2)
+        x = (u - self.knots[i])[..., None]
+        c3, c2, c1, c0 = self.coeffs[:, i]
+
+        position = ((c3 * x + c2) * x + c1) * x + c0
+        d1 = (3 * c3 * x + 2 * c2) * x + c1
+        d2 = 6 * c3 * x + 2 * c2
+        return position, d1, d2
+
+    def evaluate(self, u) -> dict:
+        """
+        Всё сразу для скаляра или массива u.
+
+        Returns:
+            dict: position, d1, d2, tangent, normal, binormal (..., 3),
+            curvature (...)
+        """
+        position, d1, d2 = self.derivatives(u)
+        speed = np.linalg.norm(d1, axis=-1)
+        cross = np.cross(d1, d2)
+        cross_norm = np.linalg.norm(cross, axis=-1)
+
+        tangent = np.divide(d1, speed[..., None], out=np.zeros_like(d1),
+                            where=speed[..., None] > 0)
+        tangent[speed == 0] = [1.0, 0.0, 0.0]
+        curvature = np.divide(cross_norm, speed ** 3, out=np.zeros_like(speed),
+                              where=speed > 0)
+
+        # прямой участок (d1 ∥ d2): нормаль — вертикаль, ортогонализованная к T
+        straight = cross_norm <= 1e-12 * np.maximum(speed, 1e-300) ** 3
+        binormal = np.divide(cross, cross_norm[..., None], out=np.zeros_like(cross),
+                             where=~straight[..., None])
+        if np.any(straight):
+            up = np.where(np.abs(tangent[..., 2:3]) > 0.99, [1.0, 0.0, 0.0], [0.0, 0.0, 1.0])
+            normal = up - np.sum(up * tangent, axis=-1, keepdims=True) * tangent
+            normal /= np.linalg.norm(normal, axis=-1, keepdims=True)
+            binormal = np.where(straight[..., None], np.cross(tangent, normal), binormal)
+            curvature = np.where(straight, 0.0, curvature)
+
+        return {
+            "position": position,
+            "d1": d1,
+            "d2": d2,
+            "tangent": tangent,
+            "normal": np.cross(binormal, tangent),
+            "binormal": binormal,
+            "curvature": curvature,
+        }
+
+
 def normal_at_length(points, s, ds=1e-4):
     """
     Получить вектор нормали N в точке s по длине дуги.
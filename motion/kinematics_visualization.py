@@ -1,7 +1,18 @@
+from __future__ import annotations
+
 import numpy as np
-from motion.kinematics import frenet_frame
-from motion.trajectory import interpolate_position
+from typing import Dict
+from motion.kinematics import frenet_frame, curvature
+from motion.trajectory import interpolate_position, cumulative_lengths
 from motion.visualization import ActorState
+from motion.visual_utils import scalars_to_colors
+from motion.lazy import LazyModule
+
+pv = LazyModule("pyvista")
+
+# Цвета глифов базиса Френе
+FRAME_COLORS = {"T": "red", "N": "green", "B": "blue"}
+PATH_QUANTITIES = ("curvature", "speed", "acceleration")
 
 
 class KinematicsVisualizer:
@@ -39,4 +50,127 @@ class KinematicsVisualizer:
         return ActorState(
             position=list(position),
             yaw=yaw
-        )
\ No newline at end of file
+        )
+
+    # ============================================================
+    # ОВЕРЛЕИ (вся траектория, векторно)
+    # ============================================================
+
+    def point_scalars(self, quantity: str, profile=None) -> np.ndarray:
+        """
+        Скалярная характеристика в каждой точке траектории.
+
+        Args:
+            quantity: "curvature", "speed" или "acceleration"
+            profile: SpeedProfile — скорость/ускорение по профилю;
+                без него — движение с равномерным шагом по индексу
+
+        Returns:
+            np.ndarray, shape (N,)
+        """
+        points = np.asarray(self.trajectory, dtype=float)
+
+        if quantity == "curvature":
+            return curvature(points)
+
+        if quantity not in PATH_QUANTITIES:
+            raise ValueError(
+                f"Unknown quantity: {quantity}. "
+                f"Available: {list(PATH_QUANTITIES)}"
+            )
+
+        if profile is not None:
+            s = cumulative_lengths(points)
+            v = profile.v_at(s)
+            if quantity == "speed":
+                return v
+            # продольное v·dv/ds = d(v²)/2ds и поперечное κv²;
+            # производная — по различным s (повторные точки дают ds = 0)
+            s_unique, inverse = np.unique(s, return_inverse=True)
+            a_long = np.zeros_like(s)
+            if len(s_unique) > 1:
+                a_long = 0.5 * np.gradient(profile.v_at(s_unique) ** 2, s_unique)[inverse]
+            a_lat = curvature(points) * v ** 2
+            return np.hypot(a_long, a_lat)
+
+        # производные по t ∈ [0, 1] при t = i / (N - 1)
+        n = max(len(points) - 1, 1)
+        velocity = np.gradient(points, axis=0) * n if len(points) > 1 else np.zeros_like(points)
+        if quantity == "speed":
+            return np.linalg.norm(velocity, axis=1)
+        acceleration = np.gradient(velocity, axis=0) * n if len(points) > 1 else velocity
+        return np.linalg.norm(acceleration, axis=1)
+
+    def frame_glyphs(self, vectors: str = "TNB", every: int = 1,
+                     scale: float = None) -> Dict[str, pv.PolyData]:
+        """
+        Глифы базиса Френе: по одному mesh на каждый вектор (T, N, B).
+        Векторы, нулевые во всех точках, пропускаются.
+
+        Args:
+            vectors: какие векторы строить, например "TN"
+            every: шаг прореживания точек
+            scale: длина стрелок (по умолчанию 3% диагонали траектории)
+        """
+        points = np.asarray(self.trajectory, dtype=float)[::every]
+        if scale is None:
+            scale = 0.03 * float(np.linalg.norm(np.ptp(points, axis=0)) or 1.0)
+
+        basis = {"T": self.T, "N": self.N, "B": self.B}
+        glyphs = {}
+        for key in vectors:
+            field = np.asarray(basis[key], dtype=float)[::every]
+            # вырожденные (нулевые) векторы не рисуем
+            mask = np.linalg.norm(field, axis=1) > 0
+            if not mask.any():
+                continue  # прямая: N и B не определены
+            cloud = pv.PolyData(points[mask])
+            cloud["vectors"] = field[mask]
+            glyphs[key] = cloud.glyph(orient="vectors", scale=False,
+                                      factor=scale, geom=pv.Arrow())
+        return glyphs
+
+    def colored_path(self, quantity: str = "curvature", profile=None,
+                     every: int = 1) -> pv.PolyData:
+        """
+        Линия траектории с цветами по точкам (массив "colors", RGB).
+        """
+        points = np.asarray(self.trajectory, dtype=float)
+        values = self.point_scalars(quantity, profile)
+
+        index = np.arange(0, len(points), every)
+        if index[-1] != len(points) - 1:
+            index = np.append(index, len(points) - 1)
+
+        path = pv.lines_from_points(points[index])
+        path[quantity] = values[index]
+        path["colors"] = (scalars_to_colors(values[index]) * 255).astype(np.uint8)
+        return path
+
+    def add_overlays(self, plotter, vectors: str = "TNB",
+                     color_by: str = "curvature", profile=None,
+                     every: int = 1, scale: float = None,
+                     line_width: float = 5):
+        """
+        Добавить оверлеи на сцену: глифы T/N/B и окрашенную траекторию.
+
+        Args:
+            plotter: pv.Plotter
+            vectors: векторы базиса ("" — без глифов)
+            color_by: характеристика для окраски пути (None — без пути)
+            profile: SpeedProfile для "speed"/"acceleration"
+            every: шаг прореживания точек
+            scale: длина стрелок
+
+        Returns:
+            dict: имя слоя -> pv.Actor
+        """
+        layers = {}
+        if vectors:
+            for key, glyph in self.frame_glyphs(vectors, every, scale).items():
+                layers[key] = plotter.add_mesh(glyph, color=FRAME_COLORS[key])
+        if color_by:
+            path = self.colored_path(color_by, profile, every)
+            layers[color_by] = plotter.add_mesh(path, scalars="colors", rgb=True,
+                                                line_width=line_width)
+        return layers
@@ -0,0 +1,255 @@
+"""
+Виртуальные параллельные полосы (lanes) вдоль одной траектории.
+
+Полоса задаётся тройкой (id базовой траектории, боковое смещение,
+вертикальное смещение) и не хранит своих точек. Для базового пути один
+раз считаются направления смещения в вершинах и поправки длины дуги.
+Дальше любое число полос вычисляется на лету пакетно:
+
+    вершина полосы   q_i = p_i + lateral · W_lat[i] + vertical · W_vert[i]
+    длина полосы     S(o)_i = cum_len_i + lateral · C_lat[i] + vertical · C_vert[i]
+
+Боковое направление горизонтально (влево по ходу). В изломах оно
+удлиняется (miter), чтобы полоса оставалась параллельной базовому пути.
+Длина сегмента полосы линейна по смещению, пока смещение меньше радиуса
+поворота (полоса не выворачивается). Поиск сегмента по длине — одна
+векторная бисекция по общему индексу для всех полос сразу.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.precision import ACCUM_DTYPE
+from motion.trajectory import cumulative_lengths
+
+UP = np.array([0.0, 0.0, 1.0])
+
+
+@dataclass
+class Lane:
+    """Полоса: смещение относительно базовой траектории"""
+    base: str
+    lateral: float = 0.0
+    vertical: float = 0.0
+
+
+def parse_offset(key: str, raw) -> float:
+    """Смещение из значения extra (пустое — 0)"""
+    if raw in (None, ""):
+        return 0.0
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number: {raw!r}") from None
+    if not np.isfinite(value):
+        raise ValueError(f"{key} must be finite: {raw!r}")
+    return value
+
+
+def lane_offsets(row: ActorConfigRow) -> Tuple[float, float]:
+    """
+    Смещения полосы актора из extra ("lateral", "vertical"; TSV — строки).
+
+    Разобранные числа хранятся в row.parsed вместе с исходными значениями:
+    в кадре повторный вызов только сравнивает их, а правка extra
+    (команда, перезагрузка) даёт новый разбор.
+
+    Raises:
+        ValueError: смещение — не конечное число
+    """
+    raw = (row.extra.get("lateral"), row.extra.get("vertical"))
+    cached = row.parsed.get("lane_offsets")
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    offsets = (parse_offset("lateral", raw[0]), parse_offset("vertical", raw[1]))
+    row.parsed["lane_offsets"] = (raw, offsets)
+    return offsets
+
+
+def _unit_rows(v: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(v, axis=1, keepdims=True)
+    return np.divide(v, norm, out=np.zeros_like(v), where=norm > 0)
+
+
+def _segment_directions(points: np.ndarray, directions: np.ndarray = None) -> np.ndarray:
+    """
+    Единичные направления сегментов; нулевые сегменты берут соседнее.
+
+    Args:
+        directions: готовые направления (interpolate_orientation, NaN
+            у нулевых сегментов) — не пересчитывать их по точкам
+    """
+    if directions is None:
+        d = np.diff(points, axis=0)
+        norm = np.linalg.norm(d, axis=1, keepdims=True)
+        valid = norm[:, 0] > 0
+        d = np.divide(d, norm, out=np.zeros_like(d), where=norm > 0)
+    else:
+        d = directions[:len(points) - 1]
+        valid = np.isfinite(d).all(axis=1)
+    if not valid.any():
+        return np.tile([1.0, 0.0, 0.0], (len(d), 1))
+
+    # вперёд — последнее валидное, в начале — первое валидное
+    idx = np.where(valid, np.arange(len(d)), 0)
+    idx = np.maximum.accumulate(idx)
+    idx[:np.argmax(valid)] = np.argmax(valid)
+    return d[idx]
+
+
+def _lateral(tangents: np.ndarray) -> np.ndarray:
+    """Горизонтальное направление влево по ходу (для вертикали — ось Y)"""
+    left = np.cross(UP, tangents)
+    flat = np.linalg.norm(left, axis=1) < 1e-9
+    left[flat] = [0.0, 1.0, 0.0]
+    return _unit_rows(left)
+
+
+class LaneFrames:
+    """Предвычисления одной базовой траектории, общие для всех её полос"""
+
+    def __init__(self, points: np.ndarray, miter_limit: float = 4.0,
+                 cum_len: np.ndarray = None, directions: np.ndarray = None):
+        """
+        Args:
+            points: (N, 3) базовая траектория (хранится без копии, в своём типе)
+            miter_limit: предел удлинения бокового смещения в изломах
+            cum_len, directions: готовые таблицы траектории
+                (TrajectoryAnimator.cum_len, directions_seg)
+        """
+        points = np.asarray(points)
+        self.points = points
+        self.cum_len = cumulative_lengths(points) if cum_len is None else cum_len
+
+        seg = _segment_directions(points, directions)           # (N-1, 3)
+        tangents = _unit_rows(np.concatenate([seg[:1], seg[:-1] + seg[1:], seg[-1:]]))
+        # разворот на 180°: сумма нулевая — берём входящий сегмент
+        zero = np.linalg.norm(tangents, axis=1) == 0
+        tangents[zero] = np.concatenate([seg[:1], seg])[zero]
+
+        lateral = _lateral(tangents)
+        seg_lateral = _lateral(seg)
+
+        # miter: проекция на боковые направления соседних сегментов = 1
+        cos_in = np.sum(lateral[1:] * seg_lateral, axis=1)
+        cos_out = np.sum(lateral[:-1] * seg_lateral, axis=1)
+        cos_half = np.ones(len(points))
+        cos_half[1:] = np.minimum(cos_half[1:], cos_in)
+        cos_half[:-1] = np.minimum(cos_half[:-1], cos_out)
+        miter = 1.0 / np.maximum(cos_half, 1.0 / miter_limit)
+
+        self.w_lat = lateral * miter[:, None]
+        self.w_vert = np.cross(tangents, lateral)
+
+        # d(длина сегмента)/d(смещение) = ΔW · направление сегмента
+        self.c_lat = np.concatenate([[0.0], np.cumsum(
+            np.sum(np.diff(self.w_lat, axis=0) * seg, axis=1), dtype=ACCUM_DTYPE)])
+        self.c_vert = np.concatenate([[0.0], np.cumsum(
+            np.sum(np.diff(self.w_vert, axis=0) * seg, axis=1), dtype=ACCUM_DTYPE)])
+
+    def lane_lengths(self, lateral, vertical=0.0) -> np.ndarray:
+        """Полные длины полос"""
+        return (self.cum_len[-1] + np.asarray(lateral) * self.c_lat[-1]
+                + np.asarray(vertical) * self.c_vert[-1])
+
+    def _lane_cum(self, idx, lateral, vertical) -> np.ndarray:
+        return self.cum_len[idx] + lateral * self.c_lat[idx] + vertical * self.c_vert[idx]
+
+    def _offset_points(self, i, frac, lateral, vertical) -> np.ndarray:
+        """Точки полосы внутри сегментов i с долями frac"""
+        q0 = self.points[i] + lateral[..., None] * self.w_lat[i] + vertical[..., None] * self.w_vert[i]
+        q1 = (self.points[i + 1] + lateral[..., None] * self.w_lat[i + 1]
+              + vertical[..., None] * self.w_vert[i + 1])
+        return q0 + (q1 - q0) * frac[..., None]
+
+    def positions_by_index(self, t_idx, lateral, vertical=0.0) -> np.ndarray:
+        """
+        Позиции на полосах по индексу вдоль траектории (0..N-1).
+        Аргументы согласуются broadcasting'ом.
+        """
+        t_idx, lateral, vertical = np.broadcast_arrays(
+            np.asarray(t_idx, dtype=float), np.asarray(lateral, dtype=float),
+            np.asarray(vertical, dtype=float))
+        t_idx = np.clip(t_idx, 0, len(self.points) - 1)
+        i = np.minimum(np.floor(t_idx).astype(np.intp), len(self.points) - 2)
+        return self._offset_points(i, t_idx - i, lateral, vertical)
+
+    def offsets_by_index(self, t_idx, lateral, vertical=0.0) -> np.ndarray:
+        """Смещение полосы относительно базовой траектории по индексу"""
+        return (self.positions_by_index(t_idx, lateral, vertical)
+                - self.positions_by_index(t_idx, 0.0, 0.0))
+
+    def positions_by_length(self, s, lateral, vertical=0.0) -> np.ndarray:
+        """
+        Позиции на полосах по длине дуги самой полосы.
+        Сегмент ищется векторной бисекцией по общему индексу.
+        """
+        s, lateral, vertical = np.broadcast_arrays(
+            np.asarray(s, dtype=float), np.asarray(lateral, dtype=float),
+            np.asarray(vertical, dtype=float))
+
+        # последний индекс вершины с длиной полосы <= s
+        lo = np.zeros(s.shape, dtype=np.intp)
+        hi = np.full(s.shape, len(self.points) - 2, dtype=np.intp)
+        for _ in range(int(np.ceil(np.log2(max(len(self.points) - 1, 1)))) + 1):
+            mid = (lo + hi + 1) // 2
+            below = self._lane_cum(mid, lateral, vertical) <= s
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid - 1)
+
+        start = self._lane_cum(lo, lateral, vertical)
+        seg = self._lane_cum(lo + 1, lateral, vertical) - start
+        frac = np.clip(np.divide(s - start, seg, out=np.zeros_like(s), where=seg > 0), 0.0, 1.0)
+        return self._offset_points(lo, frac, lateral, vertical)
+
+    def positions(self, t, lateral, vertical=0.0, by_length: bool = True) -> np.ndarray:
+        """
+        Позиции в момент t ∈ [0, 1] (равномерно по длине полосы или по индексу).
+        """
+        t = np.asarray(t, dtype=float)
+        if by_length:
+            return self.positions_by_length(t * self.lane_lengths(lateral, vertical),
+                                            lateral, vertical)
+        return self.positions_by_index(t * (len(self.points) - 1), lateral, vertical)
+
+
+class LaneNetwork:
+    """Базовые траектории по id и их общие предвычисления"""
+
+    def __init__(self):
+        self._frames: Dict[str, LaneFrames] = {}
+
+    def add_path(self, base: str, points: np.ndarray, **params) -> LaneFrames:
+        self._frames[base] = LaneFrames(points, **params)
+        return self._frames[base]
+
+    def frames(self, base: str) -> LaneFrames:
+        if base not in self._frames:
+            raise ValueError(
+                f"Unknown base trajectory: {base}. "
+                f"Available: {list(self._frames.keys())}"
+            )
+        return self._frames[base]
+
+    def positions(self, lanes: Dict[str, Lane], t, by_length: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Позиции всех полос в момент t: полосы одной базы — один пакетный вызов.
+
+        Returns:
+            {имя полосы: позиция (3,) или (K, 3) для массива t}
+        """
+        by_base: Dict[str, list] = {}
+        for name, lane in lanes.items():
+            by_base.setdefault(lane.base, []).append(name)
+
+        t = np.asarray(t, dtype=float)
+        result = {}
+        for base, names in by_base.items():
+            lateral = np.array([lanes[n].lateral for n in names])[(...,) + (None,) * t.ndim]
+            vertical = np.array([lanes[n].vertical for n in names])[(...,) + (None,) * t.ndim]
+            points = self.frames(base).positions(t, lateral, vertical, by_length)
+            result.update(zip(names, points))
+        return result
@@ -0,0 +1,31 @@
+"""
+Ленивый импорт тяжёлых зависимостей (SciPy, PyVista).
+
+Вычислительные модули должны импортироваться с одним NumPy: короткоживущие
+воркеры пакетных задач иначе тратят основное время на импорт VTK и SciPy.
+
+    pv = LazyModule("pyvista")   # ничего не импортирует
+    pv.Sphere()                  # здесь происходит настоящий импорт
+"""
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Прокси модуля, импортирующий его при первом обращении к атрибуту"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
@@ -1,5 +1,9 @@
-import pyvista as pv
+from __future__ import annotations
+
 from typing import Dict, Any
+from motion.lazy import LazyModule
+
+pv = LazyModule("pyvista")
 
 
 class MeshFactory:
@@ -0,0 +1,181 @@
+"""
+Параллельное запекание сцены в нескольких процессах.
+
+Траектория и выходной буфер состояний лежат в multiprocessing.shared_memory:
+воркеры получают только имена сегментов и диапазоны (акторы × кадры),
+а результаты пишут прямо в общий буфер — без pickle массивов.
+
+Каждая ячейка (актор, кадр) вычисляется одной и той же чистой функцией,
+поэтому результат не зависит от числа воркеров и разбиения на задачи.
+
+Кастомные стратегии должны регистрироваться при импорте модуля, иначе
+воркеры (при старте через spawn/forkserver) их не увидят.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from motion.actor_config_schema import ActorConfigRow
+from motion.baking import BakedTracks, frame_times
+from motion.precision import as_positions, get_precision, set_precision
+from motion.timeline import Timing
+from motion.lanes import lane_offsets
+from motion.headway import apply_convoys, convoy_groups
+
+# Раскладка состояния в буфере: position(3), direction(3), yaw
+STATE_FIELDS = 7
+
+# Состояние воркера (заполняется в _init_worker)
+_worker = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Подключиться к сегменту, созданному родителем.
+    Удаление сегмента — только на стороне родителя (unlink в finally).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # До 3.13 воркеры делят resource_tracker родителя: повторная
+    # регистрация того же имени безвредна
+    return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(traj_name: str, traj_shape: tuple,
+                 out_name: str, out_shape: tuple,
+                 strategies: List[tuple], steps: int, dtype: str):
+    """Инициализация процесса: подключение к общей памяти и аниматор"""
+    from motion.animation_math import TrajectoryAnimator
+
+    set_precision(dtype)
+    traj_shm = _attach(traj_name)
+    out_shm = _attach(out_name)
+    trajectory = np.ndarray(traj_shape, dtype=dtype, buffer=traj_shm.buf)
+
+    _worker.update(
+        shm=(traj_shm, out_shm),
+        animator=TrajectoryAnimator(trajectory),
+        out=np.ndarray(out_shape, dtype=dtype, buffer=out_shm.buf),
+        strategies=strategies,
+        t=frame_times(steps),
+    )
+
+
+def _bake_block(actors: Tuple[int, int], frames: Tuple[int, int]) -> int:
+    """Запечь блок акторов × кадров прямо в общий буфер"""
+    animator = _worker["animator"]
+    out = _worker["out"]
+    t = _worker["t"][frames[0]:frames[1]]
+
+    for i in range(*actors):
+        interp, orient, timing, (lateral, vertical) = _worker["strategies"][i]
+        states = animator.get_states(timing.local_times(t), interp, orient,
+                                     lateral=lateral, vertical=vertical)
+        block = out[i, frames[0]:frames[1]]
+        block[:, 0:3] = states["position"]
+        block[:, 3:6] = states["direction"]
+        block[:, 6] = states["yaw"]
+
+    return (actors[1] - actors[0]) * (frames[1] - frames[0])
+
+
+def _split(total: int, parts: int) -> List[Tuple[int, int]]:
+    """Разбить [0, total) на parts почти равных непустых диапазонов"""
+    bounds = np.linspace(0, total, min(parts, total) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def plan_blocks(n_actors: int, steps: int, workers: int,
+                shard: str = "auto", tasks_per_worker: int = 4) -> List[tuple]:
+    """
+    Разбиение работы на блоки (actors_range, frames_range).
+
+    shard: "actors", "frames" или "auto" (по акторам, если их хватает на всех)
+    """
+    n_tasks = workers * tasks_per_worker
+    if shard == "auto":
+        shard = "actors" if n_actors >= n_tasks else "frames"
+
+    if shard == "actors":
+        return [(a, (0, steps)) for a in _split(n_actors, n_tasks)]
+    if shard == "frames":
+        return [(a, f) for a in _split(n_actors, n_actors)
+                for f in _split(steps, max(1, n_tasks // n_actors))]
+    raise ValueError(f"Unknown shard mode: {shard}")
+
+
+def bake_scene_parallel(trajectory: np.ndarray,
+                        animation_config: Dict[str, ActorConfigRow],
+                        steps: int, workers: int = None,
+                        shard: str = "auto", cache=None) -> BakedTracks:
+    """
+    Запечь сцену в пуле процессов.
+
+    Args:
+        trajectory: (N, 3) траектория
+        animation_config: {имя актора: ActorConfigRow}
+        steps: число кадров
+        workers: число процессов (по умолчанию — число ядер)
+        shard: разбиение работы — "actors", "frames" или "auto"
+        cache: DerivedCache — повторный запуск читает треки с диска
+
+    Returns:
+        BakedTracks — идентичен результату bake_scene
+    """
+    if cache is not None:
+        from motion.baking import cached_tracks
+        trajectory = as_positions(trajectory)
+        return cached_tracks(cache, trajectory, animation_config, steps,
+                             lambda: bake_scene_parallel(trajectory, animation_config,
+                                                         steps, workers, shard))
+
+    workers = workers or os.cpu_count() or 1
+    names = list(animation_config)
+    strategies = [(animation_config[n].interpolation_type,
+                   animation_config[n].orientation_type,
+                   Timing.from_row(animation_config[n]),
+                   lane_offsets(animation_config[n])) for n in names]
+
+    dtype = get_precision()
+    trajectory = as_positions(trajectory)
+    out_shape = (len(names), steps, STATE_FIELDS)
+
+    traj_shm = shared_memory.SharedMemory(create=True, size=max(trajectory.nbytes, 1))
+    out_shm = shared_memory.SharedMemory(
+        create=True, size=max(int(np.prod(out_shape)) * trajectory.itemsize, 1))
+    try:
+        np.ndarray(trajectory.shape, dtype=dtype, buffer=traj_shm.buf)[:] = trajectory
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(traj_shm.name, trajectory.shape,
+                          out_shm.name, out_shape, strategies, steps, dtype)) as pool:
+            futures = [pool.submit(_bake_block, actors, frames)
+                       for actors, frames in plan_blocks(len(names), steps, workers, shard)]
+            for future in futures:
+                future.result()
+
+        out = np.ndarray(out_shape, dtype=dtype, buffer=out_shm.buf).copy()
+    finally:
+        traj_shm.close()
+        traj_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+    tracks = BakedTracks(
+        names=names,
+        t=frame_times(steps),
+        position=out[:, :, 0:3],
+        direction=out[:, :, 3:6],
+        yaw=out[:, :, 6],
+    )
+    if convoy_groups(animation_config):
+        from motion.animation_math import TrajectoryAnimator
+        apply_convoys(TrajectoryAnimator(trajectory), tracks, animation_config)
+    return tracks
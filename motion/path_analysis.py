@@ -0,0 +1,299 @@
+"""
+Пакетный кинематический анализ тысяч траекторий.
+
+Траектории упаковываются в один массив точек (N, 3) и смещения начал
+путей (P + 1,). Все характеристики считаются векторно сразу по всем
+путям: сегменты на стыках путей отбрасываются маской, а свёртки по путям
+делаются через ufunc.reduceat. Перцентили кривизны — построчная сортировка
+путей близкой длины и выборка по рангам.
+
+Упакованное хранилище — .npz с ключами points, offsets, names.
+Результат — колоночная таблица (.csv или .npz).
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from motion.trajectory_io import load_trajectory
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+# точек в одном векторном блоке: временные массивы остаются в кэше
+BLOCK_POINTS = 1 << 16
+TRAJECTORY_SUFFIXES = (".npy", ".npz", ".csv", ".tsv", ".txt")
+
+
+# ============================================================
+# УПАКОВКА
+# ============================================================
+
+def pack_trajectories(trajectories: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        points (N, 3) и offsets (P + 1,): путь p — points[offsets[p]:offsets[p + 1]]
+    """
+    offsets = np.zeros(len(trajectories) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(points) for points in trajectories])
+    if not trajectories:
+        return np.empty((0, 3)), offsets
+    return np.concatenate(trajectories).astype(float, copy=False), offsets
+
+
+def save_packed(filepath, names: List[str], trajectories: Sequence[np.ndarray]):
+    """Сохранить траектории одним .npz"""
+    points, offsets = pack_trajectories(trajectories)
+    np.savez(filepath, points=points, offsets=offsets, names=np.array(names))
+
+
+def load_packed(filepath) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (names, points, offsets)
+    """
+    with np.load(filepath) as data:
+        points, offsets = data["points"], data["offsets"]
+        names = ([str(name) for name in data["names"]] if "names" in data
+                 else [str(i) for i in range(len(offsets) - 1)])
+    if np.any(np.diff(offsets) < 2):
+        raise ValueError("Каждая траектория должна содержать не меньше 2 точек")
+    return names, np.asarray(points, dtype=float), offsets
+
+
+# ============================================================
+# АНАЛИЗ
+# ============================================================
+
+def _group_percentiles(values: np.ndarray, counts: np.ndarray,
+                       percentiles: Sequence[float]) -> np.ndarray:
+    """
+    Перцентили значений по подряд идущим группам (линейная интерполяция,
+    как np.percentile).
+
+    Группы близкой длины (длина в пределах степени двойки) сортируются
+    одним np.sort по строкам дополненной матрицы, так что дополнение
+    не больше чем вдвое.
+
+    Args:
+        values: значения всех групп подряд
+        counts: (G,) размеры групп
+
+    Returns:
+        (G, len(percentiles)); пустые группы — 0
+    """
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    out = np.zeros((len(counts), len(percentiles)))
+    bins = np.ceil(np.log2(np.maximum(counts, 1))).astype(int)
+    q = np.asarray(percentiles, dtype=float) / 100.0
+
+    for b in np.unique(bins[counts > 0]):
+        rows = np.flatnonzero((bins == b) & (counts > 0))
+        n = counts[rows]
+        width = np.arange(n.max())
+        idx = starts[rows, None] + width
+        block = np.where(width < n[:, None], values[np.minimum(idx, len(values) - 1)], np.inf)
+        block.sort(axis=1)
+
+        pos = q * (n[:, None] - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, n[:, None] - 1)
+        a = np.take_along_axis(block, lo, axis=1)
+        out[rows] = a + (np.take_along_axis(block, hi, axis=1) - a) * (pos - lo)
+    return out
+
+
+def analyze_packed(points: np.ndarray, offsets: np.ndarray,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                   block_points: int = BLOCK_POINTS) -> Dict[str, np.ndarray]:
+    """
+    Характеристики всех путей упакованного набора.
+
+    Кривизна — как kinematics.curvature, во внутренних точках путей;
+    перцентили считаются по ним же. Пути обрабатываются блоками примерно
+    по block_points точек (длинный путь — отдельным блоком).
+
+    Returns:
+        {колонка: массив (P,)}
+    """
+    points = np.asarray(points, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(offsets) < 2:
+        return {}
+
+    # границы блоков — первые пути, начинающиеся за очередной квотой точек
+    quota = np.arange(block_points, offsets[-1], block_points)
+    bounds = np.unique(np.concatenate([[0], np.searchsorted(offsets[:-1], quota),
+                                       [len(offsets) - 1]]))
+    blocks = [_analyze_block(points[offsets[a]:offsets[b]], offsets[a:b + 1] - offsets[a],
+                             percentiles)
+              for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    return {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+
+
+def _analyze_block(points: np.ndarray, offsets: np.ndarray,
+                   percentiles: Sequence[float]) -> Dict[str, np.ndarray]:
+    """analyze_packed для одного блока путей (offsets начинаются с 0)"""
+    n_paths = len(offsets) - 1
+    n_points = np.diff(offsets)
+
+    # сегменты по компонентам (3, M): у пути p их n_points[p] - 1,
+    # стыки путей выбрасываются
+    seg = np.diff(np.ascontiguousarray(points.T), axis=1)
+    inside = np.ones(seg.shape[1], dtype=bool)
+    inside[offsets[1:-1] - 1] = False
+    seg = seg[:, inside]
+    seg_len = np.sqrt(np.einsum("ij,ij->j", seg, seg))
+    seg_count = n_points - 1
+    seg_start = offsets[:-1] - np.arange(n_paths)
+
+    length = np.add.reduceat(seg_len, seg_start)
+    columns = {
+        "points": n_points,
+        "length": length,
+        "segment_min": np.minimum.reduceat(seg_len, seg_start),
+        "segment_mean": length / seg_count,
+        "segment_max": np.maximum.reduceat(seg_len, seg_start),
+        "degenerate_segments": np.add.reduceat((seg_len == 0).astype(np.int64), seg_start),
+    }
+
+    # кривизна во внутренних точках: пары соседних сегментов одного пути
+    pair = np.ones(max(seg.shape[1] - 1, 0), dtype=bool)
+    pair[(seg_start[1:] - 1)[seg_start[1:] - 1 < len(pair)]] = False
+    (ax, ay, az), (bx, by, bz) = seg[:, :-1][:, pair], seg[:, 1:][:, pair]
+    cross = np.stack([ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx])
+    num = np.sqrt(np.einsum("ij,ij->j", cross, cross))
+    den = seg_len[:-1][pair] ** 3
+    k = num / np.where(den == 0, 1, den)
+    k_count = seg_count - 1
+    k_start = seg_start - np.arange(n_paths)
+    has_k = k_count > 0
+
+    k_max = np.zeros(n_paths)
+    k_sum = np.zeros(n_paths)
+    if has_k.any():
+        k_max[has_k] = np.maximum.reduceat(k, k_start[has_k])
+        k_sum[has_k] = np.add.reduceat(k, k_start[has_k])
+    columns["curvature_max"] = k_max
+    columns["curvature_mean"] = k_sum / np.maximum(k_count, 1)
+    for q, values in zip(percentiles, _group_percentiles(k, k_count, percentiles).T):
+        columns[f"curvature_p{q:g}"] = values
+    columns["radius_min"] = np.divide(1.0, k_max, out=np.full(n_paths, np.inf),
+                                      where=k_max > 0)
+    return columns
+
+
+# ============================================================
+# ИСТОЧНИКИ И ПАРАЛЛЕЛЬНЫЙ ЗАПУСК
+# ============================================================
+
+def list_trajectories(directory) -> List[Path]:
+    """Файлы траекторий каталога (в порядке имён)"""
+    return sorted(path for path in Path(directory).iterdir()
+                  if path.suffix.lower() in TRAJECTORY_SUFFIXES)
+
+
+def column_names(percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[str]:
+    """Колонки analyze_packed (в том же порядке)"""
+    return ["points", "length", "segment_min", "segment_mean", "segment_max",
+            "degenerate_segments", "curvature_max", "curvature_mean",
+            *(f"curvature_p{q:g}" for q in percentiles), "radius_min"]
+
+
+def _analyze_files(files: List[str], percentiles) -> Dict[str, np.ndarray]:
+    """
+    Анализ файлов блока. Нечитаемый файл не прерывает отчёт: его строка
+    получает текст ошибки в колонке "error", 0 в счётчиках и NaN в остальных.
+    """
+    trajectories, errors = [], []
+    for path in files:
+        try:
+            trajectories.append(load_trajectory(path))
+            errors.append("")
+        except Exception as e:  # любой сбой чтения — только этого файла
+            # одной строкой: сообщения разборщиков бывают многострочными
+            errors.append(f"{type(e).__name__}: {' '.join(str(e).split())}")
+
+    ok = np.array([not error for error in errors], dtype=bool)
+    packed = analyze_packed(*pack_trajectories(trajectories), percentiles)
+    columns = {}
+    for key in column_names(percentiles):
+        values = packed.get(key, np.empty(0))
+        integer = key in ("points", "degenerate_segments")
+        column = (np.zeros(len(files), dtype=np.int64) if integer
+                  else np.full(len(files), np.nan))
+        column[ok] = values
+        columns[key] = column
+    columns["error"] = np.array(errors, dtype=str)
+    return columns
+
+
+def _analyze_range(points: np.ndarray, offsets: np.ndarray, percentiles) -> Dict[str, np.ndarray]:
+    return analyze_packed(points, offsets - offsets[0], percentiles)
+
+
+def _split(total: int, parts: int) -> List[Tuple[int, int]]:
+    bounds = np.linspace(0, total, max(1, min(parts, total)) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def analyze_source(source, workers: int = 1,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES
+                   ) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Проанализировать каталог траекторий или упакованный .npz.
+
+    Пути делятся на workers последовательных блоков. Каталог читается
+    воркерами (разбор файлов — основная работа), упакованный набор
+    режется по смещениям путей. Для каталога добавляется колонка "error"
+    (пустая строка — файл прочитан).
+
+    Args:
+        workers: число процессов (0 — по числу ядер)
+
+    Returns:
+        (names, columns)
+    """
+    workers = workers or os.cpu_count() or 1
+    source = Path(source)
+
+    if source.is_dir():
+        files = list_trajectories(source)
+        names = [path.stem for path in files]
+        blocks = [([str(path) for path in files[a:b]], percentiles)
+                  for a, b in _split(len(files), workers)]
+        func = _analyze_files
+    else:
+        names, points, offsets = load_packed(source)
+        blocks = [(points[offsets[a]:offsets[b]], offsets[a:b + 1], percentiles)
+                  for a, b in _split(len(names), workers)]
+        func = _analyze_range
+
+    if workers == 1 or len(blocks) <= 1:
+        results = [func(*block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, *zip(*blocks)))
+
+    if not results:
+        return names, {}
+    columns = {key: np.concatenate([result[key] for result in results])
+               for key in results[0]}
+    return names, columns
+
+
+def save_report(filepath, names: List[str], columns: Dict[str, np.ndarray]):
+    """Таблица результатов: .csv (строка на путь) или .npz (колонки)"""
+    suffix = Path(filepath).suffix.lower()
+    if suffix == ".npz":
+        np.savez(filepath, name=np.array(names), **columns)
+    elif suffix == ".csv":
+        with open(filepath, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", *columns])
+            rows = zip(names, *(column.tolist() for column in columns.values()))
+            writer.writerows(rows)
+    else:
+        raise ValueError(f"Unknown report format: {suffix}. Available: ['.csv', '.npz']")
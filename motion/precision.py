@@ -0,0 +1,75 @@
+"""
+Политика точности вычислений.
+
+Позиции, направления и буферы состояний хранятся и считаются в рабочем
+типе (float64 по умолчанию, float32 — вдвое меньше памяти и трафика,
+именно его потребляет VTK). Накопление длин дуги всегда идёт в float64:
+сумма миллионов сегментов в float32 теряет точность.
+
+    set_precision("float32")        # глобально
+    with precision("float32"): ...  # временно
+
+Начальное значение можно задать переменной окружения AMIME_PRECISION.
+"""
+
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+PRECISIONS = {
+    "float32": np.float32,
+    "float64": np.float64,
+}
+
+# Тип для накопления длин дуги (cumsum)
+ACCUM_DTYPE = np.float64
+
+
+def _lookup(name: str):
+    """Тип по имени (ValueError для неизвестного)"""
+    if name not in PRECISIONS:
+        raise ValueError(
+            f"Unknown precision: {name}. "
+            f"Available: {list(PRECISIONS.keys())}"
+        )
+    return PRECISIONS[name]
+
+
+_policy = {"dtype": _lookup(os.environ.get("AMIME_PRECISION", "float64"))}
+
+
+def set_precision(name: str):
+    """Выбрать рабочий тип: "float32" или "float64" """
+    _policy["dtype"] = _lookup(name)
+
+
+def get_dtype():
+    """Текущий рабочий тип"""
+    return _policy["dtype"]
+
+
+def get_precision() -> str:
+    """Имя текущего рабочего типа"""
+    return np.dtype(_policy["dtype"]).name
+
+
+@contextmanager
+def precision(name: str):
+    """Временно сменить рабочий тип"""
+    previous = get_precision()
+    set_precision(name)
+    try:
+        yield
+    finally:
+        set_precision(previous)
+
+
+def as_positions(points) -> np.ndarray:
+    """Массив точек в рабочем типе (без копии, если тип уже совпадает)"""
+    return np.ascontiguousarray(points, dtype=get_dtype())
+
+
+def state_array(shape) -> np.ndarray:
+    """Неинициализированный буфер состояний в рабочем типе"""
+    return np.empty(shape, dtype=get_dtype())
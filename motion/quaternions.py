@@ -1,5 +1,16 @@
+from __future__ import annotations
+
 import numpy as np
-from scipy.spatial.transform import Rotation as R, Slerp
+from motion.lazy import LazyModule
+
+# SciPy загружается при первом обращении к R / Slerp
+_transform = LazyModule("scipy.spatial.transform")
+
+
+def __getattr__(name):
+    if name in ("R", "Slerp"):
+        return getattr(_transform, "Rotation" if name == "R" else name)
+    raise AttributeError(name)
 
 
 # ============================================================
@@ -23,7 +34,7 @@ def quat_from_direction(direction, up=np.array([0, 0, 1.0])):
     up2 = np.cross(direction, right)
 
     rot_matrix = np.vstack([right, up2, direction]).T
-    return R.from_matrix(rot_matrix)
+    return _transform.Rotation.from_matrix(rot_matrix)
 
 
 def quat_to_matrix(quat: R) -> np.ndarray:
@@ -51,8 +62,8 @@ def quat_slerp(q0: R, q1: R, t: float) -> R:
     t — float от 0 до 1
     """
     key_times = [0, 1]
-    key_rots = R.from_quat([q0.as_quat(), q1.as_quat()])
-    slerp = Slerp(key_times, key_rots)
+    key_rots = _transform.Rotation.from_quat([q0.as_quat(), q1.as_quat()])
+    slerp = _transform.Slerp(key_times, key_rots)
     return slerp([t])[0]
 
 
@@ -81,3 +92,85 @@ def smoothstep(t: float) -> float:
     Плавное сглаживание (ease-in-out) для параметров движения.
     """
     return t * t * (3 - 2 * t)
+
+
+# ============================================================
+# Пакетные операции (NumPy, без SciPy)
+# Порядок компонент как в SciPy: (x, y, z, w)
+# ============================================================
+
+def matrices_to_quats(matrices: np.ndarray) -> np.ndarray:
+    """
+    Матрицы поворота (M, 3, 3) → единичные кватернионы (M, 4).
+    Для каждой матрицы выбирается численно устойчивая ветвь
+    (наибольший из w², x², y², z²).
+    """
+    m = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+
+    # 4·(w², x², y², z²) с точностью до общего множителя
+    cand = np.stack([1 + trace,
+                     1 + 2 * m[:, 0, 0] - trace,
+                     1 + 2 * m[:, 1, 1] - trace,
+                     1 + 2 * m[:, 2, 2] - trace], axis=1)
+    branch = np.argmax(cand, axis=1)
+
+    q = np.empty((len(m), 4))
+    # ветвь w
+    q_w = np.stack([m[:, 2, 1] - m[:, 1, 2], m[:, 0, 2] - m[:, 2, 0],
+                    m[:, 1, 0] - m[:, 0, 1], cand[:, 0]], axis=1)
+    q_x = np.stack([cand[:, 1], m[:, 0, 1] + m[:, 1, 0],
+                    m[:, 0, 2] + m[:, 2, 0], m[:, 2, 1] - m[:, 1, 2]], axis=1)
+    q_y = np.stack([m[:, 0, 1] + m[:, 1, 0], cand[:, 2],
+                    m[:, 1, 2] + m[:, 2, 1], m[:, 0, 2] - m[:, 2, 0]], axis=1)
+    q_z = np.stack([m[:, 0, 2] + m[:, 2, 0], m[:, 1, 2] + m[:, 2, 1],
+                    cand[:, 3], m[:, 1, 0] - m[:, 0, 1]], axis=1)
+    for k, branch_q in enumerate((q_w, q_x, q_y, q_z)):
+        q[branch == k] = branch_q[branch == k]
+
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def quats_to_matrices(quats: np.ndarray) -> np.ndarray:
+    """Единичные кватернионы (M, 4) → матрицы поворота (M, 3, 3)"""
+    q = np.asarray(quats, dtype=float).reshape(-1, 4)
+    x, y, z, w = q.T
+
+    m = np.empty((len(q), 3, 3))
+    m[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    m[:, 0, 1] = 2 * (x * y - z * w)
+    m[:, 0, 2] = 2 * (x * z + y * w)
+    m[:, 1, 0] = 2 * (x * y + z * w)
+    m[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    m[:, 1, 2] = 2 * (y * z - x * w)
+    m[:, 2, 0] = 2 * (x * z - y * w)
+    m[:, 2, 1] = 2 * (y * z + x * w)
+    m[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return m
+
+
+def slerp_quats(q0: np.ndarray, q1: np.ndarray, alpha) -> np.ndarray:
+    """
+    Пакетный SLERP (M, 4) × (M, 4) по кратчайшей дуге.
+    Почти совпадающие кватернионы интерполируются линейно с нормировкой.
+
+    Args:
+        alpha: скаляр или (M,) — доля пути от q0 к q1
+    """
+    q0 = np.asarray(q0, dtype=float)
+    q1 = np.asarray(q1, dtype=float)
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), q0.shape[:-1])[..., None]
+
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin = np.sin(theta)
+    near = sin < 1e-6
+    safe = np.where(near, 1.0, sin)
+
+    w0 = np.where(near, 1 - alpha, np.sin((1 - alpha) * theta) / safe)
+    w1 = np.where(near, alpha, np.sin(alpha * theta) / safe)
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
@@ -0,0 +1,196 @@
+"""
+Генератор синтетических сценариев для нагрузочного тестирования.
+
+Сценарий = траектория заданного вида и размера + конфигурация акторов
+со смесью стратегий, совместимая с ActorLoader. Всё воспроизводимо по seed.
+
+    python -m motion.scenarios --kind helix --points 100000 --actors 1000 --out scenes/helix
+"""
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from motion.trajectory_io import save_trajectory
+
+COLORS = ["red", "cyan", "green", "yellow", "white", "magenta", "orange", "blue"]
+ACTOR_TYPES = ["sphere", "arrow"]
+
+
+# ============================================================
+# ТРАЕКТОРИИ
+# ============================================================
+
+def helix(n: int, rng: np.random.Generator, radius: float = 2.0,
+          pitch: float = 0.5, turns: float = None) -> np.ndarray:
+    """Винтовая линия"""
+    turns = turns if turns is not None else max(n / 100.0, 1.0)
+    angle = np.linspace(0.0, 2 * np.pi * turns, n)
+    return np.stack([radius * np.cos(angle),
+                     radius * np.sin(angle),
+                     pitch * angle / (2 * np.pi)], axis=1)
+
+
+def random_walk(n: int, rng: np.random.Generator, step: float = 1.0) -> np.ndarray:
+    """Случайное блуждание в 3D"""
+    return np.cumsum(rng.normal(scale=step, size=(n, 3)), axis=0)
+
+
+def duplicate_points(n: int, rng: np.random.Generator, fraction: float = 0.1) -> np.ndarray:
+    """Случайное блуждание с повторяющимися точками (сегменты нулевой длины)"""
+    base = random_walk(n, rng)
+    repeat = np.ones(n, dtype=np.intp)
+    repeat[rng.random(n) < fraction] = 2
+    points = np.repeat(base, repeat, axis=0)
+    return points[:n]
+
+
+def sharp_corners(n: int, rng: np.random.Generator, length: float = 1.0) -> np.ndarray:
+    """Зигзаг с почти разворотными углами (до ~170°)"""
+    turn = np.pi - rng.uniform(0.1, 0.5, size=n - 1) * rng.choice([-1, 1], size=n - 1)
+    heading = np.concatenate([[0.0], np.cumsum(turn)])
+    steps = np.stack([np.cos(heading), np.sin(heading), np.zeros(n)], axis=1) * length
+    steps[0] = 0.0
+    return np.cumsum(steps, axis=0)
+
+
+def long_polyline(n: int, rng: np.random.Generator, step: float = 10.0) -> np.ndarray:
+    """Очень длинная почти прямая ломаная с небольшим шумом"""
+    x = np.arange(n, dtype=float) * step
+    noise = rng.normal(scale=0.01 * step, size=(n, 2))
+    return np.column_stack([x, noise])
+
+
+TRAJECTORY_KINDS = {
+    "helix": helix,
+    "random_walk": random_walk,
+    "duplicates": duplicate_points,
+    "sharp_corners": sharp_corners,
+    "long_polyline": long_polyline,
+}
+
+
+# ============================================================
+# АКТОРЫ
+# ============================================================
+
+def default_strategies() -> Dict[str, List[str]]:
+    """Зарегистрированные стратегии позиции и ориентации"""
+    from motion.interpolation_strategies import StrategyRegistry
+    orientation = [name for name in StrategyRegistry._orientation_strategies
+                   if name != "my_custom_function"]
+    return {
+        "position": list(StrategyRegistry._position_strategies),
+        "orientation": orientation,
+    }
+
+
+def generate_actors(m: int, rng: np.random.Generator,
+                    strategies: Dict[str, List[str]] = None) -> List[dict]:
+    """Строки конфигурации акторов (формат ActorLoader.load_from_json)"""
+    strategies = strategies or default_strategies()
+    actor_types = rng.choice(ACTOR_TYPES, size=m)
+    colors = rng.choice(COLORS, size=m)
+    positions = rng.choice(strategies["position"], size=m)
+    orientations = rng.choice(strategies["orientation"], size=m)
+
+    return [
+        {"actor": str(a), "color": str(c),
+         "interpolation_type": str(p), "orientation_type": str(o)}
+        for a, c, p, o in zip(actor_types, colors, positions, orientations)
+    ]
+
+
+# ============================================================
+# СЦЕНАРИЙ
+# ============================================================
+
+@dataclass
+class Scenario:
+    """Сгенерированный сценарий"""
+    name: str
+    trajectory: np.ndarray
+    actors: List[dict]
+
+    def write(self, out_dir, trajectory_format: str = ".npy",
+              config_format: str = ".json") -> Dict[str, Path]:
+        """
+        Записать сценарий в каталог.
+
+        Returns:
+            {"trajectory": путь, "actors": путь}
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        trajectory_path = out_dir / f"trajectory{trajectory_format}"
+        save_trajectory(trajectory_path, self.trajectory)
+
+        actors_path = out_dir / f"actors{config_format}"
+        if config_format == ".json":
+            with open(actors_path, "w", encoding="utf-8") as f:
+                json.dump({"actors": self.actors}, f, indent=1)
+        elif config_format == ".tsv":
+            with open(actors_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(self.actors[0]), delimiter="\t")
+                writer.writeheader()
+                writer.writerows(self.actors)
+        else:
+            raise ValueError(f"Unknown config format: {config_format}")
+
+        return {"trajectory": trajectory_path, "actors": actors_path}
+
+
+def generate_scenario(kind: str, n_points: int, n_actors: int, seed: int = 0,
+                      strategies: Dict[str, List[str]] = None) -> Scenario:
+    """
+    Сгенерировать сценарий.
+
+    Args:
+        kind: вид траектории (см. TRAJECTORY_KINDS)
+        n_points: число точек траектории
+        n_actors: число акторов
+        seed: зерно генератора (одинаковый seed — одинаковый сценарий)
+        strategies: {"position": [...], "orientation": [...]} для смеси стратегий
+    """
+    if kind not in TRAJECTORY_KINDS:
+        raise ValueError(
+            f"Unknown trajectory kind: {kind}. "
+            f"Available: {list(TRAJECTORY_KINDS.keys())}"
+        )
+
+    rng = np.random.default_rng(seed)
+    trajectory = TRAJECTORY_KINDS[kind](n_points, rng)
+    actors = generate_actors(n_actors, rng, strategies)
+
+    return Scenario(name=f"{kind}_{n_points}x{n_actors}_s{seed}",
+                    trajectory=trajectory, actors=actors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Amime scenarios")
+    parser.add_argument("--kind", choices=list(TRAJECTORY_KINDS) + ["all"], default="all")
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--actors", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="scenarios")
+    parser.add_argument("--trajectory-format", default=".npy",
+                        choices=[".npy", ".npz", ".csv", ".tsv", ".txt"])
+    parser.add_argument("--config-format", default=".json", choices=[".json", ".tsv"])
+    args = parser.parse_args(argv)
+
+    kinds = list(TRAJECTORY_KINDS) if args.kind == "all" else [args.kind]
+    for kind in kinds:
+        scenario = generate_scenario(kind, args.points, args.actors, args.seed)
+        paths = scenario.write(Path(args.out) / scenario.name,
+                               args.trajectory_format, args.config_format)
+        print(f"{scenario.name}: {paths['trajectory']}, {paths['actors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Планирование скорости вдоль траектории.
+
+Быстрейший допустимый профиль скорости при ограничениях:
+    v <= v_max,  |dv/dt| <= a_long,  v² κ <= a_lat.
+
+Решение — прямой и обратный проход по выборке пути. Оба прохода
+сводятся к накопленному минимуму (np.minimum.accumulate), поэтому
+работают за O(N) без цикла на Python.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from motion.trajectory import cumulative_lengths, interpolate_positions_by_length
+from motion.kinematics import radius_of_curvature
+
+
+def resample_by_length(points: np.ndarray, ds: float) -> np.ndarray:
+    """
+    Равномерная выборка траектории по длине дуги с шагом не больше ds.
+
+    Returns:
+        (s, samples): длины (M,) и точки (M, 3)
+    """
+    cum_len = cumulative_lengths(points)
+    n = max(int(np.ceil(cum_len[-1] / ds)), 1) + 1
+    s = np.linspace(0.0, cum_len[-1], n)
+    return s, interpolate_positions_by_length(points, s, cum_len)
+
+
+def forward_pass(s: np.ndarray, v_limit: np.ndarray, accel: float) -> np.ndarray:
+    """
+    Ограничение разгона: v_i² <= min_j<=i (v_limit_j² + 2a (s_i - s_j)).
+
+    Эквивалентно v_i² - 2a s_i = min_j<=i (v_limit_j² - 2a s_j).
+    """
+    u = np.minimum.accumulate(v_limit ** 2 - 2 * accel * s)
+    return np.sqrt(np.maximum(u + 2 * accel * s, 0.0))
+
+
+def backward_pass(s: np.ndarray, v_limit: np.ndarray, decel: float) -> np.ndarray:
+    """Ограничение торможения — прямой проход по развёрнутому пути"""
+    s_rev = s[-1] - s[::-1]
+    return forward_pass(s_rev, v_limit[::-1], decel)[::-1]
+
+
+@dataclass
+class SpeedProfile:
+    """Таблицы профиля скорости: длина s, скорость v(s), время t(s)"""
+    s: np.ndarray
+    v: np.ndarray
+    t: np.ndarray
+
+    @property
+    def total_length(self) -> float:
+        return float(self.s[-1])
+
+    @property
+    def duration(self) -> float:
+        return float(self.t[-1])
+
+    def v_at(self, s) -> np.ndarray:
+        """Скорость на длине s (v² линейна по s внутри шага)"""
+        return np.sqrt(np.interp(s, self.s, self.v ** 2))
+
+    def s_at(self, time) -> np.ndarray:
+        """
+        Пройденная длина к моменту time (векторно).
+        Внутри шага ускорение постоянно — используем точную параболу.
+        """
+        time = np.clip(np.asarray(time, dtype=float), 0.0, self.duration)
+        i = np.clip(np.searchsorted(self.t, time, side="right") - 1, 0, len(self.s) - 2)
+
+        ds = self.s[i + 1] - self.s[i]
+        dv2 = self.v[i + 1] ** 2 - self.v[i] ** 2
+        a = np.divide(dv2, 2 * ds, out=np.zeros_like(ds), where=ds > 0)
+
+        tau = time - self.t[i]
+        return np.minimum(self.s[i] + self.v[i] * tau + 0.5 * a * tau ** 2, self.s[i + 1])
+
+    def time_at(self, s) -> np.ndarray:
+        """
+        Момент прохождения длины s (векторно, обращение s_at).
+
+        Внутри шага v² линейна по s, поэтому τ = 2 Δs / (v_i + v(s)) —
+        точное решение параболы без поиска корня.
+        """
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.total_length)
+        i = np.clip(np.searchsorted(self.s, s, side="right") - 1, 0, len(self.s) - 2)
+        return _step_times(self.s[i], self.v[i], self.s[i + 1], self.v[i + 1], self.t[i], s)
+
+    def frame_parameters(self, steps: int) -> np.ndarray:
+        """
+        Параметры t [0, 1] для TrajectoryAnimator (стратегия "length")
+        на steps кадрах, равномерных по времени.
+        """
+        times = np.linspace(0.0, self.duration, steps)
+        return self.s_at(times) / max(self.total_length, 1e-12)
+
+
+def _step_times(s0, v0, s1, v1, t0, s):
+    """Время внутри шагов с постоянным ускорением (v² линейна по s)"""
+    ds = s1 - s0
+    frac = np.divide(s - s0, ds, out=np.zeros_like(s), where=ds > 0)
+    v = np.sqrt(np.maximum(v0 ** 2 + (v1 ** 2 - v0 ** 2) * frac, 0.0))
+    v_sum = v0 + v
+    return t0 + np.divide(2 * (s - s0), v_sum, out=np.zeros_like(s), where=v_sum > 0)
+
+
+class ProfileTable:
+    """
+    Профили скорости многих акторов, упакованные в общие таблицы:
+    моменты прохождения станций для всех акторов — один searchsorted.
+    """
+
+    def __init__(self, profiles):
+        """
+        Args:
+            profiles: список SpeedProfile (по одному на актора)
+        """
+        self.offsets = np.concatenate([[0], np.cumsum([len(p.s) for p in profiles])])
+        self.total_length = np.array([p.total_length for p in profiles])
+        self.s = np.concatenate([p.s for p in profiles])
+        self.v = np.concatenate([p.v for p in profiles])
+        self.t = np.concatenate([p.t for p in profiles])
+
+        # сдвиг делает общую таблицу длин строго возрастающей по акторам
+        self.shift = np.concatenate([[0.0], np.cumsum(self.total_length[:-1] + 1.0)])
+        self.key = self.s + np.repeat(self.shift, np.diff(self.offsets))
+
+    def time_at(self, s) -> np.ndarray:
+        """
+        Args:
+            s: (M,) или (M, K) длины для каждого из M акторов
+
+        Returns:
+            моменты той же формы
+        """
+        s = np.asarray(s, dtype=float)
+        expand = (slice(None),) + (None,) * (s.ndim - 1)
+        s = np.clip(s, 0.0, self.total_length[expand])
+
+        first = self.offsets[:-1][expand]
+        last = (self.offsets[1:] - 2)[expand]
+        i = np.searchsorted(self.key, s + self.shift[expand], side="right") - 1
+        # сдвиг округляется: индекс уточняется по локальным длинам
+        i = np.clip(i, first, last)
+        i = np.where((self.s[i] > s) & (i > first), i - 1, i)
+        i = np.where((self.s[i + 1] <= s) & (i < last), i + 1, i)
+        return _step_times(self.s[i], self.v[i], self.s[i + 1], self.v[i + 1], self.t[i], s)
+
+
+def solve_speed_profile(points: np.ndarray, v_max: float, a_long: float,
+                        a_lat: float, ds: float = 0.01, a_brake: float = None,
+                        v_start: float = 0.0, v_end: float = 0.0) -> SpeedProfile:
+    """
+    Быстрейший допустимый профиль скорости вдоль траектории.
+
+    Args:
+        points: (N, 3) траектория
+        v_max: максимальная скорость
+        a_long: максимальное продольное ускорение (разгон)
+        a_lat: максимальное поперечное (центростремительное) ускорение
+        ds: шаг выборки по длине дуги
+        a_brake: максимальное замедление (по умолчанию = a_long)
+        v_start, v_end: скорость в начале и в конце пути
+
+    Returns:
+        SpeedProfile
+    """
+    a_brake = a_long if a_brake is None else a_brake
+    s, samples = resample_by_length(points, ds)
+
+    # Ограничение по кривизне: v <= sqrt(a_lat * R)
+    radius = radius_of_curvature(samples) if len(samples) > 2 else np.full(len(s), np.inf)
+    v_limit = np.minimum(v_max, np.sqrt(a_lat * radius))
+    v_limit[0] = min(v_limit[0], v_start)
+    v_limit[-1] = min(v_limit[-1], v_end)
+
+    v = np.minimum(forward_pass(s, v_limit, a_long),
+                   backward_pass(s, v_limit, a_brake))
+
+    # Время шага при постоянном ускорении: dt = 2 ds / (v_i + v_{i+1})
+    v_sum = v[:-1] + v[1:]
+    dt = np.divide(2 * np.diff(s), v_sum, out=np.zeros_like(v_sum), where=v_sum > 0)
+    t = np.concatenate([[0.0], np.cumsum(dt)])
+
+    return SpeedProfile(s=s, v=v, t=t)
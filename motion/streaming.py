@@ -0,0 +1,401 @@
+"""
+Потоковая передача состояний акторов тонким клиентам отрисовки.
+
+Один вычислительный процесс публикует состояния кадра, клиенты (другие
+процессы или машины) получают их по TCP или Unix-сокету и рисуют у себя.
+
+Формат — сообщения с префиксом длины (uint32, little-endian):
+
+    SCHEMA  kind=0, count, quantum, JSON-список имён акторов
+    KEY     kind=1, frame, count, timestamp; позиции int32 (M, 3),
+            направления int16 (M, 3), видимость — битовая маска
+    DELTA   kind=2, frame, count, timestamp, n; индексы изменившихся uint32 (n),
+            приращения позиций int16 (n, 3), направления int16 (n, 3), маска
+
+Позиции квантуются с шагом quantum и передаются целыми: клиент
+накапливает приращения без дрейфа. Направления — int16 (x · 32767).
+DELTA передаёт только изменившихся акторов; если приращение не влезает
+в int16, отправляется KEY.
+
+Обратное давление: у каждого клиента своя задача отправки. Публикация
+не блокируется и лишь заменяет «последний кадр». Клиент подтверждает
+каждый обработанный кадр одним байтом. Сервер держит в пути не больше
+window неподтверждённых кадров, поэтому очередь не копится в буферах
+ядра. Медленный клиент получает самый свежий кадр, когда освободится,
+а промежуточные пропускает.
+"""
+
+import asyncio
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from motion.upsampling import directions_to_yaws
+from motion.visual_utils import yaws_to_directions
+
+MSG_SCHEMA = 0
+MSG_KEY = 1
+MSG_DELTA = 2
+
+_LENGTH = struct.Struct("<I")
+_SCHEMA = struct.Struct("<BId")
+_FRAME = struct.Struct("<BIId")
+_COUNT = struct.Struct("<I")
+
+DIR_SCALE = 32767
+DEFAULT_QUANTUM = 1e-3
+WRITE_BUFFER = 64 * 1024
+ACK = b"\x01"
+
+
+# ============================================================
+# КОДИРОВАНИЕ
+# ============================================================
+
+@dataclass
+class EncodedFrame:
+    """Квантованные состояния одного кадра (общие для всех клиентов)"""
+    frame: int
+    timestamp: float
+    names: List[str]
+    position: np.ndarray   # (M, 3) int32
+    direction: np.ndarray  # (M, 3) int16
+    visible: np.ndarray    # (M,) bool
+
+
+def quantize(frame: int, names: List[str], position: np.ndarray, direction: np.ndarray,
+             visible: np.ndarray = None, quantum: float = DEFAULT_QUANTUM) -> EncodedFrame:
+    """Квантовать состояния кадра"""
+    position = np.asarray(position, dtype=float).reshape(-1, 3)
+    direction = np.asarray(direction, dtype=float).reshape(-1, 3)
+    norm = np.linalg.norm(direction, axis=1, keepdims=True)
+    direction = np.divide(direction, norm, out=np.zeros_like(direction), where=norm > 0)
+    if visible is None:
+        visible = np.ones(len(position), dtype=bool)
+
+    return EncodedFrame(
+        frame=frame,
+        timestamp=time.time(),
+        names=list(names),
+        position=np.rint(position / quantum).astype(np.int32),
+        direction=np.rint(direction * DIR_SCALE).astype(np.int16),
+        visible=np.asarray(visible, dtype=bool),
+    )
+
+
+def _message(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_schema(names: List[str], quantum: float) -> bytes:
+    return _message(_SCHEMA.pack(MSG_SCHEMA, len(names), quantum)
+                    + json.dumps(names).encode("utf-8"))
+
+
+def encode_key(f: EncodedFrame) -> bytes:
+    return _message(_FRAME.pack(MSG_KEY, f.frame, len(f.names), f.timestamp)
+                    + f.position.tobytes() + f.direction.tobytes()
+                    + np.packbits(f.visible).tobytes())
+
+
+def encode_delta(f: EncodedFrame, previous: EncodedFrame) -> Optional[bytes]:
+    """Разностное сообщение относительно previous (None — нужен KEY)"""
+    dpos = f.position.astype(np.int64) - previous.position
+    changed = np.flatnonzero(np.any(dpos != 0, axis=1)
+                             | np.any(f.direction != previous.direction, axis=1)
+                             | (f.visible != previous.visible))
+    dpos = dpos[changed]
+    if len(dpos) and np.abs(dpos).max() > np.iinfo(np.int16).max:
+        return None
+
+    return _message(_FRAME.pack(MSG_DELTA, f.frame, len(f.names), f.timestamp)
+                    + _COUNT.pack(len(changed))
+                    + changed.astype(np.uint32).tobytes()
+                    + dpos.astype(np.int16).tobytes()
+                    + f.direction[changed].tobytes()
+                    + np.packbits(f.visible).tobytes())
+
+
+# ============================================================
+# СЕРВЕР
+# ============================================================
+
+class _Subscriber:
+    """Состояние одного клиента: что ему уже отправлено"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.wakeup = asyncio.Event()
+        self.sent: Optional[EncodedFrame] = None
+        self.in_flight = 0
+        self.connected = True
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+
+class StateStreamServer:
+    """Публикация состояний кадров по локальному TCP- или Unix-сокету"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = None,
+                 quantum: float = DEFAULT_QUANTUM, window: int = 2):
+        """
+        Args:
+            host, port: адрес TCP (port=0 — любой свободный)
+            path: путь Unix-сокета (вместо TCP)
+            quantum: шаг квантования позиций
+            window: сколько неподтверждённых кадров может быть у клиента в пути
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.quantum = quantum
+        self.window = window
+        self.subscribers: List[_Subscriber] = []
+        self.latest: Optional[EncodedFrame] = None
+        self._known: Dict[str, tuple] = {}
+        self._frame = 0
+        self._server = None
+        self._closed = False
+
+    async def start(self):
+        if self.path:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._closed = True
+        for sub in self.subscribers:
+            sub.wakeup.set()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def publish(self, names: List[str], position: np.ndarray, direction: np.ndarray,
+                visible: np.ndarray = None, frame: int = None):
+        """
+        Опубликовать кадр (не блокирует; вызывать из потока event loop).
+        """
+        self._frame = self._frame + 1 if frame is None else frame
+        self.latest = quantize(self._frame, names, position, direction, visible, self.quantum)
+        for sub in self.subscribers:
+            sub.wakeup.set()
+
+    def publish_states(self, states: Dict, names: List[str] = None):
+        """
+        Опубликовать {имя: ActorState}. Частичные состояния (таймлайн
+        пересчитал не всех) дополняются последними известными.
+
+        Args:
+            names: актуальный состав сцены (по умолчанию — все известные)
+        """
+        for name, state in states.items():
+            direction = state.direction
+            if direction is None:
+                direction = yaws_to_directions([state.yaw])[0]
+            self._known[name] = (state.position, direction)
+
+        if names is not None:
+            self._known = {name: self._known[name] for name in names if name in self._known}
+        names = list(self._known)
+        self.publish(names,
+                     np.array([self._known[n][0] for n in names], dtype=float).reshape(-1, 3),
+                     np.array([self._known[n][1] for n in names], dtype=float).reshape(-1, 3))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER)
+        sub = _Subscriber(writer)
+        self.subscribers.append(sub)
+        acks = asyncio.create_task(self._read_acks(reader, sub))
+        if self.latest is not None:
+            sub.wakeup.set()
+
+        try:
+            while True:
+                await sub.wakeup.wait()
+                sub.wakeup.clear()
+                if self._closed or not sub.connected:
+                    break
+                frame = self.latest
+                if (frame is None or sub.in_flight >= self.window
+                        or (sub.sent is not None and frame.frame == sub.sent.frame)):
+                    continue
+
+                if sub.sent is not None:
+                    sub.frames_dropped += max(0, frame.frame - sub.sent.frame - 1)
+                data = self._encode_for(sub, frame)
+                writer.write(data)
+                sub.bytes_sent += len(data)
+                sub.frames_sent += 1
+                sub.in_flight += 1
+                sub.sent = frame
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            acks.cancel()
+            self.subscribers.remove(sub)
+            writer.close()
+
+    @staticmethod
+    async def _read_acks(reader: asyncio.StreamReader, sub: _Subscriber):
+        """Подтверждения клиента (по байту на кадр) освобождают окно"""
+        try:
+            while data := await reader.read(1024):
+                sub.in_flight -= len(data)
+                sub.wakeup.set()
+        except ConnectionError:
+            pass
+        sub.connected = False
+        sub.wakeup.set()
+
+    def _encode_for(self, sub: _Subscriber, frame: EncodedFrame) -> bytes:
+        previous = sub.sent
+        if previous is None or previous.names != frame.names:
+            return encode_schema(frame.names, self.quantum) + encode_key(frame)
+        return encode_delta(frame, previous) or encode_key(frame)
+
+
+# ============================================================
+# КЛИЕНТ
+# ============================================================
+
+@dataclass
+class StreamFrame:
+    """Декодированный кадр на стороне клиента"""
+    frame: int
+    timestamp: float
+    names: List[str]
+    position: np.ndarray   # (M, 3) float
+    direction: np.ndarray  # (M, 3) float
+    visible: np.ndarray    # (M,) bool
+
+
+class StateStreamClient:
+    """Приём потока состояний (эталонный клиент)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = None, path: str = None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.reader: asyncio.StreamReader = None
+        self.writer: asyncio.StreamWriter = None
+
+        self.names: List[str] = []
+        self.quantum = DEFAULT_QUANTUM
+        self._position = np.zeros((0, 3), dtype=np.int64)
+        self._direction = np.zeros((0, 3), dtype=np.int16)
+
+    async def connect(self):
+        if self.path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+    async def _read_message(self) -> bytes:
+        (length,) = _LENGTH.unpack(await self.reader.readexactly(_LENGTH.size))
+        return await self.reader.readexactly(length)
+
+    async def frames(self):
+        """
+        Асинхронный генератор кадров StreamFrame.
+
+        Кадр подтверждается серверу, когда потребитель запрашивает
+        следующий, то есть после обработки текущего.
+        """
+        while True:
+            try:
+                payload = await self._read_message()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            frame = self._decode(payload)
+            if frame is not None:
+                yield frame
+                self.writer.write(ACK)
+
+    def _decode(self, payload: bytes) -> Optional[StreamFrame]:
+        kind = payload[0]
+        if kind == MSG_SCHEMA:
+            _, count, self.quantum = _SCHEMA.unpack_from(payload)
+            self.names = json.loads(payload[_SCHEMA.size:].decode("utf-8"))
+            self._position = np.zeros((count, 3), dtype=np.int64)
+            self._direction = np.zeros((count, 3), dtype=np.int16)
+            return None
+
+        _, frame, count, timestamp = _FRAME.unpack_from(payload)
+        offset = _FRAME.size
+        if kind == MSG_KEY:
+            self._position = np.frombuffer(payload, np.int32, count * 3, offset).reshape(count, 3).astype(np.int64)
+            offset += count * 12
+            self._direction = np.frombuffer(payload, np.int16, count * 3, offset).reshape(count, 3).copy()
+            offset += count * 6
+        elif kind == MSG_DELTA:
+            (n,) = _COUNT.unpack_from(payload, offset)
+            offset += _COUNT.size
+            idx = np.frombuffer(payload, np.uint32, n, offset)
+            offset += n * 4
+            self._position[idx] += np.frombuffer(payload, np.int16, n * 3, offset).reshape(n, 3)
+            offset += n * 6
+            self._direction[idx] = np.frombuffer(payload, np.int16, n * 3, offset).reshape(n, 3)
+            offset += n * 6
+        else:
+            raise ValueError(f"Unknown stream message kind: {kind}")
+
+        visible = np.unpackbits(np.frombuffer(payload, np.uint8, offset=offset),
+                                count=count).astype(bool)
+        return StreamFrame(
+            frame=frame,
+            timestamp=timestamp,
+            names=self.names,
+            position=self._position * self.quantum,
+            direction=self._direction / DIR_SCALE,
+            visible=visible,
+        )
+
+    async def run(self, visualizer, frames: int = None):
+        """
+        Рисовать принятые кадры в TrajectoryVisualizer.
+
+        Args:
+            frames: сколько кадров показать (None — пока сервер не закроет поток)
+        """
+        shown = 0
+        visible = None
+        async for frame in self.frames():
+            apply_frame(visualizer, frame, visible)
+            visible = frame.visible
+            visualizer.update()
+            shown += 1
+            if frames is not None and shown >= frames:
+                return
+
+
+def apply_frame(visualizer, frame: StreamFrame, previous_visible: np.ndarray = None):
+    """
+    Применить кадр потока к визуализатору.
+
+    Args:
+        previous_visible: маска видимости прошлого кадра (той же схемы);
+            видимость переключается только у изменившихся акторов
+    """
+    toggled = np.arange(len(frame.names))
+    if previous_visible is not None and len(previous_visible) == len(frame.visible):
+        toggled = np.flatnonzero(previous_visible != frame.visible)
+    for i in toggled:
+        visualizer.set_actor_visibility(frame.names[i], bool(frame.visible[i]))
+
+    shown = np.flatnonzero(frame.visible)
+    direction = frame.direction[shown]
+    visualizer.apply_arrays([frame.names[i] for i in shown], frame.position[shown],
+                            directions_to_yaws(direction), direction)
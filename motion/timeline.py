@@ -0,0 +1,215 @@
+"""
+Таймлайн акторов: у каждого актора своё локальное время.
+
+Параметры берутся из ActorConfigRow.extra (JSON-поля или колонки TSV):
+
+    start     — начало движения в глобальном времени цикла [0, 1] (0)
+    duration  — длительность в тех же единицах (по умолчанию 1 - start)
+    mode      — "once" (остановиться в конце), "loop", "pingpong"
+    profile   — "linear", "smoothstep", "ease_in", "ease_out"
+
+Без этих полей локальное время совпадает с глобальным.
+
+Локальное время всех акторов считается одной векторной операцией.
+Акторы отсортированы по start. До старта актор стоит в начале пути, после
+конца ("once") — в конце. Провайдеры вызываются только для акторов, у
+которых локальное время изменилось. Стоящие акторы ничего не стоят.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from motion.actor_config_schema import ActorConfigRow
+
+TIMING_KEYS = ("start", "duration", "mode", "profile")
+MODES = ("once", "loop", "pingpong")
+PROFILES = {
+    "linear": lambda x: x,
+    "smoothstep": lambda x: x * x * (3 - 2 * x),
+    "ease_in": lambda x: x * x,
+    "ease_out": lambda x: x * (2 - x),
+}
+# Обратные профили: локальное время → доля расписания (в замкнутом виде)
+INVERSE_PROFILES = {
+    "linear": lambda y: y,
+    "smoothstep": lambda y: 0.5 - np.sin(np.arcsin(1 - 2 * y) / 3),
+    "ease_in": lambda y: np.sqrt(y),
+    "ease_out": lambda y: 1 - np.sqrt(1 - y),
+}
+
+
+@dataclass
+class Timing:
+    """Расписание одного актора"""
+    start: float = 0.0
+    duration: Optional[float] = None  # None — до конца цикла
+    mode: str = "once"
+    profile: str = "linear"
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown timeline mode: {self.mode}. Available: {list(MODES)}")
+        if self.profile not in PROFILES:
+            raise ValueError(
+                f"Unknown timeline profile: {self.profile}. "
+                f"Available: {list(PROFILES.keys())}"
+            )
+        if self.duration is None:
+            self.duration = 1.0 - self.start
+        if self.duration <= 0:
+            raise ValueError(f"Timeline duration must be positive: {self.duration}")
+
+    @classmethod
+    def from_row(cls, row: ActorConfigRow) -> "Timing":
+        """Прочитать расписание из extra (пустые значения TSV — по умолчанию)"""
+        values = {key: row.extra.get(key) for key in TIMING_KEYS}
+        values = {key: value for key, value in values.items() if value not in (None, "")}
+
+        for key in ("start", "duration"):
+            if key in values:
+                values[key] = float(values[key])
+        return cls(**values)
+
+    def local_times(self, global_t) -> np.ndarray:
+        """Локальное время актора для массива глобальных моментов"""
+        return local_times(np.asarray(global_t, dtype=float), self.start,
+                           self.duration, MODES.index(self.mode), self.profile)
+
+
+def local_times(global_t: np.ndarray, start, duration, mode, profile: str) -> np.ndarray:
+    """
+    Глобальное время → локальное [0, 1] (векторно, с broadcasting).
+
+    Args:
+        global_t: глобальные моменты
+        start, duration: массивы или скаляры
+        mode: индекс в MODES (массив или скаляр)
+        profile: имя профиля
+    """
+    x = (global_t - start) / duration
+    once = np.clip(x, 0.0, 1.0)
+    loop = np.where(x < 0, 0.0, x % 1.0)
+    # треугольная волна: 0 → 1 → 0 за два прохода
+    pingpong = np.where(x < 0, 0.0, 1.0 - np.abs(x % 2.0 - 1.0))
+
+    local = np.choose(np.asarray(mode), [once, loop, pingpong])
+    return PROFILES[profile](local)
+
+
+class Timeline:
+    """Расписания всех акторов сцены в виде массивов"""
+
+    def __init__(self, timings: Dict[str, Timing]):
+        # Акторы упорядочены по времени старта: запущенные — префикс
+        self.names: List[str] = sorted(timings, key=lambda name: timings[name].start)
+        self.timings = timings
+
+        self.start = np.array([timings[n].start for n in self.names], dtype=float)
+        self.duration = np.array([timings[n].duration for n in self.names], dtype=float)
+        self.mode = np.array([MODES.index(timings[n].mode) for n in self.names], dtype=int)
+        self.profile = np.array([timings[n].profile for n in self.names])
+
+        self._profiles = {p: np.flatnonzero(self.profile == p) for p in np.unique(self.profile)}
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._last = np.full(len(self.names), np.nan)
+        self.current: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, animation_config: Dict[str, ActorConfigRow]) -> "Timeline":
+        return cls({name: Timing.from_row(row) for name, row in animation_config.items()})
+
+    def local_times(self, global_t) -> np.ndarray:
+        """
+        Локальное время всех акторов.
+
+        Args:
+            global_t: скаляр или массив (K,)
+
+        Returns:
+            (M,) или (M, K) в порядке self.names
+        """
+        g = np.asarray(global_t, dtype=float)
+        shape = (len(self.names),) + g.shape
+        expand = (slice(None),) + (None,) * g.ndim
+
+        out = np.zeros(shape)
+        for profile, idx in self._profiles.items():
+            out[idx] = local_times(g, self.start[idx][expand], self.duration[idx][expand],
+                                   self.mode[idx][expand], profile)
+        return out
+
+    def advance(self, global_t: float) -> Dict[str, float]:
+        """
+        Перейти к моменту global_t.
+
+        Returns:
+            {имя: локальное время} только для акторов, которым нужен пересчёт
+        """
+        g = float(global_t)
+        started = int(np.searchsorted(self.start, g, side="right"))
+
+        local = np.zeros(len(self.names))
+        for profile, idx in self._profiles.items():
+            idx = idx[idx < started]
+            local[idx] = local_times(g, self.start[idx], self.duration[idx],
+                                     self.mode[idx], profile)
+
+        # NaN (ещё не вычислялся) != чему угодно → пересчитать
+        changed = np.flatnonzero(local != self._last)
+        self._last = local
+
+        self.current = {self.names[i]: float(local[i]) for i in changed}
+        return self.current
+
+    def invalidate(self, name: str):
+        """Пересчитать актора на следующем advance (его конфигурация изменилась)"""
+        i = self._index.get(name)
+        if i is not None:
+            self._last[i] = np.nan
+
+    def arrival_times(self, local=None, stations=None) -> np.ndarray:
+        """
+        Глобальный момент, когда локальное время актора впервые достигает
+        заданного (обращение local_times; для loop/pingpong — первый проход).
+
+        Задаётся ровно одно из:
+            local: (M,) или (M, K) — свои локальные моменты [0, 1] у каждого
+                актора, строки в порядке self.names
+            stations: (K,) — одни и те же локальные моменты для всех акторов
+
+        Returns:
+            (M,) для local (M,), иначе (M, K)
+        """
+        if (local is None) == (stations is None):
+            raise ValueError("Specify exactly one of local (per actor) or stations (shared)")
+
+        m = len(self.names)
+        if stations is not None:
+            stations = np.asarray(stations, dtype=float)
+            if stations.ndim != 1:
+                raise ValueError(f"Stations must be 1-D (K,): shape {stations.shape}")
+            local = np.broadcast_to(stations, (m,) + stations.shape)
+        else:
+            local = np.asarray(local, dtype=float)
+            if local.ndim not in (1, 2) or local.shape[0] != m:
+                raise ValueError(
+                    f"Per-actor local times must have shape ({m},) or ({m}, K): "
+                    f"shape {local.shape}"
+                )
+
+        local = np.clip(local, 0.0, 1.0)
+        expand = (slice(None),) + (None,) * (local.ndim - 1)
+        out = np.zeros(local.shape)
+        for profile, idx in self._profiles.items():
+            fraction = INVERSE_PROFILES[profile](local[idx])
+            out[idx] = self.start[idx][expand] + self.duration[idx][expand] * fraction
+        return out
+
+    def local_t(self, name: str) -> Optional[float]:
+        """Последнее локальное время актора (None — актора нет в таймлайне)"""
+        i = self._index.get(name)
+        if i is None or np.isnan(self._last[i]):
+            return None
+        return float(self._last[i])
@@ -1,15 +1,17 @@
 import numpy as np
+from motion.precision import ACCUM_DTYPE
 
 
 def polyline_length(points: np.ndarray) -> float:
     diffs = np.diff(points, axis=0)
-    return float(np.sum(np.linalg.norm(diffs, axis=1)))
+    return float(np.sum(np.linalg.norm(diffs, axis=1), dtype=ACCUM_DTYPE))
 
 
 def cumulative_lengths(points: np.ndarray) -> np.ndarray:
     diffs = np.diff(points, axis=0)
     seg_lengths = np.linalg.norm(diffs, axis=1)
-    return np.concatenate([[0.0], np.cumsum(seg_lengths)])
+    # длины сегментов — в рабочем типе, накопление — всегда в float64
+    return np.concatenate([[0.0], np.cumsum(seg_lengths, dtype=ACCUM_DTYPE)])
 
 
 def interpolate_position(points: np.ndarray, t: float) -> np.ndarray:
@@ -52,7 +54,8 @@ def interpolate_position_by_length(points: np.ndarray, s: float) -> np.ndarray:
 
     # находим сегмент, в котором находится s
     idx = np.searchsorted(cum_len, s) - 1
-    frac = (s - cum_len[idx]) / (cum_len[idx + 1] - cum_len[idx])
+    # float, а не np.float64 — чтобы не повышать точность float32 точек
+    frac = float((s - cum_len[idx]) / (cum_len[idx + 1] - cum_len[idx]))
     return points[idx] + (points[idx + 1] - points[idx]) * frac
 
 def interpolate_orientation(points: np.ndarray) -> np.ndarray:
@@ -87,3 +90,163 @@ def interpolate_orientation_by_length(cum_lengths, directions, s):
 
     # Просто возвращаем направление текущего сегмента БЕЗ интерполяции
     return directions[idx]
+
+
+# ============================================================
+# ВЕКТОРНЫЕ ВЕРСИИ (массивы параметров за один вызов)
+# ============================================================
+
+def interpolate_positions(points: np.ndarray, t_idx) -> np.ndarray:
+    """
+    Векторная версия interpolate_position.
+
+    Args:
+        points: np.ndarray, shape (N, 3)
+        t_idx: array-like, shape (...), индексы вдоль траектории (0..N-1)
+
+    Returns:
+        np.ndarray, shape (..., 3)
+    """
+    t_idx = np.clip(np.asarray(t_idx, dtype=float), 0, len(points) - 1)
+    i = np.minimum(np.floor(t_idx).astype(np.intp), len(points) - 2)
+    frac = (t_idx - i)[..., None].astype(points.dtype, copy=False)
+    return points[i] + (points[i + 1] - points[i]) * frac
+
+
+def interpolate_positions_by_length(points: np.ndarray, s,
+                                    cum_len: np.ndarray = None) -> np.ndarray:
+    """
+    Векторная версия interpolate_position_by_length.
+
+    Args:
+        points: np.ndarray, shape (N, 3)
+        s: array-like, shape (...), расстояния вдоль траектории
+        cum_len: накопленные длины (если уже посчитаны)
+
+    Returns:
+        np.ndarray, shape (..., 3)
+    """
+    if cum_len is None:
+        cum_len = cumulative_lengths(points)
+    s = np.clip(np.asarray(s, dtype=float), 0, cum_len[-1])
+
+    idx = np.searchsorted(cum_len, s, side="right") - 1
+    idx = np.clip(idx, 0, len(points) - 2)
+
+    # вырожденные (нулевые) сегменты дают frac = 0
+    seg = cum_len[idx + 1] - cum_len[idx]
+    frac = np.divide(s - cum_len[idx], seg,
+                     out=np.zeros_like(s), where=seg > 0)
+    frac = frac[..., None].astype(points.dtype, copy=False)
+    return points[idx] + (points[idx + 1] - points[idx]) * frac
+
+
+def interpolate_orientations_by_length(cum_lengths: np.ndarray, directions: np.ndarray,
+                                       s) -> np.ndarray:
+    """
+    Векторная версия interpolate_orientation_by_length.
+
+    Returns:
+        np.ndarray, shape (..., 3)
+    """
+    idx = np.searchsorted(cum_lengths, np.asarray(s, dtype=float)) - 1
+    return directions[np.clip(idx, 0, len(directions) - 1)]
+
+
+def index_to_length(cum_len: np.ndarray, t_idx) -> np.ndarray:
+    """
+    Перевод индекса вдоль траектории (0..N-1) в длину дуги s.
+    """
+    return np.interp(t_idx, np.arange(len(cum_len)), cum_len)
+
+
+def length_to_index(cum_len: np.ndarray, s) -> np.ndarray:
+    """
+    Перевод длины дуги s в индекс вдоль траектории (обращение index_to_length).
+    """
+    return np.interp(s, cum_len, np.arange(len(cum_len), dtype=float))
+
+
+# ============================================================
+# CATMULL-ROM (центростремительный, локальный носитель)
+# ============================================================
+
+def catmull_rom_coefficients(points: np.ndarray, alpha: float = 0.5) -> np.ndarray:
+    """
+    Коэффициенты кубических сегментов Catmull-Rom.
+
+    Сегмент i (между points[i] и points[i+1]) — многочлен
+        p(u) = a u³ + b u² + c u + d,  u ∈ [0, 1],
+    с касательными по соседним точкам i-1 и i+2. Параметризация
+    центростремительная при alpha = 0.5 (без петель и заострений).
+    На концах соседние точки достраиваются отражением.
+
+    Args:
+        points: np.ndarray, shape (N, 3), N >= 2
+        alpha: 0 — равномерная, 0.5 — центростремительная, 1 — хордовая
+
+    Returns:
+        np.ndarray, shape (N-1, 4, 3) — [a, b, c, d] для каждого сегмента
+    """
+    points = np.asarray(points)
+    dtype = np.result_type(points.dtype, np.float32)
+    # коэффициенты считаются в float64 и приводятся к типу точек в конце
+    ext = np.concatenate([2 * points[:1] - points[1:2], points,
+                          2 * points[-1:] - points[-2:-1]]).astype(np.float64)
+    p0, p1, p2, p3 = ext[:-3], ext[1:-2], ext[2:-1], ext[3:]
+
+    d01 = np.linalg.norm(p1 - p0, axis=1, keepdims=True) ** alpha
+    d12 = np.linalg.norm(p2 - p1, axis=1, keepdims=True) ** alpha
+    d23 = np.linalg.norm(p3 - p2, axis=1, keepdims=True) ** alpha
+
+    def ratio(num, den):
+        # вырожденные интервалы (совпадающие точки) не дают вклада
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    # касательные в концах сегмента, масштабированные на интервал d12
+    m1 = p2 - p1 + d12 * (ratio(p1 - p0, d01) - ratio(p2 - p0, d01 + d12))
+    m2 = p2 - p1 + d12 * (ratio(p3 - p2, d23) - ratio(p3 - p1, d12 + d23))
+
+    coeffs = np.empty((len(p1), 4, 3), dtype=np.float64)
+    coeffs[:, 0] = 2 * (p1 - p2) + m1 + m2
+    coeffs[:, 1] = -3 * (p1 - p2) - 2 * m1 - m2
+    coeffs[:, 2] = m1
+    coeffs[:, 3] = p1
+    return coeffs.astype(dtype, copy=False)
+
+
+def _segment_params(n_segments: int, t_idx):
+    """Индекс сегмента и локальный параметр u для индексов 0..N-1"""
+    t_idx = np.clip(np.asarray(t_idx, dtype=float), 0, n_segments)
+    i = np.minimum(np.floor(t_idx).astype(np.intp), n_segments - 1)
+    return i, (t_idx - i)[..., None]
+
+
+def evaluate_segments(coeffs: np.ndarray, t_idx) -> np.ndarray:
+    """
+    Позиции на кусочно-кубической кривой (схема Горнера).
+
+    Args:
+        coeffs: (N-1, 4, 3) из catmull_rom_coefficients
+        t_idx: array-like, shape (...), индексы вдоль траектории (0..N-1)
+
+    Returns:
+        np.ndarray, shape (..., 3)
+    """
+    i, u = _segment_params(len(coeffs), t_idx)
+    c = coeffs[i]
+    u = u.astype(coeffs.dtype, copy=False)
+    return ((c[..., 0, :] * u + c[..., 1, :]) * u + c[..., 2, :]) * u + c[..., 3, :]
+
+
+def evaluate_segment_tangents(coeffs: np.ndarray, t_idx) -> np.ndarray:
+    """
+    Производная dp/du кусочно-кубической кривой (не нормирована).
+
+    Returns:
+        np.ndarray, shape (..., 3)
+    """
+    i, u = _segment_params(len(coeffs), t_idx)
+    c = coeffs[i]
+    u = u.astype(coeffs.dtype, copy=False)
+    return (3 * c[..., 0, :] * u + 2 * c[..., 1, :]) * u + c[..., 2, :]
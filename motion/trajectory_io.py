@@ -0,0 +1,68 @@
+"""
+Чтение и запись траекторий в файлы.
+
+Поддерживаемые форматы:
+    .npy          — массив (N, 3)
+    .npz          — массив под ключом "points"
+    .csv          — три колонки x, y, z через запятую
+    .tsv / .txt   — три колонки через табуляцию / пробелы
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+_DELIMITERS = {".csv": ",", ".tsv": "\t", ".txt": None}
+
+
+def load_trajectory(filepath) -> np.ndarray:
+    """
+    Загрузить траекторию из файла.
+
+    Returns:
+        np.ndarray, shape (N, 3), float64
+
+    Raises:
+        ValueError: если формат не поддерживается или форма массива не (N, 3)
+    """
+    path = Path(filepath)
+    suffix = path.suffix.lower()
+
+    if suffix == ".npy":
+        points = np.load(path)
+    elif suffix == ".npz":
+        with np.load(path) as data:
+            points = data["points"]
+    elif suffix in _DELIMITERS:
+        # строка заголовка (x y z) пропускается автоматически
+        points = np.genfromtxt(path, delimiter=_DELIMITERS[suffix],
+                               comments="#", invalid_raise=True)
+        points = points[~np.isnan(points).any(axis=1)] if points.ndim == 2 else points
+    else:
+        raise ValueError(
+            f"Unknown trajectory format: {suffix}. "
+            f"Available: {['.npy', '.npz', *_DELIMITERS]}"
+        )
+
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 3 or len(points) < 2:
+        raise ValueError(f"Траектория должна иметь форму (N>=2, 3), получено {points.shape}")
+    return points
+
+
+def save_trajectory(filepath, points: np.ndarray):
+    """Сохранить траекторию в файл (формат по расширению)"""
+    path = Path(filepath)
+    suffix = path.suffix.lower()
+    points = np.asarray(points)
+
+    if suffix == ".npy":
+        np.save(path, points)
+    elif suffix == ".npz":
+        np.savez(path, points=points)
+    elif suffix in _DELIMITERS:
+        delimiter = _DELIMITERS[suffix] or " "
+        np.savetxt(path, points, delimiter=delimiter,
+                   header=delimiter.join(["x", "y", "z"]), comments="")
+    else:
+        raise ValueError(f"Unknown trajectory format: {suffix}")
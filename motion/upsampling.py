@@ -0,0 +1,201 @@
+"""
+Временная передискретизация: симуляция на грубой сетке, показ — на любой.
+
+Дорогие стратегии (Френе, сплайны, решатели) считаются с частотой
+симуляции (10–20 Гц), а между соседними выборками экран интерполирует
+состояния всех акторов векторно:
+
+    позиции     — линейно или кубическим Эрмитом по скоростям выборок
+    направления — пакетный SLERP единичных векторов (по дуге большого круга)
+
+TrackUpsampler работает по запечённым трекам (BakedTracks),
+LiveUpsampler — по двум последним выборкам работающей сцены.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from motion.visual_utils import yaws_to_directions
+
+
+# ============================================================
+# ИНТЕРПОЛЯЦИЯ СОСТОЯНИЙ (пакетно по акторам)
+# ============================================================
+
+def lerp_positions(p0: np.ndarray, p1: np.ndarray, alpha) -> np.ndarray:
+    """(M, 3) × (M, 3) → (M, 3); alpha — скаляр или (M,)"""
+    alpha = np.asarray(alpha, dtype=float)[..., None]
+    return p0 + (p1 - p0) * alpha
+
+
+def hermite_positions(p0: np.ndarray, p1: np.ndarray,
+                      v0: np.ndarray, v1: np.ndarray, dt, alpha) -> np.ndarray:
+    """
+    Кубический Эрмит между выборками.
+
+    Args:
+        p0, p1: (M, 3) позиции выборок
+        v0, v1: (M, 3) скорости dp/dt в выборках
+        dt: интервал между выборками (скаляр или (M,))
+        alpha: доля интервала (скаляр или (M,))
+    """
+    a = np.asarray(alpha, dtype=float)[..., None]
+    dt = np.asarray(dt, dtype=float)[..., None]
+    a2, a3 = a * a, a * a * a
+    h00 = 2 * a3 - 3 * a2 + 1
+    h10 = a3 - 2 * a2 + a
+    h01 = -2 * a3 + 3 * a2
+    h11 = a3 - a2
+    return h00 * p0 + h10 * dt * v0 + h01 * p1 + h11 * dt * v1
+
+
+def slerp_directions(d0: np.ndarray, d1: np.ndarray, alpha) -> np.ndarray:
+    """
+    Направления (M, 3) через SLERP самих единичных векторов.
+
+    Состояние задаёт только направление (крен строится при отрисовке),
+    поэтому интерполируется вектор, а не полная ориентация: у реперов
+    directions_to_matrices крен скачет у вертикали. Противоположные
+    направления поворачиваются через перпендикулярную ось.
+    """
+    d0 = d0 / np.linalg.norm(d0, axis=-1, keepdims=True)
+    d1 = d1 / np.linalg.norm(d1, axis=-1, keepdims=True)
+    a = np.asarray(alpha, dtype=float)[..., None]
+
+    cos = np.clip(np.sum(d0 * d1, axis=-1, keepdims=True), -1.0, 1.0)
+    theta = np.arccos(cos)
+    sin = np.sin(theta)
+    near = sin < 1e-6
+
+    # near: ветки ниже делят на ~0, их результат отбрасывается np.where
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = (np.sin((1.0 - a) * theta) * d0 + np.sin(a * theta) * d1) / sin
+        # почти совпадают — линейно с нормировкой
+        lerp = d0 + (d1 - d0) * a
+        lerp = lerp / np.linalg.norm(lerp, axis=-1, keepdims=True)
+    out = np.where(near & (cos > 0), lerp, out)
+
+    # противоположны — поворот на a·π вокруг любой перпендикулярной оси
+    axis = np.where(np.abs(d0[..., :1]) < 0.9, [1.0, 0.0, 0.0], [0.0, 1.0, 0.0])
+    perp = np.cross(d0, axis)
+    perp = perp / np.linalg.norm(perp, axis=-1, keepdims=True)
+    turn = np.cos(a * np.pi) * d0 + np.sin(a * np.pi) * perp
+    return np.where(near & (cos < 0), turn, out)
+
+
+def directions_to_yaws(directions: np.ndarray) -> np.ndarray:
+    """Углы рыскания (градусы) направлений (M, 3)"""
+    return np.degrees(np.arctan2(directions[:, 1], directions[:, 0]))
+
+
+# ============================================================
+# ЗАПЕЧЁННЫЕ ТРЕКИ
+# ============================================================
+
+class TrackUpsampler:
+    """Состояния в произвольный момент по грубым запечённым трекам"""
+
+    def __init__(self, names: List[str], t: np.ndarray,
+                 position: np.ndarray, direction: np.ndarray,
+                 velocity: np.ndarray = None):
+        """
+        Args:
+            names: имена акторов (M,)
+            t: (K,) моменты выборок (по возрастанию)
+            position: (M, K, 3)
+            direction: (M, K, 3)
+            velocity: (M, K, 3) dp/dt — включает интерполяцию Эрмита
+        """
+        self.names = names
+        self.t = np.asarray(t, dtype=float)
+        self.position = position
+        self.direction = direction
+        self.velocity = velocity
+
+    @classmethod
+    def from_tracks(cls, tracks, hermite: bool = False) -> "TrackUpsampler":
+        """
+        Args:
+            tracks: BakedTracks на грубой сетке
+            hermite: оценить скорости выборок (центральные разности)
+        """
+        velocity = None
+        if hermite and len(tracks.t) > 1:
+            velocity = np.gradient(tracks.position.astype(float), tracks.t, axis=1)
+        return cls(tracks.names, tracks.t, tracks.position, tracks.direction, velocity)
+
+    def sample(self, time: float):
+        """
+        Состояния всех акторов в момент time.
+
+        Returns:
+            (position (M, 3), direction (M, 3), yaw (M,))
+        """
+        k = int(np.clip(np.searchsorted(self.t, time, side="right") - 1, 0, len(self.t) - 2))
+        dt = self.t[k + 1] - self.t[k]
+        alpha = float(np.clip((time - self.t[k]) / dt, 0.0, 1.0)) if dt > 0 else 0.0
+
+        p0, p1 = self.position[:, k], self.position[:, k + 1]
+        if self.velocity is None:
+            position = lerp_positions(p0, p1, alpha)
+        else:
+            position = hermite_positions(p0, p1, self.velocity[:, k],
+                                         self.velocity[:, k + 1], dt, alpha)
+
+        direction = slerp_directions(self.direction[:, k], self.direction[:, k + 1], alpha)
+        return position, direction, directions_to_yaws(direction)
+
+
+# ============================================================
+# РАБОТАЮЩАЯ СЦЕНА
+# ============================================================
+
+class LiveUpsampler:
+    """
+    Две последние выборки симуляции (предыдущая и следующая) и
+    интерполяция между ними. Частичные выборки (таймлайн пересчитал
+    не всех) дополняются последним известным состоянием актора.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._latest: Dict[str, np.ndarray] = {}  # имя -> (позиция, направление)
+        self.prev = np.empty((0, 6))
+        self.next = np.empty((0, 6))
+
+    def push(self, states: Dict, names: List[str] = None):
+        """
+        Добавить новую выборку.
+
+        Args:
+            states: {имя: ActorState}
+            names: актуальный состав сцены (по умолчанию — все известные)
+        """
+        previous = dict(zip(self.names, self.next))
+        for name, state in states.items():
+            direction = state.direction
+            if direction is None:
+                direction = yaws_to_directions([state.yaw])[0]
+            self._latest[name] = np.concatenate([np.asarray(state.position, dtype=float),
+                                                 np.asarray(direction, dtype=float)])
+
+        if names is not None:
+            self._latest = {name: self._latest[name] for name in names if name in self._latest}
+        self.names = list(self._latest)
+
+        self.next = np.array([self._latest[name] for name in self.names]).reshape(-1, 6)
+        # новый актор: предыдущая выборка совпадает со следующей
+        self.prev = np.array([previous.get(name, self._latest[name])
+                              for name in self.names]).reshape(-1, 6)
+
+    def sample(self, alpha: float):
+        """
+        Состояния между prev (alpha = 0) и next (alpha = 1).
+
+        Returns:
+            (names, position (M, 3), direction (M, 3), yaw (M,))
+        """
+        position = lerp_positions(self.prev[:, :3], self.next[:, :3], alpha)
+        direction = slerp_directions(self.prev[:, 3:], self.next[:, 3:], alpha)
+        return self.names, position, direction, directions_to_yaws(direction)
@@ -51,6 +51,61 @@ def direction_to_rotation_matrix(vec: np.ndarray):
     return np.column_stack([right, up, v])
 
 
+def yaws_to_directions(yaws: np.ndarray) -> np.ndarray:
+    """ Batch horizontal unit directions (M, 3) for yaw angles in degrees. """
+    yaw = np.radians(np.asarray(yaws, dtype=float))
+    return np.stack([np.cos(yaw), np.sin(yaw), np.zeros_like(yaw)], axis=-1)
+
+
+def directions_to_matrices(directions: np.ndarray) -> np.ndarray:
+    """
+    Batch 3×3 rotation matrices whose X-axis points along each direction
+    (meshes such as pv.Arrow point along +X). Roll is zero: the Y-axis
+    stays horizontal (except for near-vertical directions), so a horizontal
+    direction gives a pure yaw rotation.
+
+    Zero or invalid directions map to the identity.
+
+    Args:
+        directions: (M, 3)
+
+    Returns:
+        (M, 3, 3), columns = basis vectors
+    """
+    d = np.asarray(directions, dtype=float).reshape(-1, 3)
+    norm = np.linalg.norm(d, axis=1)
+    valid = np.isfinite(norm) & (norm > 1e-12)
+    x = np.where(valid[:, None], d / np.where(valid, norm, 1.0)[:, None], [1.0, 0.0, 0.0])
+
+    # helper "up" vector; near-vertical directions use X instead
+    helper = np.where((np.abs(x[:, 2]) < 0.99)[:, None], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0])
+    y = np.cross(helper, x)
+    y /= np.linalg.norm(y, axis=1, keepdims=True)
+    z = np.cross(x, y)
+
+    return np.stack([x, y, z], axis=-1)
+
+
+def pose_matrices(positions: np.ndarray, directions: np.ndarray) -> np.ndarray:
+    """
+    Batch 4×4 actor transforms: rotation along direction, then translation
+    to position. For horizontal directions this equals
+    SetOrientation(0, 0, yaw) + SetPosition(position).
+
+    Args:
+        positions: (M, 3)
+        directions: (M, 3)
+
+    Returns:
+        (M, 4, 4)
+    """
+    m = np.zeros((len(positions), 4, 4))
+    m[:, :3, :3] = directions_to_matrices(directions)
+    m[:, :3, 3] = positions
+    m[:, 3, 3] = 1.0
+    return m
+
+
 # ============================================================
 # VISUAL ACTOR HELPERS
 # ============================================================
@@ -90,4 +145,25 @@ def scalar_to_color(value, min_val, max_val):
     g = 1.0 - abs(alpha - 0.5) * 2
     b = 1.0 - alpha
 
-    return (r, g, b)
\ No newline at end of file
+    return (r, g, b)
+
+
+def scalars_to_colors(values: np.ndarray, min_val=None, max_val=None) -> np.ndarray:
+    """
+    Batch version of scalar_to_color: (N,) scalars → (N, 3) RGB in [0, 1].
+    The range defaults to the finite min/max of values.
+    """
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    if min_val is None:
+        min_val = finite.min() if len(finite) else 0.0
+    if max_val is None:
+        max_val = finite.max() if len(finite) else 0.0
+
+    if max_val == min_val:
+        alpha = np.full(values.shape, 0.5)
+    else:
+        alpha = (values - min_val) / (max_val - min_val)
+    alpha = np.clip(np.nan_to_num(alpha, nan=0.0), 0, 1)
+
+    return np.stack([alpha, 1.0 - np.abs(alpha - 0.5) * 2, 1.0 - alpha], axis=-1)
@@ -1,9 +1,14 @@
-import pyvista as pv
+from __future__ import annotations
+
 import numpy as np
 from dataclasses import dataclass
 from typing import Union
-from typing import Dict, Any, Callable, List
+from typing import Dict, Any, Callable, List, Optional
 from motion.mesh_factory import MeshFactory
+from motion.lazy import LazyModule
+from motion.visual_utils import pose_matrices, yaws_to_directions
+
+pv = LazyModule("pyvista")
 
 
 @dataclass
@@ -11,6 +16,7 @@ class MeshActor:
     """Визуальный элемент на сцене"""
     mesh: pv.Actor
     color: str
+    matrix: Any = None  # vtkMatrix4x4, установленная как UserMatrix
 
 
 @dataclass
@@ -27,6 +33,8 @@ class ActorState:
     """Состояние актора (позиция + ориентация)"""
     position: Union[list, tuple, np.ndarray]
     yaw: float
+    # Полное 3D направление; None — только рыскание (горизонтально)
+    direction: Optional[np.ndarray] = None
 
 @dataclass
 class ActorVisuals:
@@ -39,14 +47,30 @@ class TrajectoryVisualizer:
     """Визуализация траектории"""
 
     def __init__(self, trajectory, global_config: Dict[str, Any],
-                 mesh_factory: MeshFactory = None):
+                 mesh_factory: MeshFactory = None, off_screen: bool = False,
+                 state_tolerance: float = 1e-6):
         self.trajectory = trajectory
         self.global_config = global_config
         self.mesh_factory = mesh_factory or MeshFactory()
 
-        self.plotter = pv.Plotter()
+        # off_screen=True — рендер без окна (пакетный режим, скриншоты)
+        self.off_screen = off_screen
+        self.plotter = pv.Plotter(off_screen=off_screen)
         self._setup_scene()
 
+        # Акторы, сдвинувшиеся меньше чем на state_tolerance (по позиции
+        # и по углу в градусах), не обновляются
+        self.state_tolerance = state_tolerance
+        self._applied_names: List[str] = []
+        self._applied_states = np.empty((0, 6))  # позиция, направление
+        # имя -> строка _applied_states (правится при добавлении/удалении актора)
+        self._row_index: Dict[str, int] = {}
+
+        # Таймлайн: состояния считаются только для акторов, чьё
+        # локальное время изменилось (см. set_timeline)
+        self.timeline = None
+        self.clock = None
+
         # Визуальные элементы на сцене (sphere, arrow и т.д.)
         self.visuals: Dict[str, MeshActor] = {}
         self.actors: Dict[str, ActorVisuals] = {}  # actor_name -> визуалы + провайдер
@@ -77,8 +101,10 @@ class TrajectoryVisualizer:
         for config in visual_configs:
             mesh = self.mesh_factory.create(config.mesh_type, config.mesh_params)
             visual = self.plotter.add_mesh(mesh, color=config.color)
+            matrix = pv.vtkmatrix_from_array(np.eye(4))
+            visual.SetUserMatrix(matrix)
 
-            self.visuals[config.name] = MeshActor(visual, config.color)
+            self.visuals[config.name] = MeshActor(visual, config.color, matrix)
             visual_names.append(config.name)
 
         self.actors[actor_name] = ActorVisuals(
@@ -86,17 +112,151 @@ class TrajectoryVisualizer:
             visuals=visual_names,
             state_provider=state_provider
         )
+        # имя могло принадлежать прежнему актору — его состояние не годится
+        row = self._row_index.get(actor_name)
+        if row is not None:
+            self._applied_states[row] = np.nan
 
-    def update_all_actors(self):
-        """Обновить состояние всех акторов"""
-        for actor in self.actors.values():
-            state = actor.state_provider()
+    def remove_actor(self, actor_name: str):
+        """Удалить актора и его визуалы со сцены"""
+        actor = self.actors.pop(actor_name, None)
+        if actor is None:
+            return
+
+        for visual_name in actor.visuals:
+            visual = self.visuals.pop(visual_name)
+            self.plotter.remove_actor(visual.mesh, render=False)
+        self._forget_state(actor_name)
+
+    def _forget_state(self, actor_name: str):
+        """
+        Убрать строку актора из _applied_states (остальные акторы не
+        сбрасываются): на её место переносится последняя строка.
+        """
+        i = self._row_index.pop(actor_name, None)
+        if i is None:
+            return
+        last = len(self._applied_names) - 1
+        if i != last:
+            moved = self._applied_names[last]
+            self._applied_names[i] = moved
+            self._applied_states[i] = self._applied_states[last]
+            self._row_index[moved] = i
+        self._applied_names.pop()
+        self._applied_states = self._applied_states[:last]
+
+    def set_actor_color(self, actor_name: str, color: str):
+        """Сменить цвет всех визуалов актора на месте"""
+        for visual_name in self.actors[actor_name].visuals:
+            visual = self.visuals[visual_name]
+            visual.mesh.prop.color = color
+            visual.color = color
+
+    def set_actor_visibility(self, actor_name: str, visible: bool):
+        """Показать или скрыть все визуалы актора"""
+        actor = self.actors.get(actor_name)
+        if actor is None:
+            return
+        for visual_name in actor.visuals:
+            self.visuals[visual_name].mesh.SetVisibility(visible)
+
+    def set_timeline(self, timeline, clock: dict):
+        """
+        Args:
+            timeline: Timeline акторов (None — все акторы на глобальном времени)
+            clock: словарь с глобальным временем {"value": 0.0}
+        """
+        self.timeline = timeline
+        self.clock = clock
+
+    def compute_states(self) -> Dict[str, ActorState]:
+        """Вычислить состояния акторов (без обращения к VTK)"""
+        if self.timeline is None:
+            return {name: actor.state_provider() for name, actor in self.actors.items()}
+
+        due = self.timeline.advance(self.clock["value"])
+        return {name: self.actors[name].state_provider()
+                for name in due if name in self.actors}
 
-            # Обновляем все визуалы этого актора
+    def apply_states(self, states: Dict[str, ActorState]):
+        """Применить готовые состояния к визуалам"""
+        values = states.values()
+        directions = None
+        if all(state.direction is not None for state in values):
+            directions = np.array([state.direction for state in values], dtype=float).reshape(-1, 3)
+
+        self.apply_arrays(
+            list(states),
+            np.array([state.position for state in values], dtype=float).reshape(-1, 3),
+            np.array([state.yaw for state in values], dtype=float),
+            directions
+        )
+
+    def apply_arrays(self, names: List[str], positions: np.ndarray, yaws: np.ndarray,
+                     directions: np.ndarray = None):
+        """
+        Применить состояния, заданные массивами.
+
+        Args:
+            names: имена акторов (M,)
+            positions: (M, 3) позиции
+            yaws: (M,) углы рыскания (градусы)
+            directions: (M, 3) направления; если заданы, ориентация полная 3D
+                (тангаж учитывается), yaws игнорируются
+        """
+        states = np.empty((len(names), 6))
+        states[:, :3] = positions
+        states[:, 3:] = yaws_to_directions(yaws) if directions is None else directions
+
+        rows = self._rows(names)
+        moved = self._moved(rows, states)
+        if not moved.any():
+            return
+
+        index = np.flatnonzero(moved)
+        matrices = pose_matrices(states[index, :3], states[index, 3:])
+        for i, matrix in zip(index, matrices):
+            actor = self.actors.get(names[i])
+            if actor is None:
+                continue
+
+            # Одна запись 4×4 на визуал вместо SetPosition + SetOrientation
+            values = matrix.ravel().tolist()
             for visual_name in actor.visuals:
-                visual = self.visuals[visual_name].mesh
-                visual.SetPosition(list(state.position))
-                visual.SetOrientation(0, 0, state.yaw)
+                self.visuals[visual_name].matrix.DeepCopy(values)
+
+        self._remember(rows, states, moved)
+
+    def _rows(self, names: List[str]):
+        """Строки _applied_states для names (новые имена дописываются с NaN)"""
+        if names == self._applied_names:
+            return slice(None)
+
+        index = self._row_index
+        new = [name for name in dict.fromkeys(names) if name not in index]
+        if new:
+            index.update({name: len(self._applied_names) + k for k, name in enumerate(new)})
+            self._applied_names = self._applied_names + new
+            self._applied_states = np.vstack([self._applied_states,
+                                              np.full((len(new), 6), np.nan)])
+        return np.fromiter((index[name] for name in names), dtype=int, count=len(names))
+
+    def _moved(self, rows, states: np.ndarray) -> np.ndarray:
+        """Маска акторов, состояние которых изменилось больше допуска"""
+        previous = self._applied_states[rows]
+        # NaN (актор ещё не обновлялся) даёт False в сравнении → moved
+        return ~np.all(np.abs(states - previous) <= self.state_tolerance, axis=1)
+
+    def _remember(self, rows, states: np.ndarray, moved: np.ndarray):
+        """Запомнить применённые состояния (для неизменившихся — прежние)"""
+        if isinstance(rows, slice):
+            self._applied_states[moved] = states[moved]
+        else:
+            self._applied_states[rows[moved]] = states[moved]
+
+    def update_all_actors(self):
+        """Обновить состояние всех акторов"""
+        self.apply_states(self.compute_states())
 
     def show(self):
         """Запустить интерактивную сцену"""
@@ -104,4 +264,8 @@ class TrajectoryVisualizer:
 
     def update(self):
         """Обновить кадр"""
-        self.plotter.update()
\ No newline at end of file
+        if self.off_screen:
+            # без окна нет интерактора — просто перерисовываем
+            self.plotter.render()
+        else:
+            self.plotter.update()
\ No newline at end of file
@@ -0,0 +1,53 @@
+from unittest import mock
+
+import numpy as np
+
+from motion import scenarios
+from motion.actor_config_schema import ActorConfigRow
+from motion.animation_math import TrajectoryAnimator
+from motion.baking import bake_scene
+from motion.cache import DerivedCache
+
+CONFIG = {
+    "length": ActorConfigRow("arrow", "red", "length", "length"),
+    "spline": ActorConfigRow("arrow", "blue", "spline", "spline_tangent"),
+    "catmull_rom": ActorConfigRow("arrow", "green", "catmull_rom", "catmull_rom"),
+}
+
+
+def duplicates():
+    return scenarios.generate_scenario("duplicates", 2_000, 1, seed=0).trajectory
+
+
+def assert_same_tracks(a, b):
+    for field in ("position", "direction", "yaw"):
+        assert np.array_equal(getattr(a, field), getattr(b, field), equal_nan=True)
+
+
+def test_cached_animator_matches_uncached(tmp_path):
+    points = duplicates()
+    ref = TrajectoryAnimator(points)
+    cached = TrajectoryAnimator(points, cache=DerivedCache(tmp_path))
+    reopened = TrajectoryAnimator(points, cache=DerivedCache(tmp_path))
+
+    assert cached.total_len == reopened.total_len == ref.total_len
+    assert_same_tracks(bake_scene(reopened, CONFIG, 120), bake_scene(ref, CONFIG, 120))
+
+
+def test_strategy_coefficients_are_read_from_disk(tmp_path):
+    points = duplicates()
+    ref = bake_scene(TrajectoryAnimator(points, cache=DerivedCache(tmp_path)), CONFIG, 120)
+
+    animator = TrajectoryAnimator(points, cache=DerivedCache(tmp_path))
+    with mock.patch("scipy.interpolate.CubicSpline", side_effect=AssertionError), \
+            mock.patch("motion.interpolation_strategies.catmull_rom_coefficients",
+                       side_effect=AssertionError):
+        tracks = bake_scene(animator, CONFIG, 120)
+    assert_same_tracks(tracks, ref)
+
+
+def test_evict_once_per_batch(tmp_path):
+    cache = DerivedCache(tmp_path)
+    with mock.patch.object(cache, "evict") as evict:
+        cache.trajectory_tables(duplicates())
+    assert evict.call_count == 1
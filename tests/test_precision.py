@@ -0,0 +1,152 @@
+"""
+Границы ошибки режима float32 относительно float64.
+
+Отклонения сравниваются с априорными оценками округления
+(u = 2^-24 — единица округления float32):
+
+    сегмент:  |δL_i| <= 4u (|p_i| + |p_i+1|) + 8u L_i
+    длины:    |δs_i| <= Σ_{j<i} |δL_j|        (накопление в float64)
+    позиция:  |δp|   <= 4u (|p_i| + |p_i+1|) + |δs_i|
+    угол:     |δθ_i| <= 8u (|p_i| + |p_i+1|) / L_i
+"""
+
+import numpy as np
+import pytest
+
+from motion import scenarios
+from motion.actor_config_schema import ActorConfigRow
+from motion.animation_math import TrajectoryAnimator
+from motion.baking import bake_scene
+from motion.double_buffer import StateBuffer
+from motion.precision import get_precision, precision, set_precision
+from motion.trajectory import (
+    cumulative_lengths,
+    interpolate_orientation,
+    interpolate_positions_by_length,
+)
+
+U32 = 2.0 ** -24
+KINDS = ["helix", "random_walk", "sharp_corners", "long_polyline", "duplicates"]
+
+
+def trajectory(kind: str, n_points: int) -> np.ndarray:
+    return scenarios.generate_scenario(kind, n_points, 1, seed=0).trajectory.astype(np.float64)
+
+
+def segment_bounds(points64: np.ndarray):
+    """Оценки ошибки длин сегментов и накопленных длин"""
+    norm = np.linalg.norm(points64, axis=1)
+    seg = np.diff(cumulative_lengths(points64))
+    seg_bound = 4 * U32 * (norm[:-1] + norm[1:]) + 8 * U32 * seg
+    return norm, seg, np.concatenate([[0.0], np.cumsum(seg_bound)])
+
+
+def angle_between(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # atan2 нечувствителен к неточной нормировке float32 векторов
+    return np.arctan2(np.linalg.norm(np.cross(a, b), axis=-1), np.sum(a * b, axis=-1))
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_trajectory_tables_within_bounds(kind):
+    points64 = trajectory(kind, 20_000)
+    points32 = points64.astype(np.float32)
+    norm, seg, cum_bound = segment_bounds(points64)
+
+    cum64 = cumulative_lengths(points64)
+    cum32 = cumulative_lengths(points32)
+    assert cum32.dtype == np.float64
+    assert np.all(np.abs(cum32 - cum64) <= cum_bound)
+
+    # позиции в одних и тех же точках s
+    s = np.random.default_rng(0).uniform(0.0, cum64[-1], 2_000)
+    pos_err = np.linalg.norm(
+        interpolate_positions_by_length(points32, s, cum32).astype(np.float64)
+        - interpolate_positions_by_length(points64, s, cum64), axis=1)
+    idx = np.clip(np.searchsorted(cum64, s) - 1, 0, len(points64) - 2)
+    assert np.all(pos_err <= 4 * U32 * (norm[idx] + norm[idx + 1]) + cum_bound[idx + 1])
+
+    # направления (без вырожденных сегментов)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d64 = interpolate_orientation(points64)[:-1]
+        d32 = interpolate_orientation(points32)[:-1].astype(np.float64)
+    valid = seg > 0
+    angle_err = angle_between(d64[valid], d32[valid])
+    assert np.all(angle_err <= 8 * U32 * (norm[:-1] + norm[1:])[valid] / seg[valid] + 4 * U32)
+
+
+def test_unknown_precision_is_rejected():
+    before = get_precision()
+    with pytest.raises(ValueError, match="Available"):
+        set_precision("float16")
+    with pytest.raises(ValueError):
+        with precision("float16"):
+            pass
+    assert get_precision() == before
+
+
+def test_precision_context_restores_after_error():
+    before = get_precision()
+    with pytest.raises(RuntimeError):
+        with precision("float32"):
+            raise RuntimeError
+    assert get_precision() == before
+
+
+def test_state_buffer_uses_working_dtype():
+    with precision("float32"):
+        buffer = StateBuffer(["a", "b"])
+    assert buffer.position.dtype == buffer.direction.dtype == buffer.yaw.dtype == np.float32
+
+
+@pytest.mark.parametrize("kind", ["helix", "random_walk", "duplicates"])
+def test_get_states_float32(kind):
+    points64 = trajectory(kind, 2_000)
+    norm, _, cum_bound = segment_bounds(points64)
+    t = np.linspace(0.0, 1.0, 501)
+
+    with precision("float64"):
+        ref = TrajectoryAnimator(points64).get_states(t, "length", "length")
+    with precision("float32"):
+        animator = TrajectoryAnimator(points64)
+        states = animator.get_states(t, "length", "length")
+
+    assert animator.trajectory.dtype == np.float32
+    assert states["position"].dtype == states["direction"].dtype == states["yaw"].dtype == np.float32
+    assert states["s"].dtype == np.float64
+
+    # s = t · длина: длина пути сама ошибается на cum_bound[-1]
+    bound = 12 * U32 * norm.max() + 2 * cum_bound[-1]
+    assert np.nanmax(np.abs(states["position"] - ref["position"])) <= bound
+
+
+def test_get_states_float32_directions():
+    points64 = trajectory("helix", 2_000)
+    t = np.linspace(0.0, 1.0, 501)
+    with precision("float64"):
+        ref = TrajectoryAnimator(points64).get_states(t, "length", "length")
+    with precision("float32"):
+        states = TrajectoryAnimator(points64).get_states(t, "length", "length")
+
+    # у границы сегмента момент может попасть в соседний сегмент
+    d = interpolate_orientation(points64)[:-1]
+    turn = angle_between(d[:-1], d[1:]).max()
+    err = angle_between(states["direction"].astype(np.float64), ref["direction"])
+    assert err.max() <= turn + 1e-5
+
+
+def test_bake_scene_float32():
+    points64 = trajectory("random_walk", 2_000)
+    norm, _, cum_bound = segment_bounds(points64)
+    config = {
+        "a": ActorConfigRow("arrow", "red", "length", "length"),
+        "b": ActorConfigRow("arrow", "blue", "index", "index", {"lateral": "1.5"}),
+    }
+
+    with precision("float64"):
+        ref = bake_scene(TrajectoryAnimator(points64), config, 101)
+    with precision("float32"):
+        tracks = bake_scene(TrajectoryAnimator(points64), config, 101)
+
+    assert tracks.position.dtype == tracks.direction.dtype == tracks.yaw.dtype == np.float32
+    bound = 12 * U32 * (norm.max() + 1.5) + 2 * cum_bound[-1]
+    assert np.nanmax(np.abs(tracks.position - ref.position)) <= bound
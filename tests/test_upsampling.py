@@ -0,0 +1,45 @@
+import numpy as np
+
+from motion.upsampling import LiveUpsampler, slerp_directions
+
+X = np.array([[1.0, 0.0, 0.0]])
+Z = np.array([[0.0, 0.0, 1.0]])
+
+
+def test_slerp_directions_through_vertical():
+    half = np.sqrt(0.5)
+    assert np.allclose(slerp_directions(Z, X, 0.5), [[half, 0.0, half]])
+    assert np.allclose(slerp_directions(X, Z, 0.5), [[half, 0.0, half]])
+
+
+def test_slerp_directions_endpoints_and_unit_length():
+    rng = np.random.default_rng(0)
+    d0, d1 = rng.normal(size=(2, 50, 3))
+    d0 /= np.linalg.norm(d0, axis=1, keepdims=True)
+    d1 /= np.linalg.norm(d1, axis=1, keepdims=True)
+
+    assert np.allclose(slerp_directions(d0, d1, 0.0), d0)
+    assert np.allclose(slerp_directions(d0, d1, 1.0), d1)
+    mid = slerp_directions(d0, d1, rng.uniform(size=50))
+    assert np.allclose(np.linalg.norm(mid, axis=1), 1.0)
+
+
+def test_slerp_directions_equal_and_opposite():
+    assert np.allclose(slerp_directions(X, X, 0.3), X)
+    half = slerp_directions(Z, -Z, 0.5)
+    assert np.allclose(np.linalg.norm(half, axis=1), 1.0)
+    assert np.allclose(half @ Z[0], 0.0)
+
+
+def test_live_upsampler_keeps_plane_of_turn():
+    class State:
+        def __init__(self, direction):
+            self.position = np.zeros(3)
+            self.direction = direction
+            self.yaw = 0.0
+
+    live = LiveUpsampler()
+    live.push({"a": State(Z[0])})
+    live.push({"a": State(X[0])})
+    _, _, direction, _ = live.sample(0.5)
+    assert np.allclose(direction[:, 1], 0.0)
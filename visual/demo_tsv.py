@@ -1,4 +1,5 @@
 import time
+from pathlib import Path
 from motion.constants import (
     TRAJECTORY,
     ARROW_SCALE,
@@ -25,8 +26,9 @@ def main():
     # ЗАГРУЗКА КОНФИГУРАЦИИ ИЗ ФАЙЛА
     # ========================================
 
+    config_path = Path(__file__).parent.parent / "data" / "actors_config.tsv"
     actor_config, animation_config = ActorLoader.load_from_csv(
-        "../data/actors_config.tsv",
+        str(config_path),
         global_config
     )
 
@@ -34,12 +36,13 @@ def main():
     # ДОБАВЛЯЕМ АКТОРОВ НА СЦЕНУ
     # ========================================
 
-    def make_provider(method):
+    def make_provider(actor_row):
         def provider():
-            if method == "parameter":
-                state = animator.get_state_by_parameter(current_t["value"])
-            else:  # length
-                state = animator.get_state_by_length(current_t["value"])
+            state = animator.get_state(
+                current_t["value"],
+                actor_row.interpolation_type,
+                actor_row.orientation_type
+            )
 
             return ActorState(
                 position=list(state["position"]),
@@ -50,12 +53,12 @@ def main():
 
     # Добавляем на сцену
     for actor_name, actor in actor_config.get_all_actors().items():
-        method = animation_config[actor_name]
+        actor_row = animation_config[actor_name]
 
         visualizer.add_actor_with_provider(
             actor_name,
             actor.visuals,
-            make_provider(method)
+            make_provider(actor_row)
         )
 
     visualizer.show()